@@ -0,0 +1,370 @@
+"""
+Benchmark Suite
+Repeatable timings of each detector and the end-to-end pipeline
+
+Every case runs over the same synthetic corpus (src/utils/corpus_generator.py,
+fixed seed) rendered at several DPIs. Each case gets warm-up runs, then
+`repetitions` passes over the corpus. Per (case, DPI) the suite reports
+mean / p50 / p90 / p95 / p99 latency and throughput. It also reports the
+peak memory of one call, measured with tracemalloc in a separate, untimed
+pass; this covers NumPy and OpenCV output arrays but not OpenCV's internal
+scratch buffers.
+
+Results carry machine metadata (CPU, Python and library versions, git
+commit) and a schema version. Timings only compare on the same machine,
+so no baseline ships with the repository: run --save-baseline once on
+each machine (commit the file there to version its numbers), then
+compare later runs against it. Regressions beyond the tolerance make the
+compare run exit with status 1. Usage:
+
+    python benchmarks/benchmark_suite.py --save-baseline      # once per machine
+    python benchmarks/benchmark_suite.py --compare benchmarks/baseline.json
+    python benchmarks/benchmark_suite.py --cases ela copymove --dpi 100 200 --repetitions 5
+    python benchmarks/benchmark_suite.py --compare old.json --input new.json   # no run
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src.utils.corpus_generator import CorpusGenerator, read_manifest
+from src.utils.document_image import DocumentImage
+
+
+SCHEMA_VERSION = 1
+DEFAULT_BASELINE = os.path.join(ROOT, 'benchmarks', 'baseline.json')
+DEFAULT_CORPUS_DIR = os.path.join(ROOT, 'data', 'benchmark_corpus')
+PERCENTILES = (50, 90, 95, 99)
+
+# Case name -> needs Tesseract
+CASES = {
+    'decode': False,
+    'ela': False,
+    'copymove': False,
+    'ocr': True,
+    'font': True,
+    'pipeline': True,
+}
+
+
+def prepare_corpus(seed, count, dpis, corpus_dir=DEFAULT_CORPUS_DIR):
+    """
+    Generate (once) the benchmark corpus at each DPI
+
+    The same seed gives the same documents at every DPI: only the
+    rendering resolution changes.
+
+    Returns:
+        tuple: ({dpi: [document paths]}, corpus fingerprint)
+    """
+    corpora = {}
+    digest = hashlib.sha256()
+    for dpi in dpis:
+        directory = os.path.join(corpus_dir, f"seed{seed}-n{count}", f"dpi{dpi}")
+        manifest = os.path.join(directory, CorpusGenerator.MANIFEST_FILE)
+        if not os.path.exists(manifest):
+            generator = CorpusGenerator(directory, seed=seed, dpis=(dpi,), page_sizes=('a4',))
+            generator.generate(count, workers=min(count, os.cpu_count() or 1), show_progress=False)
+        with open(manifest, 'rb') as f:
+            digest.update(f.read())
+        corpora[dpi] = [entry['path'] for entry in read_manifest(directory)]
+    return corpora, digest.hexdigest()[:16]
+
+
+def machine_metadata():
+    """Where and with what the numbers were measured"""
+    import cv2
+    import PIL
+
+    def git(*args):
+        try:
+            return subprocess.run(['git', *args], cwd=ROOT, capture_output=True, text=True,
+                                  timeout=10).stdout.strip() or None
+        except (OSError, subprocess.SubprocessError):
+            return None
+
+    from src.utils.tesseract import tesseract_status
+    return {
+        'hostname': platform.node(),
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'opencv': cv2.__version__,
+        'opencv_threads': cv2.getNumThreads(),
+        'pillow': PIL.__version__,
+        'tesseract': tesseract_status()['version'],
+        'git_commit': git('rev-parse', 'HEAD'),
+        'git_dirty': bool(git('status', '--porcelain', '--untracked-files=no')),
+    }
+
+
+def build_case(name):
+    """
+    Set-up and call of one benchmark case
+
+    Returns:
+        tuple: (prepare(path) -> state, run(state)). Detector cases get a
+               fresh DocumentImage around the decoded pixels on every
+               call, so memoised views and OCR are never reused.
+    """
+    from src.cv_module.copymove_detector import CopyMoveDetector
+    from src.cv_module.ela_detector import ELADetector
+    from src.cv_module.font_analyzer import FontAnalyzer
+    from src.fraud_detector import FraudDetector
+    from src.utils.ocr import get_ocr
+
+    def decoded(path):
+        return DocumentImage.from_path(path).bgr
+
+    if name == 'decode':
+        return (lambda path: path), DocumentImage.from_path
+    if name == 'ela':
+        detector = ELADetector()
+        return decoded, lambda bgr: detector.detect(DocumentImage(bgr))
+    if name == 'copymove':
+        detector = CopyMoveDetector()
+        return decoded, lambda bgr: detector.detect(DocumentImage(bgr))
+    if name == 'ocr':
+        return decoded, lambda bgr: get_ocr(DocumentImage(bgr))
+    if name == 'font':
+        analyzer = FontAnalyzer()
+        return ((lambda path: (decoded(path), get_ocr(path))),
+                lambda state: analyzer.analyze(DocumentImage(state[0]), ocr=state[1]))
+    if name == 'pipeline':
+        detector = FraudDetector(use_segmentation=True)
+        return (lambda path: path), lambda path: detector.analyze_document(path, verbose=False)
+    raise ValueError(f"Unknown benchmark case: {name}")
+
+
+def measure(run, states, warmup, repetitions):
+    """
+    Time run(state) for every state, `repetitions` times, after warm-up
+
+    Returns:
+        dict: Latency statistics (seconds), throughput and peak memory (MB)
+    """
+    for i in range(warmup):
+        run(states[i % len(states)])
+
+    samples = []
+    for _ in range(repetitions):
+        for state in states:
+            start = time.perf_counter()
+            run(state)
+            samples.append(time.perf_counter() - start)
+
+    # Memory in its own pass: tracemalloc slows down the code it watches
+    peak = 0
+    tracemalloc.start()
+    try:
+        for state in states:
+            tracemalloc.reset_peak()
+            run(state)
+            peak = max(peak, tracemalloc.get_traced_memory()[1])
+    finally:
+        tracemalloc.stop()
+
+    samples = np.array(samples)
+    stats = {
+        'samples': len(samples),
+        'mean': float(samples.mean()),
+        'stdev': float(samples.std(ddof=1)) if len(samples) > 1 else 0.0,
+        'min': float(samples.min()),
+        'max': float(samples.max()),
+    }
+    for p in PERCENTILES:
+        stats[f'p{p}'] = float(np.percentile(samples, p))
+    stats['throughput'] = 1.0 / stats['mean'] if stats['mean'] > 0 else None
+    stats['peak_mb'] = peak / (1024 * 1024)
+    return stats
+
+
+def run_suite(cases, dpis, seed=2024, count=8, warmup=2, repetitions=3,
+              corpus_dir=DEFAULT_CORPUS_DIR, show_progress=True):
+    """
+    Run the benchmark cases over the corpus at every DPI
+
+    Returns:
+        dict: Results document (see module docstring)
+    """
+    from src.utils.tesseract import tesseract_status
+    corpora, fingerprint = prepare_corpus(seed, count, dpis, corpus_dir)
+    has_tesseract = tesseract_status()['version'] is not None
+
+    report = {
+        'schema_version': SCHEMA_VERSION,
+        'created_at': datetime.now().isoformat(),
+        'suite': {'seed': seed, 'count': count, 'dpis': list(dpis), 'warmup': warmup,
+                  'repetitions': repetitions, 'cases': list(cases),
+                  'corpus_fingerprint': fingerprint},
+        'machine': machine_metadata(),
+        'results': {},
+        'skipped': {}
+    }
+
+    for name in cases:
+        if CASES[name] and not has_tesseract:
+            report['skipped'][name] = 'Tesseract not available'
+            continue
+        prepare, run = build_case(name)
+        for dpi in dpis:
+            states = [prepare(path) for path in corpora[dpi]]
+            first = DocumentImage.from_path(corpora[dpi][0])
+            stats = measure(run, states, warmup, repetitions)
+            stats.update({'case': name, 'dpi': dpi, 'width': first.width, 'height': first.height})
+            report['results'][f"{name}@{dpi}dpi"] = stats
+            if show_progress:
+                print(f"   {name:<10}{dpi:>5} dpi  p50 {stats['p50'] * 1000:9.1f} ms  "
+                      f"p95 {stats['p95'] * 1000:9.1f} ms  peak {stats['peak_mb']:7.1f} MB")
+    return report
+
+
+def compare(baseline, current, tolerance=0.10, memory_tolerance=0.10, min_delta=0.001,
+            metrics=('p50', 'p95')):
+    """
+    Compare two results documents case by case
+
+    A timing metric regresses when it is more than `tolerance` (relative)
+    and more than `min_delta` seconds (absolute, to ignore timer noise)
+    above the baseline. Peak memory regresses beyond `memory_tolerance`.
+
+    Returns:
+        list: One row per (case, metric): key, metric, baseline, current,
+              change (relative) and status ('regression', 'improvement', 'ok')
+    """
+    rows = []
+    for key, base in baseline['results'].items():
+        now = current['results'].get(key)
+        if now is None:
+            continue
+        for metric in metrics + ('peak_mb',):
+            before, after = base[metric], now[metric]
+            change = (after - before) / before if before else 0.0
+            if metric == 'peak_mb':
+                limit, noise = memory_tolerance, 0.5  # MB
+            else:
+                limit, noise = tolerance, min_delta
+            if change > limit and after - before > noise:
+                status = 'regression'
+            elif change < -limit and before - after > noise:
+                status = 'improvement'
+            else:
+                status = 'ok'
+            rows.append({'key': key, 'metric': metric, 'baseline': before, 'current': after,
+                         'change': change, 'status': status})
+    return rows
+
+
+def print_comparison(rows, baseline, current):
+    """Print a comparison table and warnings about mismatched set-ups"""
+    print("\n" + "="*70)
+    print("⚖️  BENCHMARK COMPARISON")
+    print("="*70)
+    if baseline['suite'].get('corpus_fingerprint') != current['suite'].get('corpus_fingerprint'):
+        print("   ⚠️  Different corpus (seed, size or fonts): numbers are not comparable")
+    for field in ('hostname', 'processor', 'cpu_count', 'python', 'opencv', 'numpy'):
+        if baseline['machine'].get(field) != current['machine'].get(field):
+            print(f"   ⚠️  {field} differs: {baseline['machine'].get(field)} -> "
+                  f"{current['machine'].get(field)}")
+    print(f"   Baseline: {baseline['machine'].get('git_commit') or '?'} ({baseline['created_at']})")
+    print(f"   Current:  {current['machine'].get('git_commit') or '?'} ({current['created_at']})")
+    print("-"*70)
+    print(f"   {'Case':<20}{'Metric':<9}{'Baseline':>11}{'Current':>11}{'Change':>9}")
+    icons = {'regression': '🔴', 'improvement': '🟢', 'ok': '  '}
+    for row in rows:
+        unit, scale = ('MB', 1) if row['metric'] == 'peak_mb' else ('ms', 1000)
+        print(f"   {row['key']:<20}{row['metric']:<9}{row['baseline'] * scale:>9.1f}{unit}"
+              f"{row['current'] * scale:>9.1f}{unit}{row['change']:>+8.1%} {icons[row['status']]}")
+    regressions = sum(row['status'] == 'regression' for row in rows)
+    print("-"*70)
+    print(f"   {regressions} regression(s), "
+          f"{sum(row['status'] == 'improvement' for row in rows)} improvement(s)")
+    print("="*70 + "\n")
+
+
+def load_results(path):
+    """Read a results document, checking its schema version"""
+    with open(path) as f:
+        results = json.load(f)
+    if results.get('schema_version') != SCHEMA_VERSION:
+        raise ValueError(f"{path}: schema version {results.get('schema_version')} "
+                         f"(this suite reads version {SCHEMA_VERSION})")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='TruthLens benchmark suite')
+    parser.add_argument('--cases', nargs='+', default=list(CASES), choices=list(CASES),
+                        help='Cases to run (default: all)')
+    parser.add_argument('--dpi', type=int, nargs='+', default=[100, 150, 200],
+                        help='Corpus resolutions (default: 100 150 200)')
+    parser.add_argument('--seed', type=int, default=2024, help='Corpus seed (default: 2024)')
+    parser.add_argument('--count', type=int, default=8, help='Documents per resolution (default: 8)')
+    parser.add_argument('--warmup', type=int, default=2, help='Warm-up calls per case (default: 2)')
+    parser.add_argument('--repetitions', '-r', type=int, default=3,
+                        help='Passes over the corpus per case (default: 3)')
+    parser.add_argument('--output', '-o', help='Write the results to this JSON file')
+    parser.add_argument('--save-baseline', nargs='?', const=DEFAULT_BASELINE, metavar='FILE',
+                        help=f'Write the results as the baseline (default: {DEFAULT_BASELINE})')
+    parser.add_argument('--compare', metavar='BASELINE',
+                        help='Compare against a baseline; exit 1 on regressions')
+    parser.add_argument('--input', metavar='RESULTS',
+                        help='Compare these saved results instead of running the suite')
+    parser.add_argument('--tolerance', type=float, default=0.10,
+                        help='Allowed relative slowdown before flagging (default: 0.10)')
+    parser.add_argument('--memory-tolerance', type=float, default=0.10,
+                        help='Allowed relative peak-memory growth (default: 0.10)')
+    args = parser.parse_args()
+
+    # Fail before a long run, not after it
+    if args.compare and not os.path.exists(args.compare):
+        parser.error(f"baseline {args.compare} not found; create it on this machine first "
+                     f"with --save-baseline")
+
+    if args.input:
+        if not args.compare:
+            parser.error('--input needs --compare')
+        current = load_results(args.input)
+    else:
+        print("\n" + "="*70)
+        print("⏱️  TRUTHLENS BENCHMARK SUITE")
+        print("="*70)
+        print(f"   Cases: {', '.join(args.cases)}")
+        print(f"   Corpus: seed {args.seed}, {args.count} documents at {args.dpi} DPI")
+        print(f"   Warm-up: {args.warmup}   Repetitions: {args.repetitions}")
+        print("="*70)
+        current = run_suite(args.cases, args.dpi, seed=args.seed, count=args.count,
+                            warmup=args.warmup, repetitions=args.repetitions)
+        for name, reason in current['skipped'].items():
+            print(f"   ⏭️  {name}: skipped ({reason})")
+
+        for path in filter(None, (args.output, args.save_baseline)):
+            with open(path, 'w') as f:
+                json.dump(current, f, indent=2)
+            print(f"💾 Results saved to: {path}")
+
+    if args.compare:
+        baseline = load_results(args.compare)
+        rows = compare(baseline, current, tolerance=args.tolerance,
+                       memory_tolerance=args.memory_tolerance)
+        print_comparison(rows, baseline, current)
+        if any(row['status'] == 'regression' for row in rows):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+"""
+Resolution Scaling Benchmark
+How copy-move, ELA and OCR cost grows with image size (and block size)
+
+The same synthetic documents (src/utils/corpus_generator.py, fixed seed)
+are rendered at each resolution of a DPI ladder. Every run records the
+time (median over repetitions) and peak traced memory. Copy-move runs
+also record the blocks retained for matching and the candidate pairs
+compared, once per block size.
+
+For each series the growth exponent k in time ~ pixels^k is fitted on a
+log-log scale. The fit is reported over the whole ladder and between its
+last two points; a tail exponent well above 1 means super-linear blow-up
+at high DPI. The fit also gives the largest image that stays within a
+time budget, for setting upload size limits. Plot the results with
+visualize_performance.py. Usage:
+
+    python benchmarks/scaling_benchmark.py [--dpi 75 100 150 200 300 400 600]
+                                           [--block-sizes 8 16 32] [--budget 5]
+"""
+
+import argparse
+import json
+import math
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.benchmark_suite import DEFAULT_CORPUS_DIR, measure, prepare_corpus
+from src.utils.document_image import DocumentImage
+
+
+DEFAULT_OUTPUT = os.path.join(ROOT, 'data', 'scaling_results.json')
+
+
+def fit_exponent(xs, ys):
+    """
+    Least-squares slope of log(y) against log(x)
+
+    Returns:
+        tuple: (exponent, intercept) of y = exp(intercept) * x^exponent,
+               or (None, None) with fewer than two usable points
+    """
+    points = [(math.log(x), math.log(y)) for x, y in zip(xs, ys) if x > 0 and y > 0]
+    if len(points) < 2:
+        return None, None
+    slope, intercept = np.polyfit([p[0] for p in points], [p[1] for p in points], 1)
+    return float(slope), float(intercept)
+
+
+def summarize_series(points, budget):
+    """
+    Growth exponents of one series
+
+    Args:
+        points (list): Measurements with 'pixels', 'seconds' (and optionally
+                       'peak_mb', 'candidate_pairs')
+        budget (float): Time budget in seconds for the size limit
+
+    Returns:
+        dict: time_exponent, tail_exponent, memory_exponent,
+              candidates_exponent and max_megapixels (within budget)
+    """
+    pixels = [p['pixels'] for p in points]
+    seconds = [p['seconds'] for p in points]
+    exponent, intercept = fit_exponent(pixels, seconds)
+    tail, _ = fit_exponent(pixels[-2:], seconds[-2:])
+    memory, _ = fit_exponent(pixels, [p['peak_mb'] for p in points])
+
+    summary = {'time_exponent': exponent, 'tail_exponent': tail, 'memory_exponent': memory,
+               'max_megapixels': None}
+    if 'candidate_pairs' in points[0]:
+        summary['candidates_exponent'] = fit_exponent(
+            pixels, [p['candidate_pairs'] for p in points])[0]
+    if exponent and exponent > 0:
+        summary['max_megapixels'] = math.exp((math.log(budget) - intercept) / exponent) / 1e6
+    return summary
+
+
+def run_series(name, run, documents, repetitions, max_seconds, show_progress=True, count=None):
+    """
+    Measure one case up the DPI ladder
+
+    Stops climbing once a call takes longer than max_seconds.
+
+    Args:
+        name (str): Series label
+        run (callable): run(bgr) -> detector output
+        documents (dict): {dpi: [paths]}
+        repetitions (int): Timed calls per document
+        max_seconds (float): Stop the ladder after a slower call
+        count (callable): count(output) -> dict of extra counters
+
+    Returns:
+        list: One measurement per DPI reached
+    """
+    points = []
+    for dpi, paths in documents.items():
+        images = [DocumentImage.from_path(path).bgr for path in paths]
+        stats = measure(run, images, warmup=0, repetitions=repetitions)
+        point = {'dpi': dpi, 'width': images[0].shape[1], 'height': images[0].shape[0],
+                 'pixels': images[0].shape[0] * images[0].shape[1],
+                 'seconds': stats['p50'], 'peak_mb': stats['peak_mb']}
+        if count:
+            outputs = [count(run(image)) for image in images]
+            for key in outputs[0]:
+                point[key] = statistics.median(output[key] for output in outputs)
+        points.append(point)
+
+        if show_progress:
+            extra = ''.join(f"  {key} {point[key]:,.0f}" for key in ('num_blocks', 'candidate_pairs')
+                            if key in point)
+            print(f"   {name:<16}{dpi:>5} dpi {point['pixels'] / 1e6:6.1f} MP "
+                  f"{point['seconds']:8.3f}s {point['peak_mb']:8.1f} MB{extra}")
+        if stats['max'] > max_seconds:
+            if show_progress:
+                print(f"   ⏹️  {name}: stopping above {dpi} dpi ({stats['max']:.1f}s > {max_seconds}s)")
+            break
+    return points
+
+
+def run_scaling(dpis, block_sizes, cases=('copymove', 'ela', 'ocr'), seed=2024, count=2,
+                repetitions=3, max_seconds=60.0, budget=5.0, corpus_dir=DEFAULT_CORPUS_DIR,
+                show_progress=True):
+    """
+    Run every series and fit their exponents
+
+    Returns:
+        dict: {'settings', 'series': {label: {'case', 'block_size',
+               'points', 'summary'}}, 'skipped'}
+    """
+    from src.cv_module.copymove_detector import CopyMoveDetector
+    from src.cv_module.ela_detector import ELADetector
+    from src.utils.ocr import get_ocr
+    from src.utils.tesseract import tesseract_status
+
+    corpora, fingerprint = prepare_corpus(seed, count, dpis, corpus_dir)
+    report = {
+        'settings': {'dpis': list(dpis), 'block_sizes': list(block_sizes), 'seed': seed,
+                     'count': count, 'repetitions': repetitions, 'budget_seconds': budget,
+                     'corpus_fingerprint': fingerprint},
+        'series': {},
+        'skipped': {}
+    }
+
+    def add(label, case, points, block_size=None):
+        report['series'][label] = {'case': case, 'block_size': block_size, 'points': points,
+                                   'summary': summarize_series(points, budget)}
+
+    if 'copymove' in cases:
+        for block_size in block_sizes:
+            detector = CopyMoveDetector(block_size=block_size)
+            label = f"copymove/{block_size}"
+            points = run_series(label, lambda bgr: detector.detect(DocumentImage(bgr)),
+                                corpora, repetitions, max_seconds, show_progress,
+                                count=lambda out: {'num_blocks': out['num_blocks'],
+                                                   'candidate_pairs': out['candidate_pairs'],
+                                                   'duplicates': out['num_duplicates']})
+            add(label, 'copymove', points, block_size)
+    if 'ela' in cases:
+        detector = ELADetector()
+        add('ela', 'ela', run_series('ela', lambda bgr: detector.detect(DocumentImage(bgr)),
+                                     corpora, repetitions, max_seconds, show_progress))
+    if 'ocr' in cases:
+        if tesseract_status()['version'] is None:
+            report['skipped']['ocr'] = 'Tesseract not available'
+        else:
+            add('ocr', 'ocr', run_series('ocr', lambda bgr: get_ocr(DocumentImage(bgr)),
+                                         corpora, repetitions, max_seconds, show_progress))
+    return report
+
+
+def print_report(report):
+    """Print the fitted exponents and size limits"""
+    budget = report['settings']['budget_seconds']
+    print("\n" + "="*70)
+    print("📈 RESOLUTION SCALING")
+    print("="*70)
+    print(f"   {'Series':<16}{'Time k':>8}{'Tail k':>8}{'Mem k':>8}{'Cand. k':>9}"
+          f"{f'MP ≤ {budget:g}s':>12}")
+
+    def fmt(value, spec):
+        return format('-', '>' + spec.split('.')[0]) if value is None else format(value, spec)
+
+    for label, series in report['series'].items():
+        summary = series['summary']
+        print(f"   {label:<16}{fmt(summary['time_exponent'], '8.2f')}"
+              f"{fmt(summary['tail_exponent'], '8.2f')}{fmt(summary['memory_exponent'], '8.2f')}"
+              f"{fmt(summary.get('candidates_exponent'), '9.2f')}"
+              f"{fmt(summary['max_megapixels'], '12.1f')}")
+    for name, reason in report['skipped'].items():
+        print(f"   ⏭️  {name}: skipped ({reason})")
+    print("-"*70)
+    print("   k = exponent of growth with pixel count (1.0 = linear)")
+    print("="*70 + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='TruthLens resolution scaling benchmark')
+    parser.add_argument('--dpi', type=int, nargs='+', default=[75, 100, 150, 200, 300, 400, 600],
+                        help='Resolution ladder (default: 75 100 150 200 300 400 600)')
+    parser.add_argument('--block-sizes', type=int, nargs='+', default=[8, 16, 32],
+                        help='Copy-move block sizes (default: 8 16 32)')
+    parser.add_argument('--cases', nargs='+', default=['copymove', 'ela', 'ocr'],
+                        choices=['copymove', 'ela', 'ocr'])
+    parser.add_argument('--count', type=int, default=2, help='Documents per resolution (default: 2)')
+    parser.add_argument('--seed', type=int, default=2024, help='Corpus seed (default: 2024)')
+    parser.add_argument('--repetitions', '-r', type=int, default=3,
+                        help='Timed calls per document (default: 3)')
+    parser.add_argument('--max-seconds', type=float, default=60.0,
+                        help='Stop a series after a call slower than this (default: 60)')
+    parser.add_argument('--budget', type=float, default=5.0,
+                        help='Time budget for the reported size limit (default: 5s)')
+    parser.add_argument('--output', '-o', default=DEFAULT_OUTPUT,
+                        help=f'Results file (default: {DEFAULT_OUTPUT})')
+    args = parser.parse_args()
+
+    start = time.time()
+    report = run_scaling(sorted(args.dpi), args.block_sizes, cases=args.cases, seed=args.seed,
+                         count=args.count, repetitions=args.repetitions,
+                         max_seconds=args.max_seconds, budget=args.budget)
+    print_report(report)
+    print(f"   Finished in {time.time() - start:.0f} seconds")
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"💾 Results saved to: {args.output}")
+    print("   Plot with: python visualize_performance.py")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Startup Benchmark
+Measures the time from a fresh interpreter's first import to its first result
+
+Every scenario runs in a new Python process, so module caches, OpenCV
+initialization and Tesseract discovery are paid each time, as they are
+by a CLI call. Usage:
+
+    python benchmarks/startup_benchmark.py [document] [--runs 5] [--output file.json]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_DOCUMENT = os.path.join(ROOT, 'data', 'sample_documents', 'bank_statement_authentic.jpg')
+
+# Modules that should only be loaded by code paths that use them
+HEAVY_MODULES = ('cv2', 'pytesseract', 'PIL.Image', 'gradio', 'matplotlib')
+
+# Child process: time the imports and the first analysis, report as JSON
+_CHILD = """
+import json, sys, time
+t0 = time.perf_counter()
+{imports}
+t1 = time.perf_counter()
+{work}
+t2 = time.perf_counter()
+print(json.dumps({{'import': t1 - t0, 'first_result': t2 - t0,
+                  'loaded': [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+SCENARIOS = {
+    'import src.fraud_detector': (
+        "import src.fraud_detector", "pass"),
+    'import truthlens_web': (
+        "import truthlens_web", "pass"),
+    'import truthlens_cli': (
+        "import truthlens_cli", "pass"),
+    'FraudDetector first result': (
+        "from src.fraud_detector import FraudDetector",
+        "FraudDetector().analyze_document({document!r}, verbose=False)"),
+    'CLI analyze via daemon': (
+        "from src import daemon",
+        "client = daemon.connect()\n"
+        "if client is None: sys.exit(3)\n"
+        "client.request('analyze', path={document!r})"),
+}
+
+
+def run_scenario(imports, work, document, runs):
+    """
+    Run one scenario in fresh interpreters
+
+    Returns:
+        dict: Median / min / max seconds for import and first result,
+              plus the heavy modules the scenario loaded (None if the
+              scenario could not run, e.g. no daemon)
+    """
+    code = _CHILD.format(imports=imports, work=work.format(document=document),
+                         heavy=HEAVY_MODULES)
+    samples = []
+    process_times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        completed = subprocess.run([sys.executable, '-c', code], cwd=ROOT,
+                                   capture_output=True, text=True)
+        process_times.append(time.perf_counter() - start)
+        if completed.returncode != 0:
+            return None
+        samples.append(json.loads(completed.stdout.strip().splitlines()[-1]))
+
+    def describe(values):
+        return {'median': statistics.median(values), 'min': min(values), 'max': max(values)}
+
+    return {
+        'import': describe([s['import'] for s in samples]),
+        'first_result': describe([s['first_result'] for s in samples]),
+        'process': describe(process_times),
+        'loaded': samples[-1]['loaded']
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='TruthLens startup benchmark')
+    parser.add_argument('document', nargs='?', default=DEFAULT_DOCUMENT,
+                        help='Document analyzed by the first-result scenarios')
+    parser.add_argument('--runs', type=int, default=5, help='Fresh processes per scenario')
+    parser.add_argument('--output', '-o', help='Write the measurements to a JSON file')
+    args = parser.parse_args()
+
+    document = os.path.abspath(args.document)
+
+    print("\n" + "="*70)
+    print("⏱️  STARTUP BENCHMARK")
+    print("="*70)
+    print(f"   Document: {document}")
+    print(f"   Runs per scenario: {args.runs}")
+    print("="*70)
+    print(f"\n   {'Scenario':<30}{'Import':>10}{'1st result':>12}{'Process':>10}   Heavy modules loaded")
+
+    results = {}
+    for name, (imports, work) in SCENARIOS.items():
+        measured = run_scenario(imports, work, document, args.runs)
+        results[name] = measured
+        if measured is None:
+            print(f"   {name:<30}{'skipped (failed or no daemon running)':>32}")
+            continue
+        print(f"   {name:<30}{measured['import']['median']:>9.3f}s"
+              f"{measured['first_result']['median']:>11.3f}s"
+              f"{measured['process']['median']:>9.3f}s   {', '.join(measured['loaded']) or '-'}")
+
+    print("\n   Times are medians; 'Process' includes interpreter start-up.")
+    print("="*70 + "\n")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'document': document, 'runs': args.runs, 'python': sys.version,
+                       'scenarios': results}, f, indent=2)
+        print(f"💾 Results saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Triage Benchmark
+Throughput and verdict agreement of low-resolution triage vs. full resolution
+
+Every document is analyzed once by a plain FraudDetector and once per
+triage setting. Reported per setting: documents/second, speed-up over the
+full-resolution run, the share of verdicts decided by triage, and how
+often the tiered verdict agrees with the full-resolution one. Usage:
+
+    python benchmarks/triage_benchmark.py [directory] [--scales 2 4 8] [--band 0.5]
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.fraud_detector import FraudDetector
+
+
+def run(detector, documents):
+    """
+    Analyze every document once
+
+    Returns:
+        tuple: (results, elapsed seconds)
+    """
+    detector.analyze_document(documents[0], verbose=False)  # warm-up (imports, OCR discovery)
+    start = time.perf_counter()
+    results = [detector.analyze_document(path, verbose=False) for path in documents]
+    return results, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='TruthLens triage benchmark')
+    parser.add_argument('directory', nargs='?', default='data/sample_documents',
+                        help='Directory of documents (default: data/sample_documents)')
+    parser.add_argument('--pattern', '-p', default='*.jpg', help='File pattern (default: *.jpg)')
+    parser.add_argument('--scales', type=int, nargs='+', default=[2, 4, 8],
+                        help='Triage resolutions to compare (1/scale)')
+    parser.add_argument('--band', type=float, default=0.5,
+                        help='Uncertainty band as a fraction of each threshold')
+    parser.add_argument('--output', '-o', help='Write the measurements to a JSON file')
+    args = parser.parse_args()
+
+    documents = sorted(glob.glob(os.path.join(args.directory, args.pattern)))
+    if not documents:
+        print(f"❌ No files found matching {args.pattern} in {args.directory}")
+        sys.exit(1)
+
+    baseline, baseline_time = run(FraudDetector(), documents)
+    rows = []
+    for scale in args.scales:
+        detector = FraudDetector(triage_scale=scale, triage_band=args.band)
+        results, elapsed = run(detector, documents)
+        agree = sum(r['fraud_detected'] == b['fraud_detected'] for r, b in zip(results, baseline))
+        triaged = [(r, b) for r, b in zip(results, baseline) if r['tier'] == 'triage']
+        rows.append({
+            'scale': scale,
+            'seconds': elapsed,
+            'throughput': len(documents) / elapsed,
+            'speedup': baseline_time / elapsed,
+            'triage_rate': len(triaged) / len(documents),
+            'agreement': agree / len(documents),
+            'triage_agreement': (sum(r['fraud_detected'] == b['fraud_detected'] for r, b in triaged)
+                                 / len(triaged)) if triaged else None
+        })
+
+    print("\n" + "="*70)
+    print("🔎 TRIAGE BENCHMARK")
+    print("="*70)
+    print(f"   Documents: {len(documents)} ({args.directory}/{args.pattern})")
+    print(f"   Uncertainty band: ±{args.band:.0%} of each threshold")
+    print(f"   Full resolution: {len(documents) / baseline_time:.2f} documents/second")
+    print("-"*70)
+    print(f"   {'Scale':<8}{'Docs/s':>9}{'Speed-up':>10}{'Triaged':>10}{'Agreement':>11}{'(triaged)':>11}")
+    for row in rows:
+        triage_agreement = ('-' if row['triage_agreement'] is None
+                            else f"{row['triage_agreement']:.1%}")
+        print(f"   1/{row['scale']:<6}{row['throughput']:>9.2f}{row['speedup']:>9.2f}x"
+              f"{row['triage_rate']:>10.1%}{row['agreement']:>11.1%}{triage_agreement:>11}")
+    print("="*70 + "\n")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'documents': len(documents), 'band': args.band,
+                       'full_seconds': baseline_time, 'triage': rows}, f, indent=2)
+        print(f"💾 Results saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
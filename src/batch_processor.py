@@ -5,8 +5,9 @@ Handles multiple documents efficiently with caching and progress tracking
 
 import os
 import json
-import hashlib
 import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
 from datetime import datetime
 from pathlib import Path
 import sys
@@ -15,6 +16,42 @@ import sys
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src.fraud_detector import FraudDetector
+from src.utils.file_hasher import FileHasher
+from src.utils.result_cache import ResultCache, StageCache, config_digest
+from src.utils.timing import TimingStats
+
+
+# Per-process detector and cache used by pool workers (set up by _init_worker)
+_worker_detector = None
+_worker_cache = None
+
+
+def _init_worker(detector, cache_settings):
+    """
+    Process pool initializer
+    
+    Args:
+        detector (FraudDetector): The parent's detector (pickled, so every
+                                  worker uses the same parameters)
+        cache_settings (dict): ResultCache arguments for stage caching,
+                               or None when caching is disabled
+    """
+    global _worker_detector, _worker_cache
+    _worker_detector = detector
+    _worker_cache = ResultCache(**cache_settings) if cache_settings else None
+
+
+def _analyze_in_worker(file_path, file_hash):
+    """
+    Analyze one document inside a pool worker
+    
+    Returns:
+        tuple: (result, processing_time)
+    """
+    stage_cache = StageCache(_worker_cache, file_hash) if _worker_cache else None
+    start_time = time.time()
+    result = _worker_detector.analyze_document(file_path, verbose=False, stage_cache=stage_cache)
+    return result, time.time() - start_time
 
 
 class BatchProcessor:
@@ -22,23 +59,71 @@ class BatchProcessor:
     Processes multiple documents with caching and progress tracking
     """
     
-    def __init__(self, use_cache=True, cache_dir='data/cache'):
+    # Results database and file hash index inside cache_dir
+    CACHE_FILE = 'results.sqlite3'
+    HASH_INDEX_FILE = 'hash_index.sqlite3'
+    
+    def __init__(self, use_cache=True, cache_dir='data/cache', workers=1,
+                 concurrent_detectors=False, cache_max_mb=1024,
+                 cache_max_entries=None, cache_ttl=None, cascade=False,
+                 triage_scale=None, triage_band=0.5):
         """
         Initialize batch processor
         
         Args:
             use_cache (bool): Enable result caching
             cache_dir (str): Directory for cache files
+            workers (int): Default number of worker processes for batches
+                           (1 = analyze in this process)
+            concurrent_detectors (bool): Run the detectors of each in-process
+                                         analysis concurrently (lower latency
+                                         for single documents)
+            cache_max_mb (float): Cache size cap in MB; least recently
+                                  used results are evicted (None = unlimited)
+            cache_max_entries (int): Cache entry cap (None = unlimited)
+            cache_ttl (float): Seconds a cached result stays valid
+                               (None = until evicted)
+            cascade (bool): Stop each analysis once the detector vote is
+                            decided (see FraudDetector)
+            triage_scale (int): Triage documents at 1/2, 1/4 or 1/8
+                                resolution first (None = off)
+            triage_band (float): Triage uncertainty band (see FraudDetector)
         """
-        self.fraud_detector = FraudDetector(use_segmentation=True)
+        self.fraud_detector = FraudDetector(use_segmentation=True,
+                                            concurrent=concurrent_detectors,
+                                            cascade=cascade,
+                                            triage_scale=triage_scale,
+                                            triage_band=triage_band)
         self.use_cache = use_cache
         self.cache_dir = cache_dir
+        self.workers = max(1, int(workers))
         
-        # Create cache directory
+        # Open (or create) the cache database
+        self.cache = None
+        self.cache_settings = None
         if self.use_cache:
-            os.makedirs(cache_dir, exist_ok=True)
+            self.cache_settings = {
+                'path': os.path.join(cache_dir, self.CACHE_FILE),
+                'max_entries': cache_max_entries,
+                'max_bytes': int(cache_max_mb * 1024 * 1024) if cache_max_mb else None,
+                'ttl': cache_ttl
+            }
+            self.cache = ResultCache(**self.cache_settings)
+        
+        # Content hashing (with a stat-keyed index when caching is enabled)
+        self.hasher = FileHasher(
+            os.path.join(cache_dir, self.HASH_INDEX_FILE) if self.use_cache else None)
         
         # Statistics
+        self.reset_stats()
+        
+        print("🚀 Batch Processor initialized")
+        print(f"   📦 Caching: {'ENABLED' if use_cache else 'DISABLED'}")
+        if use_cache:
+            print(f"   📁 Cache directory: {cache_dir}")
+    
+    def reset_stats(self):
+        """Start statistics afresh (e.g. between batches of a long-lived processor)"""
         self.stats = {
             'total_processed': 0,
             'cache_hits': 0,
@@ -46,39 +131,45 @@ class BatchProcessor:
             'fraud_detected': 0,
             'authentic': 0,
             'errors': 0,
-            'total_time': 0
+            'total_time': 0,
+            'stage_timings': {}
         }
         
-        print("🚀 Batch Processor initialized")
-        print(f"   📦 Caching: {'ENABLED' if use_cache else 'DISABLED'}")
-        if use_cache:
-            print(f"   📁 Cache directory: {cache_dir}")
+        # Per-stage timings of freshly analyzed documents (not cache hits)
+        self.timing_stats = TimingStats()
     
     def _get_file_hash(self, file_path):
         """
-        Calculate MD5 hash of file for cache key
+        Calculate content hash of file for cache key
+        
+        Unchanged files (same size, mtime and inode as when last hashed)
+        are looked up in the hash index instead of being read again.
         
         Args:
             file_path (str): Path to file
             
         Returns:
-            str: MD5 hash of file content
+            str: BLAKE2b hash of file content
         """
-        hash_md5 = hashlib.md5()
-        
         try:
-            with open(file_path, "rb") as f:
-                # Read file in chunks to handle large files
-                for chunk in iter(lambda: f.read(4096), b""):
-                    hash_md5.update(chunk)
-            return hash_md5.hexdigest()
+            return self.hasher.digest(file_path)
         except Exception as e:
             print(f"⚠️  Error calculating hash for {file_path}: {e}")
             return None
     
-    def _get_cache_path(self, file_hash):
-        """Get cache file path for a document hash"""
-        return os.path.join(self.cache_dir, f"{file_hash}.json")
+    def _result_key(self, file_hash):
+        """
+        Cache key of a final result: file content plus the digest of every
+        stage's parameters, so changing any detector setting or threshold
+        never serves a stale verdict
+        """
+        return f"result:{file_hash}:{config_digest(self.fraud_detector.get_config())}"
+    
+    def _stage_cache(self, file_hash):
+        """Per-stage cache for a document (None when caching is disabled)"""
+        if not self.use_cache:
+            return None
+        return StageCache(self.cache, file_hash)
     
     def _load_from_cache(self, file_hash):
         """
@@ -93,17 +184,15 @@ class BatchProcessor:
         if not self.use_cache:
             return None
         
-        cache_path = self._get_cache_path(file_hash)
+        try:
+            cached_result = self.cache.get(self._result_key(file_hash))
+        except Exception as e:
+            print(f"⚠️  Error reading cache: {e}")
+            return None
         
-        if os.path.exists(cache_path):
-            try:
-                with open(cache_path, 'r') as f:
-                    cached_result = json.load(f)
-                    self.stats['cache_hits'] += 1
-                    return cached_result
-            except Exception as e:
-                print(f"⚠️  Error reading cache: {e}")
-                return None
+        if cached_result is not None:
+            self.stats['cache_hits'] += 1
+            return cached_result
         
         self.stats['cache_misses'] += 1
         return None
@@ -119,8 +208,6 @@ class BatchProcessor:
         if not self.use_cache:
             return
         
-        cache_path = self._get_cache_path(file_hash)
-        
         try:
             # Add cache metadata
             cached_result = {
@@ -129,8 +216,7 @@ class BatchProcessor:
                 'file_hash': file_hash
             }
             
-            with open(cache_path, 'w') as f:
-                json.dump(cached_result, f, indent=2)
+            self.cache.put(self._result_key(file_hash), cached_result)
         except Exception as e:
             print(f"⚠️  Error saving to cache: {e}")
     
@@ -164,129 +250,330 @@ class BatchProcessor:
             print(f"   🔍 Analyzing...")
         
         start_time = time.time()
-        result = self.fraud_detector.analyze_document(file_path, verbose=verbose)
+        result = self.fraud_detector.analyze_document(file_path, verbose=verbose,
+                                                      stage_cache=self._stage_cache(file_hash))
         processing_time = time.time() - start_time
         
+        return self._finish_result(file_path, file_hash, result, processing_time)
+    
+    def _finish_result(self, file_path, file_hash, result, processing_time):
+        """
+        Attach processing metadata to a fresh result and cache it
+        (unless OCR failed)
+        
+        Args:
+            file_path (str): Path to document
+            file_hash (str): File hash (cache key)
+            result (dict): Analysis result
+            processing_time (float): Analysis time in seconds
+            
+        Returns:
+            dict: Result with metadata
+        """
         # Add processing metadata
         result['processing_time'] = processing_time
         result['processed_at'] = datetime.now().isoformat()
         result['file_path'] = file_path
         result['file_hash'] = file_hash
+        self.timing_stats.add(result.get('timings'))
         
-        # Save to cache
-        self._save_to_cache(file_hash, result)
+        # Save to cache (not verdicts degraded by an OCR failure, so they
+        # are recomputed once Tesseract works again)
+        if result.get('ocr_status') != 'failed':
+            self._save_to_cache(file_hash, result)
         
         return result
     
-    def process_batch(self, file_paths, show_progress=True):
+    def _iter_sequential(self, file_paths):
         """
-        Process multiple documents with progress tracking
+        Analyze documents one after another in this process
+        
+        Yields:
+            tuple: (file_path, result or Exception), in input order
+        """
+        for file_path in file_paths:
+            try:
+                yield file_path, self.process_single(file_path, verbose=False)
+            except Exception as e:
+                yield file_path, e
+    
+    def _iter_parallel(self, file_paths, workers):
+        """
+        Analyze documents on a process pool
+        
+        Hashing and cache lookups stay in this process, so cache hits are
+        served without dispatching work. Misses go to the pool, whose
+        workers each get a copy of this processor's FraudDetector and
+        share the stage cache database. At most a few documents per
+        worker are in flight, and results come back in input order.
+        
+        Args:
+            file_paths (list): List of document paths
+            workers (int): Number of worker processes
+            
+        Yields:
+            tuple: (file_path, result or Exception), in input order
+        """
+        max_in_flight = workers * 4
+        pending = deque()  # (file_path, file_hash, ready result or Future)
+        in_flight = 0
+        
+        def collect(entry):
+            file_path, file_hash, outcome = entry
+            if not isinstance(outcome, Future):
+                return file_path, outcome
+            try:
+                result, processing_time = outcome.result()
+                return file_path, self._finish_result(file_path, file_hash, result, processing_time)
+            except Exception as e:
+                return file_path, e
+        
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(self.fraud_detector, self.cache_settings)) as pool:
+            for file_path in file_paths:
+                file_hash = self._get_file_hash(file_path)
+                cached_result = self._load_from_cache(file_hash) if file_hash else None
+                
+                if not file_hash:
+                    pending.append((file_path, None, {'error': 'Could not calculate file hash'}))
+                elif cached_result:
+                    pending.append((file_path, file_hash, cached_result['result']))
+                else:
+                    pending.append((file_path, file_hash, pool.submit(_analyze_in_worker, file_path, file_hash)))
+                    in_flight += 1
+                
+                # Hand back finished results in order while the window is full
+                while pending and (in_flight >= max_in_flight or
+                                   not isinstance(pending[0][2], Future)):
+                    entry = pending.popleft()
+                    if isinstance(entry[2], Future):
+                        in_flight -= 1
+                    yield collect(entry)
+            
+            while pending:
+                yield collect(pending.popleft())
+    
+    def iter_batch(self, file_paths, show_progress=True, workers=None, sink=None):
+        """
+        Process multiple documents, yielding each result as it finishes
+        
+        Results are not accumulated and their stage timings go into a
+        bounded histogram (TimingStats), so memory stays flat however long
+        the batch is. Each result is also written to `sink` (if given), which
+        is flushed when the batch ends or is interrupted. Statistics are
+        updated as results are yielded and the summary is printed once
+        the iterator is exhausted.
         
         Args:
             file_paths (list): List of document paths
             show_progress (bool): Show progress bar
+            workers (int): Worker processes (default: self.workers; 1 = sequential)
+            sink (ResultSink): Append each result to this sink (see
+                               src.utils.result_sink; the caller closes it)
             
-        Returns:
-            list: Results for all documents
+        Yields:
+            dict: Result for each document (in input order)
         """
+        workers = self.workers if workers is None else max(1, int(workers))
+        
         print("\n" + "="*70)
         print("📦 BATCH PROCESSING")
         print("="*70)
         print(f"   Total documents: {len(file_paths)}")
         print(f"   Caching: {'ENABLED' if self.use_cache else 'DISABLED'}")
+        print(f"   Workers: {workers}")
+        if sink is not None:
+            print(f"   Streaming to: {sink.path}")
         print("="*70)
         
-        results = []
         start_time = time.time()
         
-        for i, file_path in enumerate(file_paths, 1):
-            if show_progress:
-                # Progress indicator
-                percent = (i / len(file_paths)) * 100
-                bar_length = 40
-                filled = int(bar_length * i / len(file_paths))
-                bar = '█' * filled + '░' * (bar_length - filled)
-                
-                print(f"\n[{i}/{len(file_paths)}] {bar} {percent:.1f}%")
-                print(f"📄 {os.path.basename(file_path)}")
-            
-            try:
-                # Process document
-                result = self.process_single(file_path, verbose=False)
-                
-                # Update statistics
-                self.stats['total_processed'] += 1
+        if workers > 1 and len(file_paths) > 1:
+            outcomes = self._iter_parallel(file_paths, workers)
+        else:
+            outcomes = self._iter_sequential(file_paths)
+        
+        try:
+            for i, (file_path, outcome) in enumerate(outcomes, 1):
+                if show_progress:
+                    # Progress indicator
+                    percent = (i / len(file_paths)) * 100
+                    bar_length = 40
+                    filled = int(bar_length * i / len(file_paths))
+                    bar = '█' * filled + '░' * (bar_length - filled)
+                    
+                    print(f"\n[{i}/{len(file_paths)}] {bar} {percent:.1f}%")
+                    print(f"📄 {os.path.basename(file_path)}")
                 
-                if result.get('fraud_detected'):
-                    self.stats['fraud_detected'] += 1
-                    if show_progress:
-                        print(f"   🚨 FRAUD DETECTED (confidence: {result['confidence']:.1f}%)")
-                else:
-                    self.stats['authentic'] += 1
+                try:
+                    # Analysis errors are raised here and recorded below
+                    if isinstance(outcome, Exception):
+                        raise outcome
+                    result = outcome
+                    if result.get('error'):
+                        raise RuntimeError(result['error'])
+                    
+                    # Update statistics
+                    self.stats['total_processed'] += 1
+                    
+                    if result.get('fraud_detected'):
+                        self.stats['fraud_detected'] += 1
+                        if show_progress:
+                            print(f"   🚨 FRAUD DETECTED (confidence: {result['confidence']:.1f}%)")
+                    else:
+                        self.stats['authentic'] += 1
+                        if show_progress:
+                            print(f"   ✅ AUTHENTIC (confidence: {result['confidence']:.1f}%)")
+                    
+                except Exception as e:
+                    self.stats['errors'] += 1
+                    result = {
+                        'file_path': file_path,
+                        'error': str(e),
+                        'fraud_detected': False
+                    }
                     if show_progress:
-                        print(f"   ✅ AUTHENTIC (confidence: {result['confidence']:.1f}%)")
-                
-                results.append(result)
+                        print(f"   ❌ ERROR: {e}")
                 
-            except Exception as e:
-                self.stats['errors'] += 1
-                error_result = {
-                    'file_path': file_path,
-                    'error': str(e),
-                    'fraud_detected': False
-                }
-                results.append(error_result)
-                if show_progress:
-                    print(f"   ❌ ERROR: {e}")
+                if sink is not None:
+                    sink.write(result)
+                yield result
+        finally:
+            # Whatever finished is on disk, even if the batch was cut short
+            if sink is not None:
+                sink.flush()
         
         total_time = time.time() - start_time
         self.stats['total_time'] = total_time
+        self.stats['stage_timings'] = self.timing_stats.summary()
         
         # Print summary
         self._print_batch_summary(len(file_paths), total_time)
+    
+    def process_batch(self, file_paths, show_progress=True, workers=None, sink=None,
+                      collect=True):
+        """
+        Process multiple documents with progress tracking
         
+        Args:
+            file_paths (list): List of document paths
+            show_progress (bool): Show progress bar
+            workers (int): Worker processes (default: self.workers; 1 = sequential)
+            sink (ResultSink): Also append each result to this sink
+            collect (bool): Keep the results in memory and return them
+                            (False: results only go to the sink)
+            
+        Returns:
+            list: Results for all documents (in input order; empty if
+                  collect is False)
+        """
+        results = []
+        for result in self.iter_batch(file_paths, show_progress=show_progress,
+                                      workers=workers, sink=sink):
+            if collect:
+                results.append(result)
         return results
     
+    def process_job(self, job, show_progress=True, workers=None):
+        """
+        Run the unfinished part of a resumable batch job
+        
+        Only the job's pending documents are dispatched; finished ones are
+        not hashed or opened again. Every outcome is journaled as soon as
+        it arrives, so the job can be interrupted and resumed at any point.
+        
+        Args:
+            job (BatchJob): Job to run (see src.utils.batch_job)
+            show_progress (bool): Show progress bar
+            workers (int): Worker processes (default: self.workers)
+            
+        Returns:
+            dict: Job progress after this run (see BatchJob.progress())
+        """
+        pending = job.pending()
+        progress = job.progress()
+        print(f"🗂️  Job {job.job_id}: {progress['done']}/{progress['total']} done, "
+              f"{len(pending)} to process")
+        
+        if pending:
+            file_paths = [job.files[i] for i in pending]
+            try:
+                results = self.iter_batch(file_paths, show_progress=show_progress, workers=workers)
+                for position, result in enumerate(results):
+                    job.record(pending[position], result)
+            finally:
+                job.close()
+        
+        return job.progress()
+    
     def _print_batch_summary(self, total_docs, total_time):
         """Print batch processing summary"""
-        print("\n" + "="*70)
-        print("📊 BATCH PROCESSING COMPLETE")
-        print("="*70)
+        print(self.format_batch_summary(total_docs, total_time))
+    
+    def format_batch_summary(self, total_docs, total_time):
+        """
+        Batch processing summary as text
+        
+        Args:
+            total_docs (int): Number of documents in the batch
+            total_time (float): Batch wall time in seconds
+            
+        Returns:
+            str: Summary report
+        """
+        lines = []
+        lines.append("\n" + "="*70)
+        lines.append("📊 BATCH PROCESSING COMPLETE")
+        lines.append("="*70)
         
         # Processing stats
-        print(f"\n📈 Processing Statistics:")
-        print(f"   Total documents: {self.stats['total_processed']}")
-        print(f"   Fraud detected: {self.stats['fraud_detected']}")
-        print(f"   Authentic: {self.stats['authentic']}")
-        print(f"   Errors: {self.stats['errors']}")
+        lines.append(f"\n📈 Processing Statistics:")
+        lines.append(f"   Total documents: {self.stats['total_processed']}")
+        lines.append(f"   Fraud detected: {self.stats['fraud_detected']}")
+        lines.append(f"   Authentic: {self.stats['authentic']}")
+        lines.append(f"   Errors: {self.stats['errors']}")
         
         if self.stats['total_processed'] > 0:
             fraud_rate = (self.stats['fraud_detected'] / self.stats['total_processed']) * 100
-            print(f"   Fraud rate: {fraud_rate:.1f}%")
+            lines.append(f"   Fraud rate: {fraud_rate:.1f}%")
         
         # Cache stats
         if self.use_cache:
-            print(f"\n⚡ Cache Performance:")
+            lines.append(f"\n⚡ Cache Performance:")
             total_cache_ops = self.stats['cache_hits'] + self.stats['cache_misses']
             if total_cache_ops > 0:
                 hit_rate = (self.stats['cache_hits'] / total_cache_ops) * 100
-                print(f"   Cache hits: {self.stats['cache_hits']}")
-                print(f"   Cache misses: {self.stats['cache_misses']}")
-                print(f"   Hit rate: {hit_rate:.1f}%")
+                lines.append(f"   Cache hits: {self.stats['cache_hits']}")
+                lines.append(f"   Cache misses: {self.stats['cache_misses']}")
+                lines.append(f"   Hit rate: {hit_rate:.1f}%")
                 
                 if self.stats['cache_hits'] > 0:
                     time_saved = self.stats['cache_hits'] * 2.164  # Average processing time
-                    print(f"   Time saved: {time_saved:.1f} seconds")
+                    lines.append(f"   Time saved: {time_saved:.1f} seconds")
         
         # Performance stats
-        print(f"\n⏱️  Performance:")
-        print(f"   Total time: {total_time:.2f} seconds")
-        print(f"   Average per document: {(total_time / total_docs):.2f} seconds")
-        print(f"   Throughput: {(total_docs / total_time):.2f} documents/second")
-        
-        print("="*70 + "\n")
+        lines.append(f"\n⏱️  Performance:")
+        lines.append(f"   Total time: {total_time:.2f} seconds")
+        lines.append(f"   Average per document: {(total_time / total_docs):.2f} seconds")
+        lines.append(f"   Throughput: {(total_docs / total_time):.2f} documents/second")
+        
+        # Where the time went (freshly analyzed documents only)
+        stage_timings = self.stats['stage_timings']
+        if stage_timings:
+            total_stage_wall = sum(stage['total_wall'] for stage in stage_timings.values())
+            lines.append(f"\n🔬 Stage Breakdown (wall time):")
+            lines.append(f"   {'Stage':<18}{'Total':>9}{'Share':>8}{'p50':>9}{'p90':>9}{'p99':>9}{'CPU':>9}")
+            for name, stage in stage_timings.items():
+                share = stage['total_wall'] / total_stage_wall * 100 if total_stage_wall else 0
+                lines.append(f"   {name:<18}{stage['total_wall']:>8.2f}s{share:>7.1f}%"
+                             f"{stage['p50_wall']:>8.3f}s{stage['p90_wall']:>8.3f}s"
+                             f"{stage['p99_wall']:>8.3f}s{stage['total_cpu']:>8.2f}s")
+        
+        lines.append("="*70 + "\n")
+        return "\n".join(lines)
     
-    def process_directory(self, directory_path, pattern='*.jpg', show_progress=True):
+    def process_directory(self, directory_path, pattern='*.jpg', show_progress=True, workers=None,
+                          sink=None, collect=True):
         """
         Process all documents in a directory
         
@@ -294,6 +581,9 @@ class BatchProcessor:
             directory_path (str): Path to directory
             pattern (str): File pattern (e.g., '*.jpg', '*.png')
             show_progress (bool): Show progress
+            workers (int): Worker processes (default: self.workers)
+            sink (ResultSink): Also append each result to this sink
+            collect (bool): Keep and return the results (see process_batch)
             
         Returns:
             list: Results for all documents
@@ -312,7 +602,8 @@ class BatchProcessor:
         file_paths = [str(f) for f in file_paths]
         
         # Process batch
-        return self.process_batch(file_paths, show_progress=show_progress)
+        return self.process_batch(file_paths, show_progress=show_progress, workers=workers,
+                                  sink=sink, collect=collect)
     
     def save_results(self, results, output_file='data/batch_results.json'):
         """
@@ -344,33 +635,52 @@ class BatchProcessor:
             print("⚠️  Caching is disabled")
             return
         
-        cache_files = list(Path(self.cache_dir).glob('*.json'))
+        try:
+            removed = self.cache.clear()
+        except Exception as e:
+            print(f"⚠️  Error clearing cache: {e}")
+            return
         
-        for cache_file in cache_files:
-            try:
-                os.remove(cache_file)
-            except Exception as e:
-                print(f"⚠️  Error deleting {cache_file}: {e}")
+        print(f"🗑️  Cleared {removed} cached results")
+    
+    def get_cache_stats(self):
+        """
+        Lifetime cache statistics (read in O(1) from the cache database)
         
-        print(f"🗑️  Cleared {len(cache_files)} cache files")
+        Returns:
+            dict: entries, bytes, hits, misses, evictions, file_bytes
+                  (empty if caching is disabled)
+        """
+        if not self.use_cache:
+            return {}
+        return self.cache.stats()
     
     def get_cache_size(self):
-        """Get total size of cache directory"""
+        """Get total size of cached results"""
         if not self.use_cache:
             return 0
         
-        total_size = 0
-        cache_files = list(Path(self.cache_dir).glob('*.json'))
-        
-        for cache_file in cache_files:
-            total_size += os.path.getsize(cache_file)
+        cache_stats = self.get_cache_stats()
         
         # Convert to MB
-        size_mb = total_size / (1024 * 1024)
+        size_mb = cache_stats['bytes'] / (1024 * 1024)
         
-        print(f"📦 Cache size: {size_mb:.2f} MB ({len(cache_files)} files)")
+        print(f"📦 Cache size: {size_mb:.2f} MB ({cache_stats['entries']} results)")
         
         return size_mb
+    
+    def close(self):
+        """Stop the detector's thread pool and close the cache databases"""
+        self.fraud_detector.close()
+        if self.cache is not None:
+            self.cache.close()
+        self.hasher.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
 
 
 # Test function
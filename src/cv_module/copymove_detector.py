@@ -6,21 +6,244 @@ With semantic segmentation support to exclude text regions
 
 import cv2
 import numpy as np
+from src.utils.document_image import DocumentImage
+from src.utils.text_mask import TextMask
+from src.utils.timing import timed
+
+
+def _box_sums(integral, rows, cols, size):
+    """Sums of size x size windows with top-left corners rows x cols"""
+    r0, r1 = rows[:, None], rows[:, None] + size
+    c0, c1 = cols[None, :], cols[None, :] + size
+    return integral[r1, c1] - integral[r0, c1] - integral[r1, c0] + integral[r0, c0]
+
+
+def _run_sums(values, starts, size):
+    """Sums of size-long runs along each row of values, starting at starts"""
+    cumulative = np.diff(cv2.integral(np.ascontiguousarray(values, dtype=np.float64)), axis=0)
+    return cumulative[:, starts + size] - cumulative[:, starts]
+
+
+class _ShiftAccumulator:
+    """
+    Running totals of matched block pairs, per shift vector
+
+    Each pair is oriented so the shift points down (or right on the same
+    row) and binned by its exact shift on the block grid. Per bin it keeps
+    the pair count and the bounding box of the source blocks; the targets
+    are the same box moved by the shift. The buffers hold one entry per
+    possible shift (about 20 bytes each), so memory depends on the image
+    size only, not on how many pairs match.
+    """
+    
+    def __init__(self, positions, step, block_size):
+        """
+        Args:
+            positions: (N, 2) array of block (x, y) (sets the grid extent)
+            step (int): Block grid spacing in pixels
+            block_size (int): Block side in pixels (for the boxes)
+        """
+        self.step = step
+        self.block_size = block_size
+        self.origin = positions.min(axis=0)
+        self.nx, self.ny = ((positions.max(axis=0) - self.origin) // step + 1).tolist()
+        self.width = 2 * self.nx - 1  # dx in [-(nx - 1), nx - 1]
+        bins = self.width * self.ny
+        self.count = np.zeros(bins, dtype=np.int32)
+        self.low = np.full((bins, 2), np.iinfo(np.int32).max, dtype=np.int32)
+        self.high = np.full((bins, 2), -1, dtype=np.int32)
+        self.total = 0
+    
+    def add(self, source, target):
+        """
+        Count a chunk of matched pairs
+        
+        Args:
+            source, target: (M, 2) arrays of the (x, y) of each pair's blocks
+        """
+        if len(source) == 0:
+            return
+        source = (source - self.origin) // self.step
+        target = (target - self.origin) // self.step
+        shift = target - source
+        flip = (shift[:, 1] < 0) | ((shift[:, 1] == 0) & (shift[:, 0] < 0))
+        source = np.where(flip[:, None], target, source)
+        shift[flip] *= -1
+        
+        bins = shift[:, 1] * self.width + shift[:, 0] + self.nx - 1
+        np.add.at(self.count, bins, 1)
+        np.minimum.at(self.low, bins, source)
+        np.maximum.at(self.high, bins, source)
+        self.total += len(bins)
+    
+    def histogram(self, bins):
+        """
+        Coarse 2-D histogram of the shift vectors
+        
+        Args:
+            bins (int): Bins per axis
+            
+        Returns:
+            dict: dx_edges, dy_edges (pixels) and counts (dy rows x dx columns)
+        """
+        dy, dx = np.divmod(np.arange(len(self.count)), self.width)
+        dx -= self.nx - 1
+        dx_edges = np.linspace(-(self.nx - 1) - 0.5, self.nx - 0.5, bins + 1)
+        dy_edges = np.linspace(-0.5, self.ny - 0.5, bins + 1)
+        column = np.clip(np.searchsorted(dx_edges, dx, side='right') - 1, 0, bins - 1)
+        row = np.clip(np.searchsorted(dy_edges, dy, side='right') - 1, 0, bins - 1)
+        counts = np.bincount(row * bins + column, weights=self.count, minlength=bins * bins)
+        return {
+            'dx_edges': (dx_edges * self.step).tolist(),
+            'dy_edges': (dy_edges * self.step).tolist(),
+            'counts': counts.astype(np.int64).reshape(bins, bins).tolist()
+        }
+    
+    def top_bins(self, top_k):
+        """Bins of the top_k shifts with the most pairs, strongest first"""
+        nonzero = np.flatnonzero(self.count)
+        return nonzero[np.lexsort((nonzero, -self.count[nonzero]))[:top_k]].tolist()
+    
+    def grid_shift(self, b):
+        """Shift of bin b in grid steps, as an (dx, dy) array"""
+        dy, dx = divmod(b, self.width)
+        return np.array([dx - (self.nx - 1), dy])
+    
+    def clusters(self, top_k):
+        """
+        The shift vectors with the most matched pairs
+        
+        Args:
+            top_k (int): Number of clusters to return
+            
+        Returns:
+            list: {'shift': [dx, dy], 'count', 'source_bbox', 'target_bbox'}
+                  dicts, strongest first; boxes are [x, y, w, h] in pixels
+        """
+        clusters = []
+        for b in self.top_bins(top_k):
+            shift = self.grid_shift(b) * self.step
+            low = self.low[b] * self.step + self.origin
+            size = (self.high[b] - self.low[b]) * self.step + self.block_size
+            clusters.append({
+                'shift': shift.tolist(),
+                'count': int(self.count[b]),
+                'source_bbox': low.tolist() + size.tolist(),
+                'target_bbox': (low + shift).tolist() + size.tolist()
+            })
+        return clusters
 
 
 class CopyMoveDetector:
     """Detects copy-move forgery in document images"""
     
-    def __init__(self, block_size=16, threshold=0.9):
+    # Pixels per stripe in vectorized block extraction (bounds peak memory)
+    STRIPE_PIXELS = 2_000_000
+    
+    # Max |difference| of (std, mean, edge_intensity) for two blocks to match
+    FEATURE_TOLERANCE = (5, 10, 3)
+    
+    # Candidate pairs expanded per vectorized chunk in bucketed matching
+    MATCH_CHUNK = 1_000_000
+    
+    MATCH_MODES = ('bucketed', 'brute')
+    
+    # 'stats': (std, mean, edge_intensity) matched within FEATURE_TOLERANCE
+    # 'dct': quantised low-frequency DCT coefficients, lexicographically sorted
+    ENGINES = ('stats', 'dct')
+    
+    # DCT engine: the DCT_SIZE x DCT_SIZE lowest frequencies of each block,
+    # scaled to grey levels (DC = block mean) and quantised in steps of
+    # DCT_QUANTIZATION; rows up to SORT_WINDOW apart in sorted order are
+    # compared and match if no coefficient differs by more than DCT_TOLERANCE
+    DCT_SIZE = 4
+    DCT_QUANTIZATION = 4.0
+    DCT_TOLERANCE = 1
+    SORT_WINDOW = 8
+    
+    OUTPUT_MODES = ('pairs', 'aggregate')
+    
+    # Bins per axis of the shift-vector histogram in aggregate output
+    SHIFT_HISTOGRAM_BINS = 16
+    
+    # Matched blocks a region needs to be reported (lone pairs are texture)
+    MIN_REGION_SUPPORT = 2
+    
+    # Strongest shifts searched for regions (a copied region can be
+    # outnumbered by pairs scattered over textured background)
+    REGION_SHIFTS = 64
+    
+    # Bump when a code change alters detections (invalidates cached results)
+    VERSION = 2
+    
+    def __init__(self, block_size=16, threshold=0.9, match_mode='bucketed', output='pairs',
+                 top_k=10, engine='stats'):
         """
         Initialize detector
         
         Args:
             block_size (int): Size of blocks for comparison (16x16 pixels)
             threshold (float): Similarity threshold (0-1)
+            match_mode (str): 'bucketed' (feature-grid matching) or 'brute'
+                              (all-pairs reference loop, for testing)
+            output (str): 'pairs' (every matching block pair) or 'aggregate'
+                          (count, shift histogram, top_k clusters and their
+                          regions, in memory bounded by the image size)
+            top_k (int): Clusters (and regions) reported in aggregate output
+            engine (str): 'stats' (block statistics, bucketed matching) or
+                          'dct' (DCT descriptors, sorted-neighbour matching)
         """
+        if match_mode not in self.MATCH_MODES:
+            raise ValueError(f"match_mode must be one of {self.MATCH_MODES}, got {match_mode!r}")
+        if output not in self.OUTPUT_MODES:
+            raise ValueError(f"output must be one of {self.OUTPUT_MODES}, got {output!r}")
+        if engine not in self.ENGINES:
+            raise ValueError(f"engine must be one of {self.ENGINES}, got {engine!r}")
+        if engine != 'stats' and match_mode == 'brute':
+            raise ValueError("match_mode='brute' is only available with engine='stats'")
+        
         self.block_size = block_size
         self.threshold = threshold
+        self.match_mode = match_mode
+        self.output = output
+        self.top_k = top_k
+        self.engine = engine
+    
+    def get_config(self):
+        """
+        Parameters that affect detections (part of cache keys)
+        
+        match_mode is left out: both modes return the same pairs.
+        """
+        config = {
+            'version': self.VERSION,
+            'block_size': self.block_size,
+            'threshold': self.threshold,
+            'engine': self.engine,
+            'feature_tolerance': list(self.FEATURE_TOLERANCE),
+            'output': self.output,
+            'top_k': self.top_k if self.output == 'aggregate' else None
+        }
+        if self.engine == 'dct':
+            config.update(feature_tolerance=None, dct_size=self.DCT_SIZE,
+                          dct_quantization=self.DCT_QUANTIZATION,
+                          dct_tolerance=self.DCT_TOLERANCE, sort_window=self.SORT_WINDOW)
+        return config
+    
+    def grid_blocks(self, height, width):
+        """
+        Number of half-overlapping blocks on the grid of an image
+        (before uniform or text blocks are filtered out)
+        
+        Args:
+            height, width (int): Image size in pixels
+            
+        Returns:
+            int: Block positions examined by _block_features
+        """
+        step = self.block_size // 2
+        return (len(range(0, height - self.block_size, step)) *
+                len(range(0, width - self.block_size, step)))
     
     def _is_in_text_region(self, bx, by, text_regions, margin=5):
         """
@@ -60,6 +283,173 @@ class CopyMoveDetector:
         """
         Extract blocks from image, excluding text regions
         
+        Args:
+            img: Grayscale image
+            text_regions: List of (x, y, w, h) text regions to exclude
+            
+        Returns:
+            dict: {position: block_features}
+        """
+        positions, features = self._block_features(img, text_regions)
+        return {(x, y): tuple(f) for (x, y), f in zip(positions.tolist(), features.tolist())}
+    
+    def _block_features(self, img, text_regions=None, text_mask=None):
+        """
+        Vectorized block feature extraction
+        
+        Computes mean, std and Laplacian std for every half-overlapping
+        block at once from integral images, then applies the same filters
+        as the per-block loop in _extract_blocks_reference.
+        
+        Args:
+            img: Grayscale image
+            text_regions: List of (x, y, w, h) text regions to exclude
+            text_mask (TextMask): Prebuilt exclusion mask (overrides text_regions)
+            
+        Returns:
+            tuple: (positions, features) arrays of shape (N, 2) with (x, y)
+                   and (N, 3) with (std, mean, edge_intensity), row-major order
+        """
+        height, width = img.shape
+        step = self.block_size // 2
+        ys = np.arange(0, height - self.block_size, step)
+        xs = np.arange(0, width - self.block_size, step)
+        
+        if len(ys) == 0 or len(xs) == 0:
+            return np.empty((0, 2), dtype=np.int64), np.empty((0, 3))
+        
+        std = np.empty((len(ys), len(xs)))
+        mean = np.empty((len(ys), len(xs)))
+        edge_intensity = np.empty((len(ys), len(xs)))
+        
+        # Work in horizontal stripes of block rows to bound peak memory
+        rows_per_stripe = max(1, self.STRIPE_PIXELS // (width * step))
+        for start in range(0, len(ys), rows_per_stripe):
+            stop = min(start + rows_per_stripe, len(ys))
+            std[start:stop], mean[start:stop], edge_intensity[start:stop] = \
+                self._stripe_features(img, ys[start:stop], xs)
+        
+        keep = (std >= 15) & (mean <= 240) & (mean >= 15) & (edge_intensity >= 5)
+        if text_mask is None and text_regions:
+            text_mask = TextMask(img.shape, text_regions)
+        if text_mask is not None:
+            # The block test is inclusive of x + block_size, hence the +1
+            keep &= ~text_mask.overlaps_grid(xs, ys, self.block_size + 1)
+        
+        row_idx, col_idx = np.nonzero(keep)
+        positions = np.stack([xs[col_idx], ys[row_idx]], axis=1)
+        features = np.stack([std[keep], mean[keep], edge_intensity[keep]], axis=1)
+        return positions, features
+    
+    def _dct_features(self, img, positions):
+        """
+        Quantised low-frequency DCT descriptors of the given blocks
+        
+        The 2-D DCT-II is separable, so the DCT_SIZE x DCT_SIZE lowest
+        frequencies of every block are two batched matrix products with
+        the first DCT_SIZE rows of the orthonormal DCT basis. Blocks are
+        gathered in chunks of about STRIPE_PIXELS pixels to bound memory.
+        
+        Args:
+            img: Grayscale image
+            positions: (N, 2) array of block (x, y)
+            
+        Returns:
+            np.ndarray: (N, DCT_SIZE**2) int32 descriptors, DC first
+        """
+        size = self.block_size
+        k = min(self.DCT_SIZE, size)
+        n = np.arange(size)
+        basis = np.cos(np.pi * (2 * n[None, :] + 1) * np.arange(k)[:, None] / (2 * size))
+        basis *= np.sqrt(2 / size)
+        basis[0] /= np.sqrt(2)
+        # Divide by the block side so the DC term is the block mean
+        basis = (basis / np.sqrt(size)).astype(np.float32)
+        
+        windows = np.lib.stride_tricks.sliding_window_view(img, (size, size))
+        descriptors = np.empty((len(positions), k * k), dtype=np.int32)
+        chunk = max(1, self.STRIPE_PIXELS // (size * size))
+        for start in range(0, len(positions), chunk):
+            x, y = positions[start:start + chunk].T
+            blocks = windows[y, x].astype(np.float32)
+            coefficients = basis @ blocks @ basis.T
+            descriptors[start:start + chunk] = np.rint(
+                coefficients.reshape(len(blocks), -1) / self.DCT_QUANTIZATION)
+        return descriptors
+    
+    def _stripe_features(self, img, ys, xs):
+        """
+        Block statistics for one stripe of block rows
+        
+        The Laplacian is computed once for the whole stripe. Pixels on a
+        block's border are then corrected so the result matches running
+        cv2.Laplacian on each block on its own (reflect-101 at the block
+        edge): the top row gets +V, the bottom row -V, the left column +H
+        and the right column -H, where V and H are the central differences
+        across that edge. Corner pixels get both, hence the cross terms.
+        
+        Args:
+            img: Grayscale image
+            ys: Block top coordinates in this stripe
+            xs: Block left coordinates
+            
+        Returns:
+            tuple: (std, mean, edge_intensity) arrays of shape (len(ys), len(xs))
+        """
+        size = self.block_size
+        last = size - 1
+        n = size * size
+        
+        # Stripe rows plus one neighbour row each side for the Laplacian
+        # (cv2 reflects at the real image border, as it does per block)
+        top, bottom = int(ys[0]), int(ys[-1]) + size
+        lo, hi = max(top - 1, 0), min(bottom + 1, img.shape[0])
+        gray = img[top:bottom]
+        lap = cv2.Laplacian(img[lo:hi], cv2.CV_16S, ksize=1)[top - lo:bottom - lo]
+        
+        rows = ys - top
+        cols = xs
+        
+        # Block sums of gray values and of the full-frame Laplacian
+        gray_sum, gray_sq = (_box_sums(i, rows, cols, size) for i in
+                             cv2.integral2(gray, sdepth=cv2.CV_64F, sqdepth=cv2.CV_64F))
+        lap_sum, lap_sq = (_box_sums(i, rows, cols, size) for i in
+                           cv2.integral2(lap, sdepth=cv2.CV_64F, sqdepth=cv2.CV_64F))
+        
+        # Central differences across the block edges (reflect-101 at x=0 / y=0)
+        def vertical(y):
+            return img[y + 1].astype(np.float64) - img[np.where(y > 0, y - 1, 1)]
+        
+        def horizontal(x):
+            return gray[:, x + 1].astype(np.float64) - gray[:, np.where(x > 0, x - 1, 1)]
+        
+        v_top, v_bottom = vertical(ys), vertical(ys + last)
+        h_left, h_right = horizontal(xs), horizontal(xs + last)
+        l_top, l_bottom = lap[rows].astype(np.float64), lap[rows + last].astype(np.float64)
+        l_left, l_right = lap[:, cols].astype(np.float64), lap[:, cols + last].astype(np.float64)
+        
+        lap_sum += (_run_sums(v_top, cols, size) - _run_sums(v_bottom, cols, size) +
+                    _run_sums(h_left.T, rows, size).T - _run_sums(h_right.T, rows, size).T)
+        lap_sq += (_run_sums(2 * l_top * v_top + v_top * v_top, cols, size) +
+                   _run_sums(-2 * l_bottom * v_bottom + v_bottom * v_bottom, cols, size) +
+                   _run_sums((2 * l_left * h_left + h_left * h_left).T, rows, size).T +
+                   _run_sums((-2 * l_right * h_right + h_right * h_right).T, rows, size).T)
+        lap_sq += 2 * (v_top[:, cols] * h_left[rows] -
+                       v_top[:, cols + last] * h_right[rows] -
+                       v_bottom[:, cols] * h_left[rows + last] +
+                       v_bottom[:, cols + last] * h_right[rows + last])
+        
+        # Sums are exact integers, so these match np.std bit for bit on
+        # power-of-two block sizes
+        mean = gray_sum / n
+        std = np.sqrt(np.maximum(n * gray_sq - gray_sum * gray_sum, 0)) / n
+        edge_intensity = np.sqrt(np.maximum(n * lap_sq - lap_sum * lap_sum, 0)) / n
+        return std, mean, edge_intensity
+    
+    def _extract_blocks_reference(self, img, text_regions=None):
+        """
+        Original per-block loop, kept as the reference for _block_features
+        
         Args:
             img: Grayscale image
             text_regions: List of (x, y, w, h) text regions to exclude
@@ -107,40 +497,366 @@ class CopyMoveDetector:
         
         return blocks
     
-    def detect(self, image_path, text_regions=None, visualize=False):
+    def detect(self, image, text_regions=None, visualize=False, text_mask=None, timer=None):
         """
         Detect copy-move forgery with optional text region exclusion
         
         Args:
-            image_path (str): Path to image
+            image (str or DocumentImage): Image path or already decoded document
             text_regions (list): List of (x, y, w, h) text regions to exclude
             visualize (bool): Whether to save visualization
+            text_mask (TextMask): Prebuilt exclusion mask; built from
+                                  text_regions when not given
+            timer (StageTimer): Records 'block_extraction' and
+                                'block_matching' timings when given
             
         Returns:
-            dict: Detection results
+            dict: Detection results: num_duplicates, text_regions_excluded,
+                  num_blocks retained for matching and candidate_pairs
+                  compared, plus duplicate_pairs ('pairs' output) or
+                  num_shifts, shift_histogram, clusters and regions
+                  ('aggregate')
         """
-        # Load and convert to grayscale
-        img = cv2.imread(image_path)
-        if img is None:
-            return {
-                'num_duplicates': 0,
-                'duplicate_pairs': [],
-                'text_regions_excluded': 0
-            }
+        # Load (or reuse) the document and its grayscale view
+        document = DocumentImage.load(image)
+        if document is None:
+            return self._result(0, 0, 0)
         
-        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+        img = document.bgr
+        gray = document.gray
+        
+        if text_mask is None and text_regions:
+            text_mask = TextMask(gray.shape, text_regions)
+        text_regions_excluded = len(text_mask) if text_mask is not None else 0
         
         # Extract blocks (excluding text regions)
-        blocks = self._extract_blocks(gray, text_regions)
+        with timed(timer, 'block_extraction'):
+            positions, features = self._block_features(gray, text_mask=text_mask)
+            if self.engine == 'dct':
+                features = self._dct_features(gray, positions)
         
-        if len(blocks) < 2:
-            return {
-                'num_duplicates': 0,
-                'duplicate_pairs': [],
-                'text_regions_excluded': len(text_regions) if text_regions else 0
-            }
+        if len(positions) < 2:
+            return self._result(text_regions_excluded, len(positions), 0)
         
         # Find similar blocks
+        match_stats = {}
+        regions = None
+        with timed(timer, 'block_matching'):
+            if self.output == 'aggregate':
+                matches = self._aggregate_matches(positions, features, stats=match_stats)
+                regions = self._shift_regions(positions, features, matches)
+            elif self.match_mode == 'brute':
+                matches = self._match_blocks_brute(positions, features)
+                match_stats['candidate_pairs'] = len(positions) * (len(positions) - 1) // 2
+            else:
+                matches = self._match_blocks(positions, features, stats=match_stats)
+        
+        # Visualize if requested
+        if visualize and (regions if self.output == 'aggregate' else matches) and document.source:
+            self._visualize_duplicates(img, matches if self.output == 'pairs' else [],
+                                      f"{document.source.replace('.jpg', '_copymove.jpg')}",
+                                      regions=regions)
+        
+        return self._result(text_regions_excluded, len(positions),
+                            match_stats['candidate_pairs'], matches, regions)
+    
+    def _result(self, text_regions_excluded, num_blocks, candidate_pairs, matches=None,
+                regions=None):
+        """
+        Detection result in this detector's output mode
+        
+        Args:
+            matches: List of pairs ('pairs' output) or _ShiftAccumulator
+                     ('aggregate'); None when nothing was matched
+            regions (list): Regions from _shift_regions ('aggregate')
+        """
+        result = {'num_duplicates': 0, 'text_regions_excluded': text_regions_excluded,
+                  'num_blocks': num_blocks, 'candidate_pairs': candidate_pairs}
+        if self.output == 'pairs':
+            result['duplicate_pairs'] = matches or []
+            result['num_duplicates'] = len(result['duplicate_pairs'])
+        elif matches is None:
+            bins = self.SHIFT_HISTOGRAM_BINS
+            result.update(num_shifts=0, clusters=[], regions=[], shift_histogram={
+                'dx_edges': [], 'dy_edges': [], 'counts': [[0] * bins for _ in range(bins)]})
+        else:
+            result.update(num_duplicates=matches.total,
+                          num_shifts=int(np.count_nonzero(matches.count)),
+                          shift_histogram=matches.histogram(self.SHIFT_HISTOGRAM_BINS),
+                          clusters=matches.clusters(self.top_k),
+                          regions=regions or [])
+        return result
+    
+    def _match_blocks(self, positions, features, stats=None):
+        """
+        Find duplicate block pairs without comparing every pair
+        
+        Features are bucketed on a grid whose cells are one tolerance wide,
+        so any matching pair lies in the same or an adjacent cell. Only
+        those candidates are compared (in vectorized chunks), using exactly
+        the checks of _match_blocks_brute.
+        
+        Args:
+            positions: (N, 2) array of block (x, y)
+            features: (N, 3) array of (std, mean, edge_intensity)
+            stats (dict): If given, receives 'candidate_pairs' (pairs compared)
+            
+        Returns:
+            list: ((x1, y1), (x2, y2)) pairs, in the brute-force order
+        """
+        firsts, seconds = [], []
+        for i, j in self._iter_matches(positions, features, stats):
+            firsts.append(np.minimum(i, j))
+            seconds.append(np.maximum(i, j))
+        
+        if not firsts:
+            return []
+        
+        firsts, seconds = np.concatenate(firsts), np.concatenate(seconds)
+        order = np.lexsort((seconds, firsts))
+        pos = positions.tolist()
+        return [(tuple(pos[i]), tuple(pos[j]))
+                for i, j in zip(firsts[order].tolist(), seconds[order].tolist())]
+    
+    def _aggregate_matches(self, positions, features, stats=None):
+        """
+        Count duplicate block pairs per shift vector without listing them
+        
+        Args:
+            positions: (N, 2) array of block (x, y)
+            features: (N, 3) array of (std, mean, edge_intensity)
+            stats (dict): If given, receives 'candidate_pairs' (pairs compared)
+            
+        Returns:
+            _ShiftAccumulator: Pair count, per-shift counts and source boxes
+        """
+        accumulator = _ShiftAccumulator(positions, self.block_size // 2, self.block_size)
+        if self.match_mode == 'brute':
+            pairs = self._match_blocks_brute(positions, features)
+            if stats is not None:
+                stats['candidate_pairs'] = len(positions) * (len(positions) - 1) // 2
+            if pairs:
+                pairs = np.array(pairs, dtype=positions.dtype)
+                accumulator.add(pairs[:, 0], pairs[:, 1])
+            return accumulator
+        
+        for i, j in self._iter_matches(positions, features, stats):
+            accumulator.add(positions[i], positions[j])
+        return accumulator
+    
+    def _shift_regions(self, positions, features, accumulator):
+        """
+        Connected source / target regions of the strongest shift vectors
+        
+        For each of the REGION_SHIFTS strongest shifts, every block is
+        tested against the block one shift further on with the same rules
+        as matching. With the stats engine this finds exactly the pairs
+        counted for that shift (the DCT engine may also find pairs its
+        sorted-neighbour search skipped). Their source blocks
+        are marked on the block grid and split into 8-connected components
+        (half-overlapping neighbours are adjacent cells): one component
+        per copied region, however many block pairs it is made of.
+        
+        Args:
+            positions: (N, 2) array of block (x, y)
+            features: (N, 3) array of (std, mean, edge_intensity)
+            accumulator (_ShiftAccumulator): Matches counted per shift
+            
+        Returns:
+            list: {'shift': [dx, dy], 'support', 'source_bbox', 'target_bbox'}
+                  dicts, most supported first (at most top_k); support is
+                  the number of block pairs and boxes are [x, y, w, h]
+        """
+        step = accumulator.step
+        grid = (positions - accumulator.origin) // step
+        extent = np.array([accumulator.nx, accumulator.ny])
+        index = np.full((accumulator.ny, accumulator.nx), -1, dtype=np.int64)
+        index[grid[:, 1], grid[:, 0]] = np.arange(len(positions))
+        
+        found = []
+        for b in accumulator.top_bins(max(self.REGION_SHIFTS, self.top_k)):
+            shift = accumulator.grid_shift(b)
+            target = grid + shift
+            i = np.flatnonzero(((target >= 0) & (target < extent)).all(axis=1))
+            j = index[target[i, 1], target[i, 0]]
+            i, j = i[j >= 0], j[j >= 0]
+            sources = grid[i[self._is_match(positions, features, i, j)]]
+            if len(sources) == 0:
+                continue
+            
+            # Label only the box spanned by this shift's source blocks
+            low = sources.min(axis=0)
+            size = sources.max(axis=0) - low + 1
+            mask = np.zeros((size[1], size[0]), dtype=np.uint8)
+            mask[sources[:, 1] - low[1], sources[:, 0] - low[0]] = 1
+            _, _, stats, _ = cv2.connectedComponentsWithStats(mask, connectivity=8)
+            for x, y, w, h, support in stats[1:].tolist():
+                if support >= self.MIN_REGION_SUPPORT:
+                    found.append((support, b, y, x, shift, low + (x, y), (w, h)))
+        
+        found.sort(key=lambda region: (-region[0], region[1], region[2], region[3]))
+        regions = []
+        for support, _, _, _, shift, corner, (w, h) in found[:self.top_k]:
+            corner = corner * step + accumulator.origin
+            size = [(w - 1) * step + self.block_size, (h - 1) * step + self.block_size]
+            regions.append({
+                'shift': (shift * step).tolist(),
+                'support': support,
+                'source_bbox': corner.tolist() + size,
+                'target_bbox': (corner + shift * step).tolist() + size
+            })
+        return regions
+    
+    def _iter_matches(self, positions, features, stats=None):
+        """
+        Yield chunks of matching index pairs from bucketed candidates
+        
+        Args:
+            positions: (N, 2) array of block (x, y)
+            features: (N, 3) array of (std, mean, edge_intensity)
+            stats (dict): If given, receives 'candidate_pairs' once exhausted
+            
+        Yields:
+            tuple: (i, j) index arrays of duplicate pairs
+        """
+        compared = 0
+        candidates = (self._sorted_candidate_pairs if self.engine == 'dct'
+                      else self._candidate_pairs)
+        for i, j in candidates(features):
+            compared += len(i)
+            keep = self._is_match(positions, features, i, j)
+            yield i[keep], j[keep]
+        
+        if stats is not None:
+            stats['candidate_pairs'] = compared
+    
+    def _candidate_pairs(self, features):
+        """
+        Yield chunks of candidate index pairs from neighbouring feature cells
+        
+        Args:
+            features: (N, 3) array of (std, mean, edge_intensity)
+            
+        Yields:
+            tuple: (i, j) index arrays, each unordered pair exactly once
+        """
+        if len(features) < 2:
+            return
+        
+        # Cells slightly wider than the tolerance, so |a - b| < tol always
+        # lands in adjacent cells despite rounding in the division
+        width = np.asarray(self.FEATURE_TOLERANCE, dtype=np.float64) * (1 + 1e-9)
+        cells = np.floor(features / width).astype(np.int64)
+        cells -= cells.min(axis=0) - 1  # keep neighbours (-1) non-negative
+        dims = cells.max(axis=0) + 2
+        strides = np.array([dims[1] * dims[2], dims[2], 1], dtype=np.int64)
+        keys = cells @ strides
+        
+        order = np.argsort(keys, kind='stable')
+        sorted_keys = keys[order]
+        cell_keys, cell_starts, cell_counts = np.unique(
+            sorted_keys, return_index=True, return_counts=True)
+        cell_of = np.searchsorted(cell_keys, sorted_keys)
+        cell_ends = cell_starts + cell_counts
+        
+        # Each block vs. later blocks in its own cell ...
+        index = np.arange(len(keys))
+        owners = [index]
+        starts = [index + 1]
+        ends = [cell_ends[cell_of]]
+        
+        # ... and vs. all blocks in the 13 "forward" neighbour cells
+        for d0 in (-1, 0, 1):
+            for d1 in (-1, 0, 1):
+                for d2 in (-1, 0, 1):
+                    if (d0, d1, d2) <= (0, 0, 0):
+                        continue
+                    neighbour = cell_keys + (d0 * strides[0] + d1 * strides[1] + d2 * strides[2])
+                    found = np.searchsorted(cell_keys, neighbour)
+                    found = np.minimum(found, len(cell_keys) - 1)
+                    exists = cell_keys[found] == neighbour
+                    owner_has = exists[cell_of]
+                    target = found[cell_of][owner_has]
+                    owners.append(index[owner_has])
+                    starts.append(cell_starts[target])
+                    ends.append(cell_ends[target])
+        
+        owners = np.concatenate(owners)
+        starts = np.concatenate(starts)
+        lengths = np.concatenate(ends) - starts
+        nonempty = lengths > 0
+        owners, starts, lengths = owners[nonempty], starts[nonempty], lengths[nonempty]
+        
+        # Expand (owner, start, length) ranges into index pairs, chunk by chunk
+        totals = np.cumsum(lengths)
+        begin = 0
+        while begin < len(lengths):
+            base = totals[begin - 1] if begin else 0
+            end = max(int(np.searchsorted(totals, base + self.MATCH_CHUNK, side='right')), begin + 1)
+            chunk_lengths = lengths[begin:end]
+            offsets = np.cumsum(chunk_lengths) - chunk_lengths
+            i = np.repeat(owners[begin:end], chunk_lengths)
+            j = (np.repeat(starts[begin:end] - offsets, chunk_lengths) +
+                 np.arange(int(chunk_lengths.sum())))
+            yield order[i], order[j]
+            begin = end
+    
+    def _sorted_candidate_pairs(self, features):
+        """
+        Yield chunks of index pairs that are neighbours in sorted order
+        
+        Descriptors are sorted lexicographically (O(N log N)), so near-
+        identical blocks end up next to each other; each row is paired
+        with the SORT_WINDOW rows after it, O(N * SORT_WINDOW) pairs.
+        
+        Args:
+            features: (N, D) array of quantised descriptors
+            
+        Yields:
+            tuple: (i, j) index arrays, each unordered pair at most once
+        """
+        order = np.lexsort(features.T[::-1])
+        for offset in range(1, min(self.SORT_WINDOW, len(order) - 1) + 1):
+            for start in range(0, len(order) - offset, self.MATCH_CHUNK):
+                stop = min(start + self.MATCH_CHUNK, len(order) - offset)
+                yield order[start:stop], order[start + offset:stop + offset]
+    
+    def _is_match(self, positions, features, i, j):
+        """
+        Vectorized duplicate test for index pairs (same rules as the brute loop)
+        
+        Args:
+            positions: (N, 2) array of block (x, y)
+            features: (N, 3) array of (std, mean, edge_intensity), or
+                      (N, D) DCT descriptors with engine='dct'
+            i, j: Index arrays of the pairs to test
+            
+        Returns:
+            np.ndarray: Boolean mask of matching pairs
+        """
+        delta = positions[i] - positions[j]
+        distance = np.sqrt(delta[:, 0] ** 2 + delta[:, 1] ** 2)
+        diff = np.abs(features[i] - features[j])
+        if self.engine == 'dct':
+            return (distance >= self.block_size * 2) & (diff.max(axis=1) <= self.DCT_TOLERANCE)
+        std_tol, mean_tol, edge_tol = self.FEATURE_TOLERANCE
+        return ((distance >= self.block_size * 2) &
+                (diff[:, 0] < std_tol) & (diff[:, 1] < mean_tol) & (diff[:, 2] < edge_tol))
+    
+    def _match_blocks_brute(self, positions, features):
+        """
+        Reference all-pairs matching (O(N^2) Python loop)
+        
+        Args:
+            positions: (N, 2) array of block (x, y)
+            features: (N, 3) array of (std, mean, edge_intensity)
+            
+        Returns:
+            list: ((x1, y1), (x2, y2)) pairs
+        """
+        blocks = {(x, y): tuple(f) for (x, y), f in zip(positions.tolist(), features.tolist())}
+        std_tol, mean_tol, edge_tol = self.FEATURE_TOLERANCE
+        
         duplicate_pairs = []
         positions = list(blocks.keys())
         
@@ -160,24 +876,37 @@ class CopyMoveDetector:
                 edge_diff = abs(features1[2] - features2[2])
                 
                 # Similarity check (all features must match)
-                if std_diff < 5 and mean_diff < 10 and edge_diff < 3:
+                if std_diff < std_tol and mean_diff < mean_tol and edge_diff < edge_tol:
                     duplicate_pairs.append((pos1, pos2))
         
-        # Visualize if requested
-        if visualize and duplicate_pairs:
-            self._visualize_duplicates(img, duplicate_pairs, 
-                                      f"{image_path.replace('.jpg', '_copymove.jpg')}")
-        
-        return {
-            'num_duplicates': len(duplicate_pairs),
-            'duplicate_pairs': duplicate_pairs,
-            'text_regions_excluded': len(text_regions) if text_regions else 0
-        }
+        return duplicate_pairs
     
-    def _visualize_duplicates(self, img, duplicate_pairs, output_path):
-        """Save visualization of detected duplicates"""
+    def _visualize_duplicates(self, img, duplicate_pairs, output_path, regions=None):
+        """
+        Save visualization of detected duplicates
+        
+        With regions (aggregate output), every source (red) and target
+        (blue) region is shaded in a single overlay blend and linked by
+        its shift; otherwise the first 10 block pairs are outlined.
+        """
         vis = img.copy()
         
+        if regions:
+            overlay = vis.copy()
+            for region in regions:
+                for (x, y, w, h), colour in ((region['source_bbox'], (0, 0, 255)),
+                                             (region['target_bbox'], (255, 0, 0))):
+                    cv2.rectangle(overlay, (x, y), (x + w, y + h), colour, -1)
+                    cv2.rectangle(vis, (x, y), (x + w, y + h), colour, 2)
+            vis = cv2.addWeighted(overlay, 0.3, vis, 0.7, 0)
+            for region in regions:
+                x, y, w, h = region['source_bbox']
+                dx, dy = region['shift']
+                centre = (x + w // 2, y + h // 2)
+                cv2.arrowedLine(vis, centre, (centre[0] + dx, centre[1] + dy), (0, 160, 0), 2)
+            cv2.imwrite(output_path, vis)
+            return
+        
         for (x1, y1), (x2, y2) in duplicate_pairs[:10]:  # Show first 10
             cv2.rectangle(vis, (x1, y1), 
                          (x1 + self.block_size, y1 + self.block_size),
@@ -3,15 +3,19 @@ Error Level Analysis (ELA) Detector
 Detects image manipulation by analyzing JPEG compression artifacts
 """
 
+import io
 import cv2
 import numpy as np
 from PIL import Image
-import os
+from src.utils.document_image import DocumentImage
 
 
 class ELADetector:
     """Detects image manipulation using Error Level Analysis"""
     
+    # Bump when a code change alters ELA scores (invalidates cached results)
+    VERSION = 1
+    
     def __init__(self, quality=95):
         """
         Initialize ELA detector
@@ -21,29 +25,33 @@ class ELADetector:
         """
         self.quality = quality
     
-    def detect(self, image_path):
+    def get_config(self):
+        """Parameters that affect the ELA score (part of cache keys)"""
+        return {'version': self.VERSION, 'quality': self.quality}
+    
+    def detect(self, image):
         """
         Perform ELA detection on an image
         
         Args:
-            image_path (str): Path to the image file
+            image (str or DocumentImage): Image path or already decoded document
             
         Returns:
             float: ELA score (0-100, higher = more suspicious)
         """
         try:
-            # Load original image
-            original = Image.open(image_path).convert('RGB')
-            
-            # Save as JPEG with specified quality
-            temp_path = 'temp_ela.jpg'
-            original.save(temp_path, 'JPEG', quality=self.quality)
+            # Load original image (reuses the shared decode when available)
+            document = DocumentImage.load(image)
+            if document is None:
+                raise ValueError(f"Could not load image: {image}")
+            original = Image.fromarray(document.rgb)
             
-            # Load recompressed image
-            compressed = Image.open(temp_path).convert('RGB')
+            # Recompress as JPEG with specified quality (in memory, so
+            # concurrent workers never share a temp file)
+            compressed = self._recompress(original)
             
             # Convert to numpy arrays
-            original_arr = np.array(original)
+            original_arr = document.rgb
             compressed_arr = np.array(compressed)
             
             # Calculate pixel-wise difference
@@ -55,15 +63,26 @@ class ELADetector:
             # Calculate ELA score (normalized standard deviation)
             ela_score = np.std(diff_gray) / 255.0 * 100
             
-            # Clean up temp file
-            if os.path.exists(temp_path):
-                os.remove(temp_path)
-            
             return ela_score
             
         except Exception as e:
             print(f"⚠️  ELA detection failed: {e}")
             return 0.0
+    
+    def _recompress(self, image):
+        """
+        JPEG round trip through an in-memory buffer
+        
+        Args:
+            image (PIL.Image.Image): RGB image
+            
+        Returns:
+            PIL.Image.Image: Recompressed RGB image
+        """
+        buffer = io.BytesIO()
+        image.save(buffer, 'JPEG', quality=self.quality)
+        buffer.seek(0)
+        return Image.open(buffer).convert('RGB')
 
 
 # Test function
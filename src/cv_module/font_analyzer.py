@@ -3,48 +3,59 @@ Font Analysis Module
 Detects font inconsistencies in documents using OCR
 """
 
-import cv2
-import pytesseract
 from collections import Counter
+from src.utils.ocr import get_ocr
 
 
 class FontAnalyzer:
     """Analyzes font consistency in documents"""
     
-    def __init__(self):
-        """Initialize font analyzer"""
-        # Tesseract path configured in __init__.py
-        pass
+    # Bump when a code change alters results (invalidates cached results)
+    VERSION = 1
     
-    def analyze(self, image_path):
+    def __init__(self, min_confidence=30, max_unique_fonts=5, max_variation=30):
+        """
+        Initialize font analyzer
+        
+        Args:
+            min_confidence (int): Minimum OCR confidence for a word to count
+            max_unique_fonts (int): More distinct sizes than this is suspicious
+            max_variation (float): Size variation (%) above this is suspicious
+        """
+        # Tesseract is located on first OCR call (src/utils/tesseract.py)
+        self.min_confidence = min_confidence
+        self.max_unique_fonts = max_unique_fonts
+        self.max_variation = max_variation
+    
+    def get_config(self):
+        """Parameters that affect the analysis (part of cache keys)"""
+        return {
+            'version': self.VERSION,
+            'min_confidence': self.min_confidence,
+            'max_unique_fonts': self.max_unique_fonts,
+            'max_variation': self.max_variation
+        }
+    
+    def analyze(self, image, ocr=None):
         """
         Analyze font consistency in a document
         
         Args:
-            image_path (str): Path to document image
+            image (str or DocumentImage): Image path or already decoded document
+            ocr (OCRResult): Precomputed OCR output (shared with segmentation)
             
         Returns:
             dict: Analysis results
         """
         try:
-            # Load image
-            img = cv2.imread(image_path)
-            if img is None:
-                return self._empty_result()
-            
-            # Convert to RGB for Tesseract
-            rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-            
-            # Get detailed OCR data
-            data = pytesseract.image_to_data(rgb, output_type=pytesseract.Output.DICT)
+            # Reuse the document's OCR pass (runs Tesseract only if not done yet)
+            if ocr is None:
+                ocr = get_ocr(image)
+                if ocr is None:
+                    return self._empty_result()
             
-            # Extract font sizes
-            font_sizes = []
-            for i, conf in enumerate(data['conf']):
-                if int(conf) > 30:  # Only confident detections
-                    height = data['height'][i]
-                    if height > 0:
-                        font_sizes.append(height)
+            # Extract font sizes (only confident detections)
+            font_sizes = ocr.heights(min_confidence=self.min_confidence)
             
             if not font_sizes:
                 return self._empty_result()
@@ -61,13 +72,13 @@ class FontAnalyzer:
             
             # Determine if suspicious
             # Multiple fonts OR high variation = suspicious
-            is_suspicious = unique_fonts > 5 or variation > 30
+            is_suspicious = unique_fonts > self.max_unique_fonts or variation > self.max_variation
             
             return {
                 'unique_fonts': unique_fonts,
-                'variation': variation,
-                'is_suspicious': is_suspicious,
-                'font_sizes': list(font_counter.keys())
+                'variation': float(variation),
+                'is_suspicious': bool(is_suspicious),
+                'font_sizes': [int(size) for size in font_counter]
             }
             
         except Exception as e:
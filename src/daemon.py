@@ -0,0 +1,346 @@
+"""
+Analysis Daemon for TruthLens
+Keeps warm detectors behind a local UNIX socket so CLI calls skip cold start
+
+Protocol: one JSON request line per connection, answered by one JSON line.
+    {"command": "analyze", "path": "/abs/doc.jpg", "use_cache": true,
+     "cascade": false, "triage_scale": null}
+    {"command": "job", "job_dir": "/abs/data/jobs/<id>", "workers": 1}
+    {"command": "ping"}
+    {"command": "shutdown"}
+Replies are {"ok": true, "result": ...} or {"ok": false, "error": "..."}.
+
+Only the standard library is imported at module level: the client side
+must stay cheap, since avoiding heavy imports is the point.
+"""
+
+import json
+import os
+import socket
+import stat
+import tempfile
+import threading
+import time
+
+
+# UNIX domain sockets are not available on every platform (e.g. older Windows)
+SUPPORTED = hasattr(socket, 'AF_UNIX')
+
+
+class DaemonError(RuntimeError):
+    """The daemon answered a request with an error"""
+
+
+def runtime_directory():
+    """
+    Private per-user directory holding the default socket
+
+    $XDG_RUNTIME_DIR/truthlens when XDG_RUNTIME_DIR is set, otherwise
+    truthlens-<uid> in the temp directory. It is created with mode 0700;
+    an existing one must be a real directory owned by this user that
+    nobody else can access, so other local users can neither plant nor
+    reach a socket in it.
+
+    Raises:
+        PermissionError: If the directory is not private to this user
+    """
+    if os.environ.get('XDG_RUNTIME_DIR'):
+        directory = os.path.join(os.environ['XDG_RUNTIME_DIR'], 'truthlens')
+    else:
+        user = os.getuid() if hasattr(os, 'getuid') else os.environ.get('USERNAME', 'user')
+        directory = os.path.join(tempfile.gettempdir(), f'truthlens-{user}')
+    try:
+        os.mkdir(directory, 0o700)
+    except FileExistsError:
+        pass
+
+    info = os.lstat(directory)
+    if not stat.S_ISDIR(info.st_mode):
+        raise PermissionError(f"{directory} is not a directory")
+    if hasattr(os, 'getuid'):
+        if info.st_uid != os.getuid():
+            raise PermissionError(f"{directory} is owned by another user")
+        if info.st_mode & 0o077:
+            raise PermissionError(f"{directory} is accessible to other users "
+                                  f"(mode {stat.S_IMODE(info.st_mode):o}, expected 700)")
+    return directory
+
+
+def default_socket_path():
+    """
+    Socket path shared by `serve` and the clients
+
+    TRUTHLENS_SOCKET overrides the per-user default in runtime_directory().
+    """
+    if os.environ.get('TRUTHLENS_SOCKET'):
+        return os.environ['TRUTHLENS_SOCKET']
+    return os.path.join(runtime_directory(), 'daemon.sock')
+
+
+def owned_by_current_user(path):
+    """
+    True if path exists and belongs to this user
+
+    A socket owned by anyone else could be a look-alike daemon returning
+    forged verdicts, so it is never trusted.
+    """
+    try:
+        info = os.lstat(path)
+    except OSError:
+        return False
+    return not hasattr(os, 'getuid') or info.st_uid == os.getuid()
+
+
+def _send(sock, message):
+    sock.sendall(json.dumps(message).encode('utf-8') + b'\n')
+
+
+def _receive(sock):
+    """Read one newline-terminated JSON message"""
+    chunks = []
+    while True:
+        chunk = sock.recv(65536)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        if chunk.endswith(b'\n'):
+            break
+    data = b''.join(chunks)
+    if not data:
+        raise ConnectionError("Connection closed without a reply")
+    return json.loads(data)
+
+
+class DaemonClient:
+    """Sends requests to a running daemon"""
+
+    def __init__(self, socket_path=None, timeout=None):
+        """
+        Args:
+            socket_path (str): Daemon socket (default: default_socket_path())
+            timeout (float): Seconds to wait for a reply (None = no limit)
+        """
+        self.socket_path = socket_path or default_socket_path()
+        self.timeout = timeout
+
+    def request(self, command, **params):
+        """
+        Send one request and wait for its reply
+
+        Returns:
+            The reply's result
+
+        Raises:
+            OSError: If the daemon cannot be reached
+            DaemonError: If the daemon reports an error
+        """
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(self.timeout)
+            sock.connect(self.socket_path)
+            _send(sock, dict(params, command=command))
+            reply = _receive(sock)
+
+        if not reply.get('ok'):
+            raise DaemonError(reply.get('error', 'Unknown daemon error'))
+        return reply.get('result')
+
+    def is_running(self):
+        """True if a daemon answers on the socket"""
+        try:
+            self.request('ping')
+            return True
+        except (OSError, ValueError, DaemonError):
+            return False
+
+
+def connect(socket_path=None):
+    """
+    Client for a running daemon
+
+    Returns:
+        DaemonClient: Client, or None if no daemon is listening, the socket
+                      belongs to another user (or UNIX sockets are
+                      unsupported)
+    """
+    if not SUPPORTED:
+        return None
+    try:
+        client = DaemonClient(socket_path)
+    except PermissionError as e:
+        print(f"⚠️  Not using the daemon: {e}")
+        return None
+    if not owned_by_current_user(client.socket_path) or not client.is_running():
+        return None
+    return client
+
+
+class AnalysisDaemon:
+    """
+    Serves analysis requests from warm detectors
+
+    Single-document requests are handled concurrently, one thread per
+    connection. Batch jobs run one at a time, because each reports the
+    statistics of its own run, on processors of their own so that
+    concurrent single analyses do not count towards those statistics.
+    """
+
+    def __init__(self, socket_path=None, workers=1, cache_dir='data/cache'):
+        """
+        Args:
+            socket_path (str): Socket to listen on (default: default_socket_path())
+            workers (int): Default worker processes for job requests
+            cache_dir (str): Cache directory
+        """
+        if not SUPPORTED:
+            raise RuntimeError("UNIX domain sockets are not supported on this platform")
+
+        self.socket_path = socket_path or default_socket_path()
+        self.cache_dir = cache_dir
+        self.workers = workers
+        self._processors = {}
+        self._processors_lock = threading.Lock()
+        self._batch_lock = threading.Lock()
+
+        # Warm the default configuration now; others start on first use
+        self.processor = self._processor({})
+        self._server = None
+        self.started_at = time.time()
+        self.requests = 0
+
+    def _processor(self, request, batch=False):
+        """
+        BatchProcessor for the options of a request, built once per combination
+
+        Args:
+            request (dict): Request (or job settings) with the analysis options
+            batch (bool): Processor for job requests (kept apart
+                          from the one serving single analyses)
+        """
+        options = {
+            'use_cache': bool(request.get('use_cache', True)),
+            'cascade': bool(request.get('cascade', False)),
+            'triage_scale': request.get('triage_scale'),
+        }
+        key = (batch,) + tuple(sorted(options.items()))
+        with self._processors_lock:
+            if key not in self._processors:
+                # Heavy imports happen here, in the daemon process only
+                from src.batch_processor import BatchProcessor
+                self._processors[key] = BatchProcessor(
+                    cache_dir=self.cache_dir, workers=self.workers,
+                    concurrent_detectors=True, **options)
+            return self._processors[key]
+
+    def serve_forever(self):
+        """Listen until a shutdown request (or Ctrl+C)"""
+        import socketserver
+
+        if os.path.lexists(self.socket_path):
+            if not owned_by_current_user(self.socket_path):
+                raise PermissionError(f"{self.socket_path} belongs to another user")
+            if DaemonClient(self.socket_path).is_running():
+                raise RuntimeError(f"A daemon is already running on {self.socket_path}")
+            os.remove(self.socket_path)  # stale socket from a crashed daemon
+
+        daemon = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                try:
+                    request = json.loads(self.rfile.readline())
+                    reply = {'ok': True, 'result': daemon.handle(request)}
+                except Exception as e:
+                    reply = {'ok': False, 'error': f"{type(e).__name__}: {e}"}
+                self.wfile.write(json.dumps(reply).encode('utf-8') + b'\n')
+
+        class Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+            daemon_threads = True
+
+        # Create the socket as 0600 from the start (umask is process-wide,
+        # but nothing else is creating files while the daemon starts)
+        previous_umask = os.umask(0o177)
+        try:
+            self._server = Server(self.socket_path, Handler)
+        finally:
+            os.umask(previous_umask)
+
+        print("\n" + "="*70)
+        print("🛰️  TRUTHLENS DAEMON")
+        print("="*70)
+        print(f"   Socket: {self.socket_path}")
+        print(f"   PID: {os.getpid()}")
+        print("   Stop with: python truthlens_cli.py serve --stop")
+        print("="*70 + "\n")
+
+        try:
+            self._server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self._server.server_close()
+            if os.path.exists(self.socket_path):
+                os.remove(self.socket_path)
+            self.close()
+            print("👋 Daemon stopped")
+
+    def close(self):
+        """Release the detector thread pools and caches of every processor"""
+        with self._processors_lock:
+            processors = list(self._processors.values())
+            self._processors.clear()
+        for processor in processors:
+            processor.close()
+
+    def handle(self, request):
+        """
+        Execute one request
+
+        Args:
+            request (dict): Decoded request
+
+        Returns:
+            JSON-serializable result
+        """
+        command = request.get('command')
+        self.requests += 1
+
+        if command == 'ping':
+            return {'pid': os.getpid(), 'uptime': time.time() - self.started_at,
+                    'requests': self.requests}
+
+        if command == 'analyze':
+            path = request['path']
+            if not os.path.exists(path):
+                raise FileNotFoundError(path)
+            processor = self._processor(request)
+            if processor.use_cache:
+                return processor.process_single(path, verbose=False)
+            return processor.fraud_detector.analyze_document(path, verbose=False)
+
+        if command == 'job':
+            return self._job(request)
+
+        if command == 'shutdown':
+            # serve_forever() must be stopped from another thread
+            threading.Thread(target=self._server.shutdown, daemon=True).start()
+            return {'stopping': True}
+
+        raise ValueError(f"Unknown command: {command!r}")
+
+    def _job(self, request):
+        """Run the unfinished part of a batch job and return its progress and summary"""
+        from src.utils.batch_job import BatchJob
+        with self._batch_lock:
+            job = BatchJob(request['job_dir'])
+            processor = self._processor(job.settings, batch=True)
+            processor.reset_stats()
+            progress = processor.process_job(job, show_progress=False,
+                                             workers=request.get('workers'))
+
+            ran = processor.stats['total_processed'] + processor.stats['errors']
+            return {
+                'progress': progress,
+                'statistics': processor.stats,
+                'summary': (processor.format_batch_summary(ran, processor.stats['total_time'])
+                            if ran else '')
+            }
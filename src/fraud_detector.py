@@ -3,12 +3,17 @@ TruthLens - Integrated Fraud Detection System
 Combines ELA, Copy-Move (with segmentation), and Font Analysis
 """
 
-import cv2
+import os
+import time
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from src.cv_module.ela_detector import ELADetector
 from src.cv_module.copymove_detector import CopyMoveDetector
 from src.cv_module.font_analyzer import FontAnalyzer
 from src.utils.document_segmenter import DocumentSegmenter
+from src.utils.document_image import DocumentImage
+from src.utils.ocr import OCRResult, get_ocr, ocr_config
+from src.utils.timing import StageTimer
 
 
 class FraudDetector:
@@ -16,127 +21,635 @@ class FraudDetector:
     Integrated fraud detection system combining multiple detection methods
     """
     
-    def __init__(self, use_segmentation=True):
+    # Bump when a code change alters the fused verdict
+    VERSION = 2
+    
+    # Fusion thresholds
+    ELA_THRESHOLD = 50        # ELA score (0-100) above which ELA votes suspicious
+    COPYMOVE_THRESHOLD = 5    # Duplicate pairs above which copy-move votes suspicious
+    MIN_VOTES = 2             # Suspicious detectors needed for a fraud verdict
+    
+    # Stages whose outputs feed the fusion (and can be served from a stage cache)
+    DETECTOR_STAGES = ('ela', 'copymove', 'font')
+    
+    # Cascade mode: starting estimates of each step's wall time in seconds
+    # (OCR is shared by font analysis and segmented copy-move). They are
+    # replaced by a running average of this detector's own measurements.
+    CASCADE_COSTS = {'ela': 0.05, 'copymove': 0.1, 'ocr': 1.0, 'font': 0.01}
+    COST_SMOOTHING = 0.2      # Weight of the newest measurement in the average
+    
+    # Smallest copy-move block used for triage at reduced resolution
+    TRIAGE_MIN_BLOCK = 4
+    
+    def __init__(self, use_segmentation=True, concurrent=False, cascade=False,
+                 triage_scale=None, triage_band=0.5):
         """
         Initialize all detection modules
         
         Args:
             use_segmentation (bool): Whether to use semantic segmentation for Copy-Move
+            concurrent (bool): Run ELA, copy-move and OCR/font analysis of a
+                               document concurrently on a thread pool
+            cascade (bool): Run detectors cheapest first and stop once the
+                            vote is decided (False = full evidence, e.g.
+                            for audits)
+            triage_scale (int): Triage every document at 1/2, 1/4 or 1/8
+                                resolution first and only escalate unclear
+                                ones to full resolution (None = off)
+            triage_band (float): Uncertainty band around each threshold, as
+                                 a fraction of it: triage scores within
+                                 threshold * (1 +/- band) are escalated
         """
+        if triage_scale is not None and triage_scale not in DocumentImage.REDUCED_FLAGS:
+            raise ValueError(f"triage_scale must be one of "
+                             f"{sorted(DocumentImage.REDUCED_FLAGS)}, got {triage_scale!r}")
+        
         self.ela_detector = ELADetector()
-        self.copymove_detector = CopyMoveDetector()
+        # Aggregate output: the fusion needs the count, never the pair list
+        self.copymove_detector = CopyMoveDetector(output='aggregate')
         self.font_analyzer = FontAnalyzer()
         self.segmenter = DocumentSegmenter() if use_segmentation else None
         self.use_segmentation = use_segmentation
+        self.concurrent = concurrent
+        self.cascade = cascade
+        self.stage_costs = dict(self.CASCADE_COSTS)
+        self.triage_scale = triage_scale
+        self.triage_band = triage_band
+        self.triage_copymove = None
+        if triage_scale:
+            # Same features at a block size scaled with the image
+            self.triage_copymove = CopyMoveDetector(
+                block_size=max(self.TRIAGE_MIN_BLOCK, self.copymove_detector.block_size // triage_scale),
+                threshold=self.copymove_detector.threshold, output='aggregate')
+        self._executor = None
         
         print("🚀 FraudDetector initialized")
         print(f"   📊 Segmentation: {'ENABLED' if use_segmentation else 'DISABLED'}")
+        if concurrent:
+            print("   ⚡ Concurrent detectors: ENABLED")
+        if cascade:
+            print("   ⏭️  Cascade (early exit): ENABLED")
+        if triage_scale:
+            print(f"   🔎 Triage: 1/{triage_scale} resolution, band ±{triage_band:.0%}")
+    
+    def __getstate__(self):
+        # The thread pool is per process; pickled copies (e.g. batch
+        # workers) create their own on first use
+        state = self.__dict__.copy()
+        state['_executor'] = None
+        return state
     
-    def analyze_document(self, image_path, verbose=True):
+    def get_config(self):
+        """
+        Parameters of every stage, used to key cached results
+        
+        Each stage's entry includes the configuration of the stages it
+        depends on, so e.g. changing OCR settings also changes the
+        copy-move (segmented) and font keys, while changing copy-move
+        parameters leaves OCR, ELA and font entries valid.
+        
+        Returns:
+            dict: {'ocr', 'ela', 'copymove', 'font', 'fusion': config}
+        """
+        ocr = ocr_config()
+        segmentation = None
+        if self.use_segmentation and self.segmenter:
+            segmentation = dict(self.segmenter.get_config(), ocr=ocr)
+        
+        return {
+            'ocr': ocr,
+            'ela': self.ela_detector.get_config(),
+            'copymove': dict(self.copymove_detector.get_config(), segmentation=segmentation),
+            'font': dict(self.font_analyzer.get_config(), ocr=ocr),
+            'fusion': {
+                'version': self.VERSION,
+                'ela_threshold': self.ELA_THRESHOLD,
+                'copymove_threshold': self.COPYMOVE_THRESHOLD,
+                'min_votes': self.MIN_VOTES,
+                'cascade': bool(self.cascade),
+                'triage': {'scale': self.triage_scale, 'band': self.triage_band,
+                           'copymove': self.triage_copymove.get_config()}
+                          if self.triage_scale else None
+            }
+        }
+    
+    def analyze_document(self, image, verbose=True, concurrent=None, stage_cache=None,
+                         cascade=None):
         """
         Run complete fraud analysis on a document
         
         Args:
-            image_path (str): Path to document image
+            image (str or DocumentImage): Path to document image, or a
+                document that has already been decoded
             verbose (bool): Print detailed results
+            concurrent (bool): Override the detector's concurrent setting
+                (ignored in cascade mode, which runs detectors in turn)
+            stage_cache (StageCache): Per-stage cache for this document.
+                Stages found there are not recomputed. When every detector
+                stage is cached the image is not even decoded.
+            cascade (bool): Override the detector's cascade setting
             
         Returns:
-            dict: Complete analysis results
+            dict: Complete analysis results, including a 'timings' section
+                  with wall / CPU seconds per pipeline stage. Detectors
+                  skipped by the cascade are listed in 'skipped_detectors'
+                  and their score / status fields are None. 'tier' tells
+                  whether the verdict came from the low-resolution
+                  'triage' or from the 'full' resolution analysis.
+                  'ocr_status' is 'computed', 'cached', 'skipped' (not
+                  needed) or 'failed' (font / segmentation degraded).
         """
+        if concurrent is None:
+            concurrent = self.concurrent
+        if cascade is None:
+            cascade = self.cascade
+        
         if verbose:
             print("\n" + "="*70)
             print("🔍 TRUTHLENS FRAUD ANALYSIS")
             print("="*70)
-            print(f"📄 Document: {image_path}")
+            print(f"📄 Document: {getattr(image, 'source', image)}")
             print("-"*70)
         
-        # Load image
-        img = cv2.imread(image_path)
-        if img is None:
-            return {
-                'error': 'Could not load image',
-                'fraud_detected': False
-            }
+        timer = StageTimer()
+        configs = self.get_config()
         
-        # Get text regions if segmentation enabled
-        text_regions = None
-        if self.use_segmentation and self.segmenter:
-            text_regions = self.segmenter.get_text_regions(image_path)
-            if verbose and text_regions:
-                print(f"   ℹ️  Segmentation: {len(text_regions)} text regions excluded")
+        cached = {}
+        if stage_cache is not None:
+            for stage in self.DETECTOR_STAGES:
+                value = stage_cache.get(stage, configs[stage])
+                if value is not None:
+                    cached[stage] = value
+        cached_stages = list(cached)
         
-        # 1. ELA Detection
-        if verbose:
-            print("\n1️⃣  ERROR LEVEL ANALYSIS (ELA)")
+        outputs = dict(cached)
         
-        ela_score = self.ela_detector.detect(image_path)
-        ela_suspicious = ela_score > 50  # Threshold: 50/100
+        # Low-resolution triage (skipped when cached stages make the full
+        # analysis cheaper); only clear-cut verdicts are final
+        tier = 'full'
+        full_document = None
+        if self.triage_scale and not cached:
+            triage = self._run_triage(image, timer)
+            if triage is None:
+                return {
+                    'error': 'Could not load image',
+                    'fraud_detected': False
+                }
+            triage_outputs, full_document = triage
+            if self._triage_decided(triage_outputs):
+                outputs, tier = triage_outputs, 'triage'
         
-        if verbose:
-            print(f"   Score: {ela_score:.2f}/100")
-            print(f"   Status: {'🚨 SUSPICIOUS' if ela_suspicious else '✅ CLEAN'}")
+        decided = tier == 'triage' or (cascade and self._vote_decided(outputs))
+        ocr_status = 'skipped'
+        if len(outputs) < len(self.DETECTOR_STAGES) and not decided:
+            # Decode once; every detector below shares this document
+            with timer.stage('decode'):
+                document = full_document or DocumentImage.load(image)
+                if document is not None:
+                    # Derive the shared colour views here so they count as decode time
+                    document.gray
+                    document.rgb
+            if document is None:
+                return {
+                    'error': 'Could not load image',
+                    'fraud_detected': False
+                }
+            
+            if cascade:
+                run = self._run_cascade
+            else:
+                run = self._run_concurrent if concurrent else self._run_sequential
+            computed, ocr_status = run(document, timer, cached, stage_cache, configs)
+            if ocr_status == 'cached':
+                cached_stages.append('ocr')
+            
+            self._store_stages(stage_cache, configs, computed, ocr_ok=ocr_status != 'failed')
+            outputs.update(computed)
         
-        # 2. Copy-Move Detection (with segmentation)
-        if verbose:
-            print("\n2️⃣  COPY-MOVE FORGERY DETECTION")
+        skipped = [stage for stage in self.DETECTOR_STAGES if stage not in outputs]
+        ela_score = outputs.get('ela')
+        copymove_result = outputs.get('copymove')
+        font_result = outputs.get('font')
         
-        copymove_result = self.copymove_detector.detect(
-            image_path, 
-            text_regions=text_regions
-        )
-        copymove_suspicious = copymove_result['num_duplicates'] > 5
+        # 4. Combined Decision (skipped detectors count as not suspicious)
+        with timer.stage('fusion'):
+            votes = {stage: self._is_suspicious(stage, output) for stage, output in outputs.items()}
+            ela_suspicious = votes.get('ela')
+            copymove_suspicious = votes.get('copymove')
+            font_suspicious = votes.get('font')
+            
+            suspicious_count = sum(votes.values())
+            fraud_detected = suspicious_count >= self.MIN_VOTES  # Enough detectors agree
+            
+            # Calculate overall confidence
+            confidence = 0
+            if ela_score is not None:
+                confidence += ela_score if ela_suspicious else (100 - ela_score)
+            if copymove_suspicious:
+                confidence += min(copymove_result['num_duplicates'] * 5, 100)
+            if font_suspicious:
+                confidence += font_result['variation']
+            confidence = min(confidence / 3, 100)
         
-        if verbose:
-            print(f"   Duplicates found: {copymove_result['num_duplicates']}")
-            print(f"   Status: {'🚨 SUSPICIOUS' if copymove_suspicious else '✅ CLEAN'}")
+        text_regions_excluded = copymove_result['text_regions_excluded'] if copymove_result else 0
         
-        # 3. Font Analysis
         if verbose:
+            if tier == 'triage':
+                print(f"   🔎 Decided by triage at 1/{self.triage_scale} resolution")
+            elif self.triage_scale:
+                print("   🔎 Triage inconclusive: analyzed at full resolution")
+            if cached_stages:
+                print(f"   ⚡ Cached stages: {', '.join(cached_stages)}")
+            if text_regions_excluded:
+                print(f"   ℹ️  Segmentation: {text_regions_excluded} text regions excluded")
+            
+            # 1. ELA Detection
+            print("\n1️⃣  ERROR LEVEL ANALYSIS (ELA)")
+            if ela_score is None:
+                print("   Status: ⏭️  SKIPPED (vote already decided)")
+            else:
+                print(f"   Score: {ela_score:.2f}/100")
+                print(f"   Status: {'🚨 SUSPICIOUS' if ela_suspicious else '✅ CLEAN'}")
+            
+            # 2. Copy-Move Detection (with segmentation)
+            print("\n2️⃣  COPY-MOVE FORGERY DETECTION")
+            if copymove_result is None:
+                print("   Status: ⏭️  SKIPPED (vote already decided)")
+            else:
+                print(f"   Duplicates found: {copymove_result['num_duplicates']}")
+                print(f"   Status: {'🚨 SUSPICIOUS' if copymove_suspicious else '✅ CLEAN'}")
+            
+            # 3. Font Analysis
             print("\n3️⃣  FONT CONSISTENCY ANALYSIS")
-        
-        font_result = self.font_analyzer.analyze(image_path)
-        font_suspicious = font_result['is_suspicious']
-        
-        if verbose:
-            print(f"   Unique fonts: {font_result['unique_fonts']}")
-            print(f"   Variation: {font_result['variation']:.1f}%")
-            print(f"   Status: {'🚨 SUSPICIOUS' if font_suspicious else '✅ CLEAN'}")
-        
-        # 4. Combined Decision
-        suspicious_count = sum([ela_suspicious, copymove_suspicious, font_suspicious])
-        fraud_detected = suspicious_count >= 2  # At least 2 detectors agree
-        
-        # Calculate overall confidence
-        confidence = (
-            (ela_score if ela_suspicious else (100 - ela_score)) +
-            (min(copymove_result['num_duplicates'] * 5, 100) if copymove_suspicious else 0) +
-            (font_result['variation'] if font_suspicious else 0)
-        ) / 3
-        confidence = min(confidence, 100)
-        
-        if verbose:
+            if font_result is None:
+                print("   Status: ⏭️  SKIPPED (vote already decided)")
+            else:
+                print(f"   Unique fonts: {font_result['unique_fonts']}")
+                print(f"   Variation: {font_result['variation']:.1f}%")
+                print(f"   Status: {'🚨 SUSPICIOUS' if font_suspicious else '✅ CLEAN'}")
+            
             print("\n" + "="*70)
             print("📊 FINAL VERDICT")
             print("="*70)
             print(f"   Suspicious detectors: {suspicious_count}/3")
+            if skipped:
+                print(f"   Skipped (vote decided early): {', '.join(skipped)}")
             print(f"   Overall confidence: {confidence:.1f}%")
             print(f"   Decision: {'🚨 FRAUD DETECTED' if fraud_detected else '✅ AUTHENTIC'}")
             print("="*70 + "\n")
         
+        def optional(cast, value):
+            return None if value is None else cast(value)
+        
         return {
             'fraud_detected': bool(fraud_detected),
             'confidence': float(confidence),
-            'ela_score': float(ela_score),
-            'ela_suspicious': bool(ela_suspicious),
-            'copymove_duplicates': int(copymove_result['num_duplicates']),
-            'copymove_suspicious': bool(copymove_suspicious),
-            'font_variation': float(font_result['variation']),
-            'font_suspicious': bool(font_suspicious),
+            'ela_score': optional(float, ela_score),
+            'ela_suspicious': optional(bool, ela_suspicious),
+            'copymove_duplicates': optional(int, copymove_result and copymove_result['num_duplicates']),
+            'copymove_suspicious': optional(bool, copymove_suspicious),
+            'copymove_clusters': copymove_result.get('clusters') if copymove_result else None,
+            'copymove_regions': copymove_result.get('regions') if copymove_result else None,
+            'font_variation': optional(float, font_result and font_result['variation']),
+            'font_suspicious': optional(bool, font_suspicious),
             'suspicious_count': int(suspicious_count),
             'segmentation_used': bool(self.use_segmentation),
-            'text_regions_excluded': int(len(text_regions) if text_regions else 0)
+            'text_regions_excluded': int(text_regions_excluded),
+            'cascade': bool(cascade),
+            'skipped_detectors': skipped,
+            'tier': tier,
+            'cached_stages': cached_stages,
+            'ocr_status': ocr_status,
+            'timings': timer.to_dict()
         }
     
+    def _is_suspicious(self, stage, output):
+        """Vote of one detector stage"""
+        if stage == 'ela':
+            return bool(output > self.ELA_THRESHOLD)
+        if stage == 'copymove':
+            return bool(output['num_duplicates'] > self.COPYMOVE_THRESHOLD)
+        return bool(output['is_suspicious'])
+    
+    def _vote_decided(self, outputs):
+        """
+        True once the remaining detectors cannot change the verdict
+        
+        Args:
+            outputs (dict): {stage: output} of the detectors evaluated so far
+        """
+        suspicious = sum(self._is_suspicious(stage, output) for stage, output in outputs.items())
+        remaining = len(self.DETECTOR_STAGES) - len(outputs)
+        return suspicious >= self.MIN_VOTES or suspicious + remaining < self.MIN_VOTES
+    
+    def _run_triage(self, image, timer):
+        """
+        ELA and copy-move on a reduced-resolution copy of the document
+        
+        Files are decoded at reduced size (cheap for JPEG); decoded inputs
+        are downscaled. Copy-move runs with a proportionally smaller block,
+        so down to TRIAGE_MIN_BLOCK its block grid is as large as at full
+        resolution and the raw duplicate count is the estimate. Below that
+        the count is scaled by the ratio of full to triage grid blocks.
+        
+        Returns:
+            tuple: ({'ela': score, 'copymove': {...}}, full-size document
+                    if the input was already decoded, else None), or None
+                    if the image could not be loaded
+        """
+        scale = self.triage_scale
+        with timer.stage('triage_decode'):
+            full_document = None
+            if not isinstance(image, (str, os.PathLike)):
+                full_document = DocumentImage.load(image)
+            small = DocumentImage.load_reduced(image if full_document is None else full_document,
+                                               scale)
+        if small is None:
+            return None
+        
+        with timer.stage('triage_ela'):
+            ela_score = float(self.ela_detector.detect(small))
+        with timer.stage('triage_copymove'):
+            duplicates = self.triage_copymove.detect(small)['num_duplicates']
+        
+        triage_blocks = self.triage_copymove.grid_blocks(small.height, small.width)
+        full_blocks = self.copymove_detector.grid_blocks(small.height * scale, small.width * scale)
+        outputs = {
+            'ela': ela_score,
+            'copymove': {'num_duplicates': int(round(duplicates * full_blocks / max(triage_blocks, 1))),
+                         'text_regions_excluded': 0}
+        }
+        return outputs, full_document
+    
+    def _triage_decided(self, outputs):
+        """
+        True if the triage scores settle the vote on their own
+        
+        Both scores must lie outside the uncertainty band and agree; font
+        analysis then cannot change a 2-of-3 vote. Anything else goes to
+        full resolution. Triage copy-move runs without text exclusion, so
+        repeated text inflates its count: with segmentation enabled only a
+        clean verdict is settled at triage, and suspicious documents are
+        always checked at full resolution.
+        """
+        low, high = 1 - self.triage_band, 1 + self.triage_band
+        ela = outputs['ela']
+        duplicates = outputs['copymove']['num_duplicates']
+        ela_clear = ela < self.ELA_THRESHOLD * low or ela > self.ELA_THRESHOLD * high
+        copymove_clear = (duplicates < self.COPYMOVE_THRESHOLD * low or
+                          duplicates > self.COPYMOVE_THRESHOLD * high)
+        copymove_suspicious = self._is_suspicious('copymove', outputs['copymove'])
+        if copymove_suspicious and self.use_segmentation and self.segmenter:
+            return False
+        return (ela_clear and copymove_clear and
+                self._is_suspicious('ela', ela) == copymove_suspicious)
+    
+    def _needs_ocr(self, cached):
+        """OCR is needed unless every stage that consumes it is cached"""
+        segmenting = bool(self.use_segmentation and self.segmenter)
+        return 'font' not in cached or (segmenting and 'copymove' not in cached)
+    
+    def _run_sequential(self, document, timer, cached, stage_cache, configs):
+        """
+        Run the uncached detectors one after another
+        
+        Returns:
+            tuple: ({stage: output} for computed stages,
+                    OCR status: 'computed', 'cached', 'failed' or 'skipped')
+        """
+        computed = {}
+        
+        # Single OCR pass shared by segmentation and font analysis
+        ocr_result, text_mask, ocr_status = None, None, 'skipped'
+        if self._needs_ocr(cached):
+            ocr_result, text_mask, ocr_status = self._run_ocr_stage(document, timer,
+                                                                    stage_cache, configs)
+        
+        if 'ela' not in cached:
+            computed['ela'] = self._run_ela(document, timer)
+        if 'copymove' not in cached:
+            computed['copymove'] = self._run_copymove(document, text_mask, timer)
+        if 'font' not in cached:
+            computed['font'] = self._analyze_fonts(document, ocr_result, timer)
+        
+        return computed, ocr_status
+    
+    def _run_concurrent(self, document, timer, cached, stage_cache, configs):
+        """
+        Run the uncached detectors concurrently
+        
+        ELA starts right away on the pool. So does copy-move when it does
+        not depend on OCR. Tesseract runs in the calling thread at the same
+        time, then copy-move (with the text mask) and font analysis follow.
+        OpenCV, PIL's JPEG codec and the Tesseract subprocess release the
+        GIL, so latency approaches that of the slowest branch.
+        
+        Returns:
+            tuple: ({stage: output} for computed stages, OCR status)
+        """
+        executor = self._get_executor()
+        futures = {}
+        
+        if 'ela' not in cached:
+            futures['ela'] = executor.submit(self._run_ela, document, timer)
+        if 'copymove' not in cached and not (self.use_segmentation and self.segmenter):
+            futures['copymove'] = executor.submit(self._run_copymove, document, None, timer)
+        
+        ocr_result, text_mask, ocr_status = None, None, 'skipped'
+        if self._needs_ocr(cached):
+            ocr_result, text_mask, ocr_status = self._run_ocr_stage(document, timer,
+                                                                    stage_cache, configs)
+        
+        if 'copymove' not in cached and 'copymove' not in futures:
+            futures['copymove'] = executor.submit(self._run_copymove, document, text_mask, timer)
+        
+        computed = {}
+        if 'font' not in cached:
+            computed['font'] = self._analyze_fonts(document, ocr_result, timer)
+        for stage, future in futures.items():
+            computed[stage] = future.result()
+        
+        return computed, ocr_status
+    
+    def _run_cascade(self, document, timer, cached, stage_cache, configs):
+        """
+        Run the uncached detectors cheapest first until the vote is decided
+        
+        The next detector is the one with the lowest expected cost,
+        counting the shared OCR pass for font analysis (and for segmented
+        copy-move) until it has run. Costs are running averages of the
+        measured wall time of each step.
+        
+        Returns:
+            tuple: ({stage: output} for computed stages, OCR status)
+        """
+        segmenting = bool(self.use_segmentation and self.segmenter)
+        outputs = dict(cached)
+        computed = {}
+        ocr_result, text_mask, ocr_status = None, None, 'skipped'
+        ocr_done = False
+        
+        def needs_ocr(stage):
+            return stage == 'font' or (stage == 'copymove' and segmenting)
+        
+        def expected_cost(stage):
+            cost = self.stage_costs[stage]
+            if needs_ocr(stage) and not ocr_done:
+                cost += self.stage_costs['ocr']
+            return cost
+        
+        while not self._vote_decided(outputs):
+            # Ties keep the DETECTOR_STAGES order (min() is stable)
+            stage = min((s for s in self.DETECTOR_STAGES if s not in outputs), key=expected_cost)
+            
+            if needs_ocr(stage) and not ocr_done:
+                # Only a real Tesseract run is a cost sample; OCR served from
+                # the document memo or the stage cache (or failing at once)
+                # would drag the learned cost towards zero
+                tesseract_ran = not document.has_memo('ocr')
+                start = time.perf_counter()
+                ocr_result, text_mask, ocr_status = self._run_ocr_stage(document, timer,
+                                                                        stage_cache, configs)
+                if tesseract_ran and ocr_status == 'computed':
+                    self._record_cost('ocr', time.perf_counter() - start)
+                ocr_done = True
+            
+            start = time.perf_counter()
+            if stage == 'ela':
+                value = self._run_ela(document, timer)
+            elif stage == 'copymove':
+                value = self._run_copymove(document, text_mask, timer)
+            else:
+                value = self._analyze_fonts(document, ocr_result, timer)
+            self._record_cost(stage, time.perf_counter() - start)
+            
+            computed[stage] = outputs[stage] = value
+        
+        return computed, ocr_status
+    
+    def _record_cost(self, step, seconds):
+        """Fold a measured step time into the running average"""
+        self.stage_costs[step] += self.COST_SMOOTHING * (seconds - self.stage_costs[step])
+    
+    def _store_stages(self, stage_cache, configs, computed, ocr_ok):
+        """
+        Save freshly computed stage outputs to the stage cache
+        
+        Outputs that silently degraded because OCR failed (empty font
+        result, copy-move without text exclusion) are not cached.
+        """
+        if stage_cache is None:
+            return
+        
+        segmenting = bool(self.use_segmentation and self.segmenter)
+        for stage, value in computed.items():
+            if not ocr_ok and (stage == 'font' or (stage == 'copymove' and segmenting)):
+                continue
+            try:
+                stage_cache.put(stage, configs[stage], value)
+            except Exception as e:
+                print(f"⚠️  Error caching {stage} stage: {e}")
+    
+    def _get_executor(self):
+        """Thread pool for concurrent detectors (created on first use)"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=2,
+                                                thread_name_prefix='truthlens-detector')
+        return self._executor
+    
+    def close(self):
+        """Stop the concurrent-detector thread pool (restarted on next use)"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    def _run_ocr_stage(self, document, timer, stage_cache=None, configs=None):
+        """
+        OCR pass plus text exclusion mask
+        
+        Timed as 'segmentation_ocr' when segmentation is enabled. Otherwise
+        the OCR only feeds font analysis and is timed as 'font_ocr'.
+        Cached OCR output is reused when available.
+        
+        Returns:
+            tuple: (OCRResult or None, TextMask or None,
+                    status: 'computed', 'cached' or 'failed')
+        """
+        segmenting = bool(self.use_segmentation and self.segmenter)
+        with timer.stage('segmentation_ocr' if segmenting else 'font_ocr'):
+            status = 'computed'
+            cached_ocr = None
+            if stage_cache is not None:
+                cached_ocr = stage_cache.get('ocr', configs['ocr'])
+            
+            if cached_ocr is not None:
+                status = 'cached'
+                ocr_result = document.memo('ocr', lambda: OCRResult.from_dict(cached_ocr))
+            else:
+                ocr_result = self._run_ocr(document)
+                if ocr_result is None:
+                    status = 'failed'
+                elif stage_cache is not None:
+                    try:
+                        stage_cache.put('ocr', configs['ocr'], ocr_result.to_dict())
+                    except Exception as e:
+                        print(f"⚠️  Error caching ocr stage: {e}")
+            
+            text_mask = None
+            if segmenting and ocr_result is not None:
+                text_mask = self.segmenter.get_text_mask(document, ocr=ocr_result)
+        return ocr_result, text_mask, status
+    
+    def _run_ela(self, document, timer):
+        """ELA score, timed as stage 'ela'"""
+        with timer.stage('ela'):
+            return float(self.ela_detector.detect(document))
+    
+    def _run_copymove(self, document, text_mask, timer):
+        """
+        Copy-move detection (times its own extraction / matching stages)
+        
+        Returns:
+            dict: num_duplicates, text_regions_excluded and the top shift
+                  clusters and regions (small enough to cache and report)
+        """
+        result = self.copymove_detector.detect(document, text_mask=text_mask, timer=timer)
+        return {
+            'num_duplicates': int(result['num_duplicates']),
+            'text_regions_excluded': int(result['text_regions_excluded']),
+            'clusters': result['clusters'],
+            'regions': result['regions']
+        }
+    
+    def _analyze_fonts(self, document, ocr_result, timer):
+        """Font analysis on the shared OCR result, timed as 'font_ocr'"""
+        with timer.stage('font_ocr'):
+            if ocr_result is None:
+                return self.font_analyzer._empty_result()
+            return self.font_analyzer.analyze(document, ocr=ocr_result)
+    
+    def _run_ocr(self, document):
+        """
+        Run Tesseract once for the document (result is memoised on it)
+        
+        Args:
+            document (DocumentImage): Decoded document
+            
+        Returns:
+            OCRResult: OCR output, or None if OCR failed
+        """
+        try:
+            return get_ocr(document)
+        except Exception as e:
+            print(f"⚠️  OCR failed: {e}")
+            return None
+    
     def batch_analyze(self, image_paths, verbose=False):
         """
         Analyze multiple documents
@@ -192,19 +705,22 @@ class FraudDetector:
         print(f"📄 Document: {image_path}")
         print("="*70)
         
+        # Decode once and reuse for both runs
+        document = DocumentImage.load(image_path)
+        
         # Test WITHOUT segmentation
         print("\n🔹 TEST 1: WITHOUT SEGMENTATION")
         print("-"*70)
         self.use_segmentation = False
         self.segmenter = None
-        result_without = self.analyze_document(image_path, verbose=True)
+        result_without = self.analyze_document(document or image_path, verbose=True)
         
         # Test WITH segmentation
         print("\n🔹 TEST 2: WITH SEGMENTATION")
         print("-"*70)
         self.use_segmentation = True
         self.segmenter = DocumentSegmenter()
-        result_with = self.analyze_document(image_path, verbose=True)
+        result_with = self.analyze_document(document or image_path, verbose=True)
         
         # Comparison
         print("\n" + "="*70)
@@ -0,0 +1,241 @@
+"""
+Inference Pool for TruthLens
+Bounded queue in front of pre-warmed detector processes, for the web interface
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+import sys
+
+import cv2
+import numpy as np
+from PIL import Image
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.batch_processor import BatchProcessor, _analyze_in_worker, _init_worker
+
+
+class QueueFullError(RuntimeError):
+    """Raised when a request arrives while the pool's queue is full"""
+
+
+def _analyze_when_dequeued(payload, content_hash):
+    """
+    Worker task: analyze a document and note when a worker picked it up
+
+    Returns:
+        tuple: (result, processing_time, started_at as time.time())
+    """
+    started_at = time.time()
+    result, processing_time = _analyze_in_worker(payload, content_hash)
+    return result, processing_time, started_at
+
+
+def _warm_up(delay):
+    """No-op task used to start every worker process up front"""
+    time.sleep(delay)
+    return os.getpid()
+
+
+class InferencePool:
+    """
+    Runs analyses for concurrent callers on a fixed set of warm workers
+
+    Each worker process builds its FraudDetector once (a copy of the
+    pool's), so requests never pay start-up cost and never share
+    detector state. Inputs travel in memory (pixels or encoded bytes)
+    and are keyed by their own content hash, so concurrent uploads
+    cannot overwrite each other. At most workers + max_queue requests
+    are admitted; beyond that submit() raises QueueFullError instead of
+    letting latency grow without bound.
+    """
+
+    # Recent wait times kept for the queue statistics
+    WAIT_SAMPLES = 1000
+
+    def __init__(self, workers=2, max_queue=16, use_cache=True, cache_dir='data/cache'):
+        """
+        Args:
+            workers (int): Worker processes (= requests analyzed at once)
+            max_queue (int): Requests allowed to wait for a free worker
+            use_cache (bool): Serve repeated documents from the result cache
+            cache_dir (str): Cache directory
+        """
+        self.workers = max(1, int(workers))
+        self.max_queue = max(0, int(max_queue))
+        self.processor = BatchProcessor(use_cache=use_cache, cache_dir=cache_dir)
+
+        self._slots = threading.BoundedSemaphore(self.workers + self.max_queue)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._wait_times = deque(maxlen=self.WAIT_SAMPLES)
+        self.stats = {'submitted': 0, 'completed': 0, 'failed': 0,
+                      'rejected': 0, 'cache_hits': 0}
+
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers, initializer=_init_worker,
+            initargs=(self.processor.fraud_detector, self.processor.cache_settings))
+        self._warm_up()
+
+        print("🚀 Inference Pool initialized")
+        print(f"   👷 Workers: {self.workers}")
+        print(f"   📥 Max queued requests: {self.max_queue}")
+
+    def _warm_up(self):
+        """Start all worker processes (and build their detectors) now"""
+        futures = [self._executor.submit(_warm_up, 0.2) for _ in range(self.workers)]
+        for future in futures:
+            future.result()
+
+    def submit(self, image, block=False, label=None):
+        """
+        Queue a document for analysis
+
+        Args:
+            image: PIL image, encoded image bytes, BGR numpy array or file path
+            block (bool): Wait for queue space instead of raising QueueFullError
+            label (str): Name reported as 'file_path' in the result
+
+        Returns:
+            Future: Resolves to the analysis result dict, which includes
+                    'queue_wait' (seconds spent waiting for a worker)
+
+        Raises:
+            QueueFullError: If the queue is full and block is False
+        """
+        if not self._slots.acquire(blocking=block):
+            with self._lock:
+                self.stats['rejected'] += 1
+            raise QueueFullError(
+                f"All {self.workers} workers busy and {self.max_queue} requests queued")
+
+        try:
+            payload, content_hash = self._prepare(image)
+            label = label or (image if isinstance(image, str) else 'upload')
+
+            with self._lock:
+                self.stats['submitted'] += 1
+            # Cache I/O stays outside the lock (the cache has its own)
+            cached_result = self.processor._load_from_cache(content_hash)
+            if cached_result:
+                self._slots.release()
+                with self._lock:
+                    self.stats['cache_hits'] += 1
+                    self.stats['completed'] += 1
+                # The cached result names whoever submitted it first
+                future = Future()
+                future.set_result(dict(cached_result['result'], file_path=label, queue_wait=0.0))
+                return future
+
+            with self._lock:
+                self._in_flight += 1
+            submitted_at = time.time()
+            worker_future = self._executor.submit(_analyze_when_dequeued, payload, content_hash)
+        except BaseException:
+            self._slots.release()
+            raise
+
+        future = Future()
+        worker_future.add_done_callback(
+            lambda done: self._complete(done, future, label, content_hash, submitted_at))
+        return future
+
+    def analyze(self, image, timeout=None, block=False, label=None):
+        """
+        Analyze a document and wait for the result
+
+        Args:
+            image: See submit()
+            timeout (float): Seconds to wait for the result (None = no limit)
+            block (bool): Wait for queue space instead of raising QueueFullError
+            label (str): Name reported as 'file_path' in the result
+
+        Returns:
+            dict: Analysis result
+        """
+        return self.submit(image, block=block, label=label).result(timeout)
+
+    def _prepare(self, image):
+        """
+        Turn an input into a picklable payload and its content hash
+
+        Returns:
+            tuple: (payload for the worker, content hash)
+        """
+        hasher = self.processor.hasher
+        if isinstance(image, (str, os.PathLike)):
+            return str(image), hasher.digest(image)
+        if isinstance(image, (bytes, bytearray, memoryview)):
+            data = bytes(image)
+            return data, hasher.hash_buffer(data)
+        if isinstance(image, Image.Image):
+            image = cv2.cvtColor(np.array(image.convert('RGB')), cv2.COLOR_RGB2BGR)
+        if isinstance(image, np.ndarray):
+            image = np.ascontiguousarray(image)
+            # Shape is part of the key: equal bytes in another layout are another image
+            header = f"{image.shape}{image.dtype}".encode('ascii')
+            return image, hasher.hash_buffer(header, memoryview(image).cast('B'))
+        raise TypeError(f"Unsupported image input: {type(image).__name__}")
+
+    def _complete(self, worker_future, future, label, content_hash, submitted_at):
+        """
+        Worker finished: cache the result, record statistics, resolve the caller
+
+        The queue wait runs from submission until a worker picked the
+        request up. Only the bookkeeping is done under the lock.
+        """
+        self._slots.release()
+        try:
+            result, processing_time, started_at = worker_future.result()
+            if 'error' not in result:
+                result = self.processor._finish_result(label, content_hash, result,
+                                                       processing_time)
+        except Exception as e:
+            with self._lock:
+                self._in_flight -= 1
+                self.stats['failed'] += 1
+            future.set_exception(e)
+            return
+
+        queue_wait = max(0.0, started_at - submitted_at)
+        with self._lock:
+            self._in_flight -= 1
+            self._wait_times.append(queue_wait)
+            self.stats['completed'] += 1
+        result['queue_wait'] = queue_wait
+        future.set_result(result)
+
+    def queue_stats(self):
+        """
+        Current load and recent waiting times
+
+        Returns:
+            dict: workers, in_flight, queued (admitted requests waiting for
+                  a worker), max_queue, request counters and wait-time
+                  statistics in seconds over recent requests
+        """
+        with self._lock:
+            waits = list(self._wait_times)
+            in_flight = self._in_flight
+            stats = dict(self.stats)
+
+        stats.update({
+            'workers': self.workers,
+            'in_flight': in_flight,
+            'queued': max(0, in_flight - self.workers),
+            'max_queue': self.max_queue,
+            'avg_wait': float(np.mean(waits)) if waits else 0.0,
+            'p95_wait': float(np.percentile(waits, 95)) if waits else 0.0,
+            'max_wait': float(max(waits)) if waits else 0.0
+        })
+        return stats
+
+    def close(self):
+        """Stop the worker processes and close the result cache"""
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        self.processor.close()
@@ -0,0 +1,278 @@
+"""
+Batch Job Module
+Manifest and checkpoint journal that make long batches resumable
+"""
+
+import json
+import os
+import uuid
+from datetime import datetime
+
+from src.utils.result_sink import JSONLSink, StreamSummary, open_sink, read_results, stream_format
+
+
+class BatchJob:
+    """
+    A planned batch and a record of how far it got
+
+    A job lives in its own directory:
+
+        manifest.json   planned file list (absolute paths) and settings,
+                        written once when the job is created
+        journal.jsonl   one line per finished attempt:
+                        {"index", "status": "done" | "failed", "attempt", "result"}
+        exports.json    output files written by export() (absolute paths)
+
+    The journal is appended to and flushed after every document, so an
+    interrupted job loses at most the documents that were in flight.
+    Resuming reads the journal, skips finished files without touching
+    them again (no rescan, no rehash) and retries failures until they
+    have used up max_attempts.
+    """
+
+    MANIFEST_FILE = 'manifest.json'
+    JOURNAL_FILE = 'journal.jsonl'
+    EXPORTS_FILE = 'exports.json'
+    DEFAULT_JOBS_DIR = 'data/jobs'
+
+    def __init__(self, job_dir):
+        """
+        Open an existing job directory (see create() / open())
+
+        Args:
+            job_dir (str): Directory holding manifest.json and journal.jsonl
+        """
+        self.job_dir = str(job_dir)
+        with open(os.path.join(self.job_dir, self.MANIFEST_FILE)) as f:
+            manifest = json.load(f)
+
+        self.job_id = manifest['job_id']
+        self.files = manifest['files']
+        self.settings = manifest.get('settings', {})
+        self.max_attempts = manifest.get('max_attempts', 3)
+        self.created_at = manifest.get('created_at')
+        self.journal_path = os.path.join(self.job_dir, self.JOURNAL_FILE)
+        self._journal = None
+        self.reload()
+
+    @classmethod
+    def create(cls, files, jobs_dir=DEFAULT_JOBS_DIR, job_id=None, settings=None, max_attempts=3):
+        """
+        Plan a new job
+
+        Args:
+            files (list): Document paths, in processing order
+            jobs_dir (str): Parent directory of job directories
+            job_id (str): Job name (default: timestamp plus a short random suffix)
+            settings (dict): Batch settings to reuse on resume (JSON-serializable)
+            max_attempts (int): Attempts per document before it is given up on
+
+        Returns:
+            BatchJob: The new job
+
+        Raises:
+            FileExistsError: If a job with this id already exists
+        """
+        job_id = job_id or f"{datetime.now():%Y%m%d-%H%M%S}-{uuid.uuid4().hex[:6]}"
+        job_dir = os.path.join(jobs_dir, job_id)
+        os.makedirs(job_dir)
+
+        manifest = {
+            'job_id': job_id,
+            'created_at': datetime.now().isoformat(),
+            'max_attempts': max(1, int(max_attempts)),
+            'settings': settings or {},
+            'files': [os.path.abspath(path) for path in files]
+        }
+        temp_path = os.path.join(job_dir, cls.MANIFEST_FILE + '.tmp')
+        with open(temp_path, 'w') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(temp_path, os.path.join(job_dir, cls.MANIFEST_FILE))
+        open(os.path.join(job_dir, cls.JOURNAL_FILE), 'a').close()
+
+        return cls(job_dir)
+
+    @classmethod
+    def open(cls, job, jobs_dir=DEFAULT_JOBS_DIR):
+        """
+        Open a job by id or by directory path
+
+        Raises:
+            FileNotFoundError: If there is no such job
+        """
+        for job_dir in (job, os.path.join(jobs_dir, job)):
+            if os.path.isfile(os.path.join(job_dir, cls.MANIFEST_FILE)):
+                return cls(job_dir)
+        raise FileNotFoundError(f"No batch job {job!r} (looked in {jobs_dir})")
+
+    def reload(self):
+        """Rebuild the per-document state from the journal (e.g. after another process ran the job)"""
+        self.close()
+        self._repair_journal()
+        # index -> (status, attempts so far)
+        self.state = {}
+        for entry in read_results(self.journal_path):
+            self.state[entry['index']] = (entry['status'], entry['attempt'])
+
+    def _repair_journal(self):
+        """Drop a last line left half-written by a crash, so appends stay valid"""
+        if not os.path.exists(self.journal_path):
+            open(self.journal_path, 'a').close()
+            return
+        with open(self.journal_path, 'rb+') as f:
+            data = f.read()
+            if data and not data.endswith(b'\n'):
+                f.truncate(data.rfind(b'\n') + 1)
+
+    def pending(self):
+        """
+        Documents still to process, in manifest order
+
+        Returns:
+            list: Manifest indices that are neither done nor out of attempts
+        """
+        pending = []
+        for index in range(len(self.files)):
+            status, attempts = self.state.get(index, (None, 0))
+            if status != 'done' and attempts < self.max_attempts:
+                pending.append(index)
+        return pending
+
+    def record(self, index, result):
+        """
+        Journal the outcome of one attempt
+
+        Args:
+            index (int): Manifest index of the document
+            result (dict): Batch result (with 'error' if the attempt failed)
+        """
+        if self._journal is None:
+            self._journal = JSONLSink(self.journal_path, flush_every=1)
+        status = 'failed' if result.get('error') else 'done'
+        attempt = self.state.get(index, (None, 0))[1] + 1
+        self._journal.write({'index': index, 'status': status, 'attempt': attempt,
+                             'result': result})
+        self.state[index] = (status, attempt)
+
+    def close(self):
+        """Flush and close the journal"""
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+
+    def progress(self):
+        """
+        Returns:
+            dict: total, done, failed (out of attempts), retrying (failed
+                  but will be retried) and pending (never attempted)
+        """
+        counts = {'total': len(self.files), 'done': 0, 'failed': 0, 'retrying': 0, 'pending': 0}
+        for index in range(len(self.files)):
+            status, attempts = self.state.get(index, (None, 0))
+            if status == 'done':
+                counts['done'] += 1
+            elif status is None:
+                counts['pending'] += 1
+            elif attempts >= self.max_attempts:
+                counts['failed'] += 1
+            else:
+                counts['retrying'] += 1
+        return counts
+
+    @property
+    def finished(self):
+        """True once every document is done or out of attempts"""
+        return not self.pending()
+
+    def results(self):
+        """
+        Latest result of every attempted document, in journal order
+
+        Earlier failed attempts of documents that were retried are left
+        out. The journal is read twice instead of holding results in memory.
+
+        Yields:
+            dict: Batch result
+        """
+        last_line = {}
+        for line, entry in enumerate(read_results(self.journal_path)):
+            last_line[entry['index']] = line
+        for line, entry in enumerate(read_results(self.journal_path)):
+            if last_line[entry['index']] == line:
+                yield entry['result']
+
+    def exports(self):
+        """
+        Returns:
+            list: Absolute paths of the output files this job has written
+        """
+        try:
+            with open(os.path.join(self.job_dir, self.EXPORTS_FILE)) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return []
+
+    def can_export(self, output_file):
+        """True if output_file does not exist yet or was written by this job"""
+        return (not os.path.exists(output_file) or
+                os.path.abspath(output_file) in self.exports())
+
+    def export(self, output_file, overwrite=False):
+        """
+        Write the job's results to an output file
+
+        The whole file is rewritten from the journal. .jsonl / .csv
+        outputs are streamed; other paths get one JSON document like
+        BatchProcessor.save_results(), with 'statistics' computed over
+        every result of the job plus 'job_id' and 'progress'.
+
+        Args:
+            output_file (str): Output path
+            overwrite (bool): Replace an existing file this job did not write
+
+        Returns:
+            int: Number of results written
+
+        Raises:
+            FileExistsError: If output_file exists, was not written by this
+                             job and overwrite is False
+        """
+        if not overwrite and not self.can_export(output_file):
+            raise FileExistsError(f"{output_file} already exists and was not written by "
+                                  f"job {self.job_id}")
+
+        if stream_format(output_file):
+            if os.path.exists(output_file):
+                os.remove(output_file)  # the job, not the file, is append-only
+            with open_sink(output_file) as sink:
+                for result in self.results():
+                    sink.write(result)
+            written = sink.written
+        else:
+            results = list(self.results())
+            summary = StreamSummary()
+            for result in results:
+                summary.add(result)
+            directory = os.path.dirname(output_file)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(output_file, 'w') as f:
+                json.dump({
+                    'processed_at': datetime.now().isoformat(),
+                    'total_documents': len(results),
+                    'statistics': summary.to_dict(),
+                    'job_id': self.job_id,
+                    'progress': self.progress(),
+                    'results': results
+                }, f, indent=2)
+            written = len(results)
+
+        exports = self.exports()
+        if os.path.abspath(output_file) not in exports:
+            with open(os.path.join(self.job_dir, self.EXPORTS_FILE), 'w') as f:
+                json.dump(exports + [os.path.abspath(output_file)], f, indent=2)
+        return written
+
+    def __repr__(self):
+        progress = self.progress()
+        return f"BatchJob({self.job_id!r}, {progress['done']}/{progress['total']} done)"
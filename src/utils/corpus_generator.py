@@ -0,0 +1,638 @@
+"""
+Corpus Generator
+Deterministic, parallel generation of large synthetic document corpora
+with ground-truth manipulation labels (for load and benchmark testing).
+
+Every document is drawn from its own random stream seeded by
+(corpus seed, document index), so a corpus is identical however many
+worker processes build it, and any slice of it can be regenerated alone.
+
+Usage:
+    python src/utils/corpus_generator.py data/corpus --count 20000 --seed 7 --workers 8
+"""
+
+import argparse
+import io
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFilter, ImageFont
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.utils.result_sink import JSONLSink
+
+
+DOC_TYPES = ('statement', 'contract', 'invoice')
+MANIPULATIONS = ('copymove', 'font_mixing', 'splice')
+
+# Page sizes in millimetres (width, height)
+PAGE_SIZES = {
+    'a4': (210, 297),
+    'letter': (215.9, 279.4),
+    'a5': (148, 210),
+    'legal': (215.9, 355.6),
+}
+
+# Candidate font files per face; the first one found is used
+FONT_FACES = {
+    'sans': ('arial.ttf', 'DejaVuSans.ttf', 'LiberationSans-Regular.ttf'),
+    'serif': ('times.ttf', 'DejaVuSerif.ttf', 'LiberationSerif-Regular.ttf'),
+    'mono': ('cour.ttf', 'DejaVuSansMono.ttf', 'LiberationMono-Regular.ttf'),
+    'bold': ('arialbd.ttf', 'DejaVuSans-Bold.ttf', 'LiberationSans-Bold.ttf'),
+}
+
+BANKS = ('STATE BANK OF EXAMPLE', 'FIRST NATIONAL TRUST', 'UNION SAVINGS BANK',
+         'METRO CREDIT UNION', 'CITY COOPERATIVE BANK', 'NORTHERN BANKING CORP')
+COMPANIES = ('ABC Corporation', 'Globex Ltd', 'Initech Pvt Ltd', 'Acme Supplies',
+             'Umbrella Services', 'Stark Logistics', 'Wayne Consulting', 'Hooli Inc')
+NAMES = ('John Doe', 'Priya Sharma', 'Maria Garcia', 'Wei Chen', 'Amit Patel',
+         'Sarah Johnson', 'Ahmed Khan', 'Elena Rossi')
+DESCRIPTIONS = ('Salary Credit', 'ATM Withdrawal', 'Online Transfer', 'Electricity Bill',
+                'Grocery Store', 'Card Payment', 'Interest Credit', 'Loan EMI',
+                'Mobile Recharge', 'Insurance Premium', 'Cheque Deposit', 'Rent Payment')
+ITEMS = ('Consulting hours', 'Office chairs', 'Laptop stand', 'Printer toner',
+         'Software licence', 'Network cable', 'Maintenance visit', 'Paper (A4, box)')
+WORDS = ('the', 'party', 'agrees', 'to', 'provide', 'services', 'under', 'this',
+         'agreement', 'for', 'a', 'period', 'of', 'months', 'payment', 'shall', 'be',
+         'made', 'within', 'days', 'of', 'invoice', 'and', 'all', 'terms', 'remain',
+         'in', 'force', 'until', 'terminated', 'by', 'written', 'notice', 'either')
+PAPER_COLORS = ((255, 255, 255), (252, 252, 248), (250, 249, 244), (255, 254, 240))
+
+# Fonts are loaded once per process
+_font_cache = {}
+
+
+def load_font(face, size):
+    """
+    TrueType font for a face ('sans', 'serif', 'mono', 'bold') and pixel size
+
+    Falls back to Pillow's built-in font when no candidate file is installed.
+    """
+    key = (face, size)
+    if key not in _font_cache:
+        font = None
+        for name in FONT_FACES[face]:
+            try:
+                font = ImageFont.truetype(name, size)
+                break
+            except OSError:
+                continue
+        _font_cache[key] = font or ImageFont.load_default(size)
+    return _font_cache[key]
+
+
+def resolved_fonts():
+    """Font file used for each face on this machine (corpora differ if these do)"""
+    return {face: getattr(load_font(face, 20), 'path', 'builtin') for face in FONT_FACES}
+
+
+def _union(a, b):
+    return [min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3])]
+
+
+def _overlaps(a, b):
+    return a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]
+
+
+class _Page:
+    """A page being drawn, with the text lines and blocks placed on it"""
+
+    def __init__(self, width, height, dpi, paper):
+        self.image = Image.new('RGB', (width, height), paper)
+        self.draw = ImageDraw.Draw(self.image)
+        self.width, self.height = width, height
+        self.scale = dpi / 150.0  # layouts are designed at 150 DPI
+        self.paper = paper
+        self.margin = int(60 * self.scale)
+        self.lines = []   # {'bbox', 'text', 'face', 'size', 'fill', 'amount'}
+        self.blocks = []  # bboxes of signatures / stamps (copy-move sources)
+
+    def px(self, value):
+        return int(round(value * self.scale))
+
+    def text(self, x, y, text, face='sans', size=24, fill='black', amount=False):
+        """Draw one line of text and remember where it went"""
+        size = max(8, self.px(size))
+        font = load_font(face, size)
+        self.draw.text((x, y), text, fill=fill, font=font)
+        bbox = [int(v) for v in self.draw.textbbox((x, y), text, font=font)]
+        self.lines.append({'bbox': bbox, 'text': text, 'face': face, 'size': size,
+                           'fill': fill, 'amount': amount})
+        return bbox
+
+
+class CorpusGenerator:
+    """
+    Builds a corpus of statements, contracts and invoices
+
+    Documents vary in type, page size, DPI, content, paper tint, scanner
+    noise and JPEG quality. A `forgery_rate` share of them receive one or
+    two manipulations, each recorded with its bounding boxes:
+
+        copymove     a region of the page pasted elsewhere on the same page
+        font_mixing  a text line erased and re-typeset in another face/size
+        splice       a patch with its own compression history pasted in
+    """
+
+    # Per-document labels (one JSON line each) and corpus-level settings/totals
+    MANIFEST_FILE = 'manifest.jsonl'
+    CORPUS_FILE = 'corpus.json'
+
+    def __init__(self, output_dir, seed=0, doc_types=DOC_TYPES, dpis=(100, 150, 200),
+                 page_sizes=('a4', 'letter', 'a5'), forgery_rate=0.5,
+                 manipulations=MANIPULATIONS, jpeg_quality=(85, 95), noise=2.0):
+        """
+        Args:
+            output_dir (str): Directory for the documents and the manifest
+            seed (int): Corpus seed
+            doc_types (tuple): Subset of DOC_TYPES to draw from
+            dpis (tuple): Resolutions to draw from
+            page_sizes (tuple): Keys of PAGE_SIZES to draw from
+            forgery_rate (float): Share of documents that are manipulated
+            manipulations (tuple): Subset of MANIPULATIONS to draw from
+            jpeg_quality (tuple): (min, max) final JPEG quality
+            noise (float): Maximum scanner noise standard deviation
+        """
+        unknown = ((set(doc_types) - set(DOC_TYPES)) | (set(manipulations) - set(MANIPULATIONS))
+                   | (set(page_sizes) - set(PAGE_SIZES)))
+        if unknown:
+            raise ValueError(f"Unknown corpus options: {sorted(unknown)}")
+
+        self.output_dir = output_dir
+        self.seed = int(seed)
+        self.doc_types = tuple(doc_types)
+        self.dpis = tuple(int(dpi) for dpi in dpis)
+        self.page_sizes = tuple(page_sizes)
+        self.forgery_rate = float(forgery_rate)
+        self.manipulations = tuple(manipulations)
+        self.jpeg_quality = tuple(jpeg_quality)
+        self.noise = float(noise)
+
+    def settings(self):
+        """Generator settings (enough to regenerate the corpus)"""
+        return {
+            'seed': self.seed,
+            'doc_types': list(self.doc_types),
+            'dpis': list(self.dpis),
+            'page_sizes': list(self.page_sizes),
+            'forgery_rate': self.forgery_rate,
+            'manipulations': list(self.manipulations),
+            'jpeg_quality': list(self.jpeg_quality),
+            'noise': self.noise
+        }
+
+    def rng(self, index):
+        """Random stream of one document (independent of every other document)"""
+        return np.random.default_rng([self.seed, index])
+
+    def render(self, index):
+        """
+        Draw document `index` in memory
+
+        Returns:
+            tuple: (PIL.Image, manifest entry without 'file')
+        """
+        rng = self.rng(index)
+        doc_type = self.doc_types[rng.integers(len(self.doc_types))]
+        page_size = self.page_sizes[rng.integers(len(self.page_sizes))]
+        dpi = self.dpis[rng.integers(len(self.dpis))]
+        width_mm, height_mm = PAGE_SIZES[page_size]
+        width, height = int(width_mm / 25.4 * dpi), int(height_mm / 25.4 * dpi)
+        paper = PAPER_COLORS[rng.integers(len(PAPER_COLORS))]
+
+        page = _Page(width, height, dpi, paper)
+        {'statement': self._draw_statement,
+         'contract': self._draw_contract,
+         'invoice': self._draw_invoice}[doc_type](page, rng)
+
+        manipulations = []
+        if self.manipulations and rng.random() < self.forgery_rate:
+            count = min(len(self.manipulations), 1 + int(rng.random() < 0.3))
+            for kind in rng.choice(self.manipulations, size=count, replace=False):
+                label = {'copymove': self._copymove,
+                         'font_mixing': self._font_mixing,
+                         'splice': self._splice}[kind](page, rng)
+                if label:
+                    manipulations.append(label)
+
+        image = page.image
+        sigma = rng.uniform(0, self.noise) if self.noise > 0 else 0.0
+        if sigma > 0.1:
+            pixels = np.asarray(image, dtype=np.float32)
+            pixels += rng.standard_normal(pixels.shape, dtype=np.float32) * np.float32(sigma)
+            image = Image.fromarray(np.clip(pixels, 0, 255).astype(np.uint8))
+
+        entry = {
+            'index': index,
+            'doc_type': doc_type,
+            'page_size': page_size,
+            'dpi': int(dpi),
+            'width': width,
+            'height': height,
+            'jpeg_quality': int(rng.integers(self.jpeg_quality[0], self.jpeg_quality[1] + 1)),
+            'noise_sigma': round(float(sigma), 3),
+            'label': 'forged' if manipulations else 'authentic',
+            'manipulations': manipulations
+        }
+        return image, entry
+
+    def generate_one(self, index):
+        """
+        Render document `index` and save it as JPEG
+
+        Returns:
+            dict: Manifest entry ('file' is relative to output_dir)
+        """
+        image, entry = self.render(index)
+        name = f"{entry['doc_type']}_{index:06d}_{entry['label']}.jpg"
+        image.save(os.path.join(self.output_dir, name), 'JPEG', quality=entry['jpeg_quality'])
+        return dict(entry, file=name)
+
+    def generate(self, count, workers=1, start=0, show_progress=True):
+        """
+        Generate documents start .. start+count-1
+
+        Documents are rendered on `workers` processes and the manifest is
+        written in index order as they complete. Re-running with a later
+        `start` extends the corpus (the manifest is appended to).
+
+        Args:
+            count (int): Number of documents
+            workers (int): Worker processes (1 = this process)
+            start (int): Index of the first document
+            show_progress (bool): Print a header, progress every 5% and totals
+
+        Returns:
+            dict: Corpus summary (also written to corpus.json)
+        """
+        os.makedirs(self.output_dir, exist_ok=True)
+        corpus = self._load_corpus_file()
+        workers = max(1, int(workers))
+        indices = range(start, start + count)
+
+        if show_progress:
+            print("\n" + "="*70)
+            print("🏭 CORPUS GENERATION")
+            print("="*70)
+            print(f"   Documents: {count} (indices {start}-{start + count - 1})")
+            print(f"   Seed: {self.seed}   Workers: {workers}")
+            print(f"   Output: {self.output_dir}")
+            print("="*70)
+
+        counts = {'authentic': 0, 'forged': 0}
+        by_manipulation = {kind: 0 for kind in self.manipulations}
+        step = max(1, count // 20)
+        start_time = time.time()
+
+        manifest = JSONLSink(os.path.join(self.output_dir, self.MANIFEST_FILE), flush_every=500)
+        try:
+            if workers > 1:
+                pool = ProcessPoolExecutor(max_workers=workers)
+                entries = pool.map(self.generate_one, indices,
+                                   chunksize=max(1, min(64, count // (workers * 8))))
+            else:
+                pool = None
+                entries = map(self.generate_one, indices)
+
+            for done, entry in enumerate(entries, 1):
+                manifest.write(entry)
+                counts[entry['label']] += 1
+                for manipulation in entry['manipulations']:
+                    by_manipulation[manipulation['type']] += 1
+                if show_progress and (done % step == 0 or done == count):
+                    rate = done / (time.time() - start_time)
+                    print(f"   [{done}/{count}] {done / count:.0%}  ({rate:.1f} documents/second)")
+        finally:
+            manifest.close()
+            if workers > 1:
+                pool.shutdown(cancel_futures=True)
+
+        elapsed = time.time() - start_time
+        summary = self._update_corpus_file(corpus, start, count, counts, by_manipulation)
+
+        if show_progress:
+            print(f"\n✅ Generated {count} documents in {elapsed:.1f} seconds "
+                  f"({count / elapsed:.1f} documents/second)")
+            print(f"   Authentic: {counts['authentic']}   Forged: {counts['forged']}")
+            print(f"   Manifest: {os.path.join(self.output_dir, self.MANIFEST_FILE)}")
+        return summary
+
+    def _load_corpus_file(self):
+        """
+        Existing corpus.json, or a fresh one for this generator
+
+        Raises:
+            ValueError: If the corpus was generated with other settings
+        """
+        path = os.path.join(self.output_dir, self.CORPUS_FILE)
+        if not os.path.exists(path):
+            return {'settings': self.settings(), 'fonts': resolved_fonts(),
+                    'documents': 0, 'authentic': 0, 'forged': 0,
+                    'manipulations': {}, 'ranges': []}
+        with open(path) as f:
+            corpus = json.load(f)
+        if corpus['settings'] != self.settings():
+            raise ValueError(f"{path} was generated with different settings; "
+                             f"use another output directory")
+        return corpus
+
+    def _update_corpus_file(self, summary, start, count, counts, by_manipulation):
+        """Add this run's totals to corpus.json"""
+        path = os.path.join(self.output_dir, self.CORPUS_FILE)
+        summary['documents'] += count
+        summary['authentic'] += counts['authentic']
+        summary['forged'] += counts['forged']
+        for kind, n in by_manipulation.items():
+            summary['manipulations'][kind] = summary['manipulations'].get(kind, 0) + n
+        summary['ranges'].append([start, start + count])
+        summary['updated_at'] = datetime.now().isoformat()
+
+        with open(path, 'w') as f:
+            json.dump(summary, f, indent=2)
+        return summary
+
+    # ------------------------------------------------------------------
+    # Document layouts
+    # ------------------------------------------------------------------
+
+    def _draw_statement(self, page, rng):
+        """Bank statement: header band, account details, transaction table"""
+        bank = BANKS[rng.integers(len(BANKS))]
+        band = page.px(100)
+        color = tuple(int(c) for c in rng.integers(0, 120, 3))
+        page.draw.rectangle([0, 0, page.width, band], fill=color)
+        page.text(page.margin, page.px(30), bank, face='bold', size=36, fill='white')
+
+        y = band + page.px(40)
+        page.text(page.margin, y, "Account Statement", face='bold', size=30)
+        y += page.px(60)
+        account = ''.join(str(d) for d in rng.integers(0, 10, 10))
+        month = int(rng.integers(1, 13))
+        for line in (f"Account Number: {account}",
+                     f"Account Holder: {NAMES[rng.integers(len(NAMES))].upper()}",
+                     f"Period: {month:02d}/01/2024 - {month:02d}/28/2024"):
+            page.text(page.margin, y, line)
+            y += page.px(40)
+
+        y += page.px(30)
+        columns = [page.margin, page.margin + page.px(220), page.width - page.px(430),
+                   page.width - page.px(230)]
+        page.draw.rectangle([page.margin - page.px(10), y, page.width - page.margin, y + page.px(44)],
+                            fill=(224, 224, 224))
+        for x, title in zip(columns, ('Date', 'Description', 'Debit', 'Credit')):
+            page.text(x, y + page.px(8), title, face='bold', size=22)
+        y += page.px(60)
+
+        balance = float(rng.integers(50000, 400000))
+        rows = int(rng.integers(6, 25))
+        for _ in range(rows):
+            if y > page.height - page.px(200):
+                break
+            amount = float(rng.integers(100, 15000)) + int(rng.integers(0, 100)) / 100
+            credit = rng.random() < 0.35
+            balance += amount if credit else -amount
+            page.text(columns[0], y, f"{month:02d}/{int(rng.integers(1, 29)):02d}", size=22)
+            page.text(columns[1], y, DESCRIPTIONS[rng.integers(len(DESCRIPTIONS))], size=22)
+            page.text(columns[3 if credit else 2], y, f"{amount:,.2f}", size=22, amount=True)
+            y += page.px(42)
+
+        y += page.px(20)
+        page.text(page.margin, y, f"Closing Balance: {balance:,.2f}", face='bold', size=26, amount=True)
+
+    def _draw_contract(self, page, rng):
+        """Contract: title, parties, wrapped clauses, signature blocks"""
+        page.text(page.margin, page.px(60), "SERVICE AGREEMENT", face='bold', size=36)
+        y = page.px(140)
+        company, name = COMPANIES[rng.integers(len(COMPANIES))], NAMES[rng.integers(len(NAMES))]
+        for line in ("This agreement is made between:", f"Party A: {company}",
+                     f"Party B: {name}", f"Fee: {int(rng.integers(1, 90)) * 1000:,}.00 per month"):
+            page.text(page.margin, y, line, amount=line.startswith('Fee'))
+            y += page.px(40)
+
+        font = load_font('sans', max(8, page.px(22)))
+        right = page.width - page.margin
+        signature_room = page.px(260)
+        clause = 1
+        while y < page.height - signature_room - page.px(120):
+            y += page.px(24)
+            words = [f"{clause}."] + list(rng.choice(WORDS, size=int(rng.integers(25, 70))))
+            line = ''
+            for word in words:
+                candidate = f"{line} {word}".strip()
+                if page.margin + font.getlength(candidate) > right and line:
+                    page.text(page.margin, y, line, size=22)
+                    y += page.px(34)
+                    line = word
+                    if y > page.height - signature_room - page.px(60):
+                        break
+                else:
+                    line = candidate
+            if line and y <= page.height - signature_room - page.px(60):
+                page.text(page.margin, y, line, size=22)
+                y += page.px(34)
+            clause += 1
+
+        y = page.height - signature_room
+        for x, signer in ((page.margin, company), (page.width // 2 + page.px(20), name)):
+            self._signature(page, rng, x, y, signer)
+
+    def _signature(self, page, rng, x, y, signer):
+        """Scribbled signature with the signer's name underneath"""
+        w, h = page.px(240), page.px(90)
+        points = [(x + page.px(10) + i * (w - page.px(20)) // 7,
+                   y + int(rng.integers(page.px(10), h - page.px(10)))) for i in range(8)]
+        page.draw.line(points, fill=(20, 40, 160), width=max(1, page.px(3)))
+        page.text(x, y + h + page.px(6), signer, size=20, fill=(20, 40, 160))
+        page.blocks.append([x, y, x + w, y + h + page.px(36)])
+
+    def _draw_invoice(self, page, rng):
+        """Invoice: vendor, bill-to, item table and totals"""
+        vendor = COMPANIES[rng.integers(len(COMPANIES))]
+        page.text(page.margin, page.px(50), vendor, face='bold', size=34)
+        page.text(page.width - page.margin - page.px(260), page.px(56), "INVOICE", face='bold', size=34)
+        y = page.px(130)
+        for line in (f"Invoice No: INV-{int(rng.integers(10000, 99999))}",
+                     f"Date: {int(rng.integers(1, 29)):02d}/{int(rng.integers(1, 13)):02d}/2024",
+                     f"Bill to: {NAMES[rng.integers(len(NAMES))]}"):
+            page.text(page.margin, y, line)
+            y += page.px(40)
+
+        y += page.px(30)
+        columns = [page.margin, page.width - page.px(560), page.width - page.px(400),
+                   page.width - page.px(230)]
+        page.draw.line([page.margin, y + page.px(40), page.width - page.margin, y + page.px(40)],
+                       fill='black', width=max(1, page.px(2)))
+        for x, title in zip(columns, ('Item', 'Qty', 'Unit price', 'Amount')):
+            page.text(x, y, title, face='bold', size=22)
+        y += page.px(60)
+
+        subtotal = 0.0
+        for _ in range(int(rng.integers(3, 15))):
+            if y > page.height - page.px(320):
+                break
+            quantity = int(rng.integers(1, 20))
+            price = float(rng.integers(5, 900)) + int(rng.integers(0, 100)) / 100
+            subtotal += quantity * price
+            page.text(columns[0], y, ITEMS[rng.integers(len(ITEMS))], size=22)
+            page.text(columns[1], y, str(quantity), size=22)
+            page.text(columns[2], y, f"{price:,.2f}", size=22, amount=True)
+            page.text(columns[3], y, f"{quantity * price:,.2f}", size=22, amount=True)
+            y += page.px(42)
+
+        y += page.px(30)
+        tax = subtotal * 0.18
+        for label, value, face in (('Subtotal', subtotal, 'sans'), ('Tax (18%)', tax, 'sans'),
+                                   ('TOTAL', subtotal + tax, 'bold')):
+            page.text(columns[2] - page.px(60), y, f"{label}: {value:,.2f}", face=face, size=24,
+                      amount=True)
+            y += page.px(42)
+
+        # Company stamp
+        x, y = page.margin, page.height - page.px(260)
+        r = page.px(80)
+        page.draw.ellipse([x, y, x + 2 * r, y + 2 * r], outline=(160, 30, 30), width=max(1, page.px(4)))
+        page.text(x + r // 3, y + r - page.px(12), "PAID", face='bold', size=28, fill=(160, 30, 30))
+        page.blocks.append([x, y, x + 2 * r, y + 2 * r])
+
+    # ------------------------------------------------------------------
+    # Manipulations
+    # ------------------------------------------------------------------
+
+    def _pick_line(self, page, rng, amounts_first=True):
+        """A text line to tamper with, amounts preferred"""
+        candidates = [line for line in page.lines if line['amount']] if amounts_first else []
+        candidates = candidates or page.lines
+        return candidates[rng.integers(len(candidates))] if candidates else None
+
+    def _copymove(self, page, rng):
+        """Copy a signature/stamp or an amount to another spot on the page"""
+        min_size = page.px(64)
+        if page.blocks and rng.random() < 0.7:
+            source = list(page.blocks[rng.integers(len(page.blocks))])
+        else:
+            line = self._pick_line(page, rng)
+            if line is None:
+                return None
+            pad = page.px(6)
+            x0, y0, x1, y1 = line['bbox']
+            source = [x0 - pad, y0 - pad, max(x1 + pad, x0 + min_size), max(y1 + pad, y0 + min_size)]
+        source = [max(0, source[0]), max(0, source[1]),
+                  min(page.width, source[2]), min(page.height, source[3])]
+        w, h = source[2] - source[0], source[3] - source[1]
+        if w <= 0 or h <= 0 or w >= page.width - 2 * page.margin:
+            return None
+
+        for _ in range(20):
+            x = int(rng.integers(page.margin, page.width - page.margin - w))
+            y = int(rng.integers(page.margin, page.height - page.margin - h))
+            target = [x, y, x + w, y + h]
+            if not _overlaps(source, target):
+                break
+        else:
+            return None
+
+        page.image.paste(page.image.crop(tuple(source)), (x, y))
+        return {'type': 'copymove', 'bbox': target, 'source': source,
+                'shift': [target[0] - source[0], target[1] - source[1]]}
+
+    def _font_mixing(self, page, rng):
+        """Erase a line and re-typeset it (digits altered) in another face or size"""
+        line = self._pick_line(page, rng)
+        if line is None:
+            return None
+        x0, y0, x1, y1 = line['bbox']
+        pad = page.px(3)
+        page.draw.rectangle([x0 - pad, y0 - pad, x1 + pad, y1 + pad], fill=page.paper)
+
+        faces = [face for face in ('sans', 'serif', 'mono') if face != line['face']]
+        face = faces[rng.integers(len(faces))]
+        size = max(8, int(line['size'] * rng.choice([0.75, 0.85, 1.2, 1.35])))
+        digits = '0123456789'
+        text = ''.join(digits[rng.integers(10)] if c.isdigit() and rng.random() < 0.4 else c
+                       for c in line['text'])
+        font = load_font(face, size)
+        page.draw.text((x0, y0), text, fill=line['fill'], font=font)
+        new_bbox = [int(v) for v in page.draw.textbbox((x0, y0), text, font=font)]
+        bbox = _union([x0 - pad, y0 - pad, x1 + pad, y1 + pad], new_bbox)
+        bbox = [max(0, bbox[0]), max(0, bbox[1]), min(page.width, bbox[2]), min(page.height, bbox[3])]
+        return {'type': 'font_mixing', 'bbox': bbox,
+                'original_text': line['text'], 'text': text, 'face': face, 'size': size}
+
+    def _splice(self, page, rng):
+        """Paste a patch from another source (own tint, noise and JPEG history)"""
+        w = int(rng.integers(page.px(160), page.px(420)))
+        h = int(rng.integers(page.px(40), page.px(140)))
+        tint = tuple(int(c) for c in rng.integers(225, 256, 3))
+        patch = Image.new('RGB', (w, h), tint)
+        draw = ImageDraw.Draw(patch)
+        text = f"{int(rng.integers(1000, 999999)):,}.00"
+        draw.text((page.px(10), h // 4), text, fill=(10, 10, 10),
+                  font=load_font(('sans', 'serif')[rng.integers(2)], max(8, h // 2)))
+
+        pixels = np.asarray(patch, dtype=np.float32)
+        pixels += rng.standard_normal(pixels.shape, dtype=np.float32) * np.float32(rng.uniform(3, 8))
+        patch = Image.fromarray(np.clip(pixels, 0, 255).astype(np.uint8))
+        patch = patch.filter(ImageFilter.GaussianBlur(radius=float(rng.uniform(0.3, 1.0))))
+
+        # Earlier, stronger compression than the rest of the page
+        buffer = io.BytesIO()
+        source_quality = int(rng.integers(40, 75))
+        patch.save(buffer, 'JPEG', quality=source_quality)
+        buffer.seek(0)
+        patch = Image.open(buffer).convert('RGB')
+
+        x = int(rng.integers(page.margin, max(page.margin + 1, page.width - page.margin - w)))
+        y = int(rng.integers(page.margin, max(page.margin + 1, page.height - page.margin - h)))
+        page.image.paste(patch, (x, y))
+        return {'type': 'splice', 'bbox': [x, y, x + w, y + h], 'source_quality': source_quality}
+
+
+def read_manifest(output_dir):
+    """
+    Stream the manifest of a generated corpus
+
+    Yields:
+        dict: One entry per document, with 'path' resolved against output_dir
+    """
+    with open(os.path.join(output_dir, CorpusGenerator.MANIFEST_FILE)) as f:
+        for line in f:
+            if line.strip():
+                entry = json.loads(line)
+                entry['path'] = os.path.join(output_dir, entry['file'])
+                yield entry
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate a synthetic TruthLens document corpus')
+    parser.add_argument('output', nargs='?', default='data/corpus',
+                        help='Output directory (default: data/corpus)')
+    parser.add_argument('--count', '-n', type=int, default=1000, help='Number of documents')
+    parser.add_argument('--seed', type=int, default=0, help='Corpus seed')
+    parser.add_argument('--start', type=int, default=0,
+                        help='Index of the first document (extend an existing corpus)')
+    parser.add_argument('--workers', '-w', type=int, default=os.cpu_count() or 1,
+                        help='Worker processes (default: all CPUs)')
+    parser.add_argument('--types', nargs='+', default=list(DOC_TYPES), choices=DOC_TYPES)
+    parser.add_argument('--dpi', type=int, nargs='+', default=[100, 150, 200])
+    parser.add_argument('--page-sizes', nargs='+', default=['a4', 'letter', 'a5'],
+                        choices=sorted(PAGE_SIZES))
+    parser.add_argument('--forgery-rate', type=float, default=0.5,
+                        help='Share of manipulated documents (default: 0.5)')
+    parser.add_argument('--manipulations', nargs='+', default=list(MANIPULATIONS),
+                        choices=MANIPULATIONS)
+    args = parser.parse_args()
+
+    generator = CorpusGenerator(args.output, seed=args.seed, doc_types=args.types, dpis=args.dpi,
+                                page_sizes=args.page_sizes, forgery_rate=args.forgery_rate,
+                                manipulations=args.manipulations)
+    generator.generate(args.count, workers=args.workers, start=args.start)
+
+
+if __name__ == "__main__":
+    main()
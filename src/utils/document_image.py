@@ -0,0 +1,221 @@
+"""
+Document Image Module
+Decodes a document once and shares its pixel data across all detectors
+"""
+
+import os
+import threading
+import cv2
+import numpy as np
+from PIL import Image
+
+
+class DocumentImage:
+    """
+    In-memory document shared by the detection modules
+
+    The file is decoded a single time into a BGR array. The RGB and
+    grayscale views are derived lazily on first access and reused by
+    every detector that asks for them.
+
+    Lazy views and memoised artifacts are built under a per-key lock, so
+    detectors running on different threads share one copy of each.
+    """
+
+    # cv2.imread flags for decoding at 1/2, 1/4 and 1/8 size. For JPEG,
+    # libjpeg scales during the DCT, so a reduced decode is much cheaper
+    # than a full one; other formats are decoded and then resized.
+    REDUCED_FLAGS = {
+        2: cv2.IMREAD_REDUCED_COLOR_2,
+        4: cv2.IMREAD_REDUCED_COLOR_4,
+        8: cv2.IMREAD_REDUCED_COLOR_8,
+    }
+
+    def __init__(self, bgr, source=None):
+        """
+        Wrap an already decoded image
+
+        Args:
+            bgr (np.ndarray): 3-channel BGR image (as returned by cv2.imread)
+            source (str): Where the image came from (path or label)
+        """
+        self._bgr = bgr
+        self.source = source
+        self._views = {}
+        self._artifacts = {}
+        self._lock = threading.Lock()
+        self._key_locks = {}
+
+    @classmethod
+    def from_path(cls, image_path, reduction=1):
+        """
+        Decode an image file from disk
+
+        Args:
+            image_path (str): Path to document image
+            reduction (int): Decode at 1/reduction of the size (1, 2, 4 or 8)
+
+        Returns:
+            DocumentImage: Decoded document, or None if it could not be read
+        """
+        flags = cls.REDUCED_FLAGS[reduction] if reduction != 1 else cv2.IMREAD_COLOR
+        bgr = cv2.imread(str(image_path), flags)
+        if bgr is None:
+            return None
+        return cls(bgr, source=str(image_path))
+
+    @classmethod
+    def from_bytes(cls, data, source=None):
+        """
+        Decode an encoded image (JPEG, PNG, ...) held in memory
+
+        Args:
+            data (bytes): Encoded image bytes
+            source (str): Optional label for the document
+
+        Returns:
+            DocumentImage: Decoded document, or None if it could not be read
+        """
+        buffer = np.frombuffer(data, dtype=np.uint8)
+        bgr = cv2.imdecode(buffer, cv2.IMREAD_COLOR)
+        if bgr is None:
+            return None
+        return cls(bgr, source=source)
+
+    @classmethod
+    def from_pil(cls, image, source=None):
+        """
+        Wrap a PIL image (e.g. an upload from the web interface)
+
+        Args:
+            image (PIL.Image.Image): Image in any mode
+            source (str): Optional label for the document
+
+        Returns:
+            DocumentImage: Document backed by a copy of the pixels
+        """
+        rgb = np.array(image.convert('RGB'))
+        document = cls(cv2.cvtColor(rgb, cv2.COLOR_RGB2BGR), source=source)
+        document._views['rgb'] = rgb
+        return document
+
+    @classmethod
+    def load(cls, image):
+        """
+        Coerce any supported input into a DocumentImage
+
+        Args:
+            image: DocumentImage, file path, encoded bytes, PIL image
+                   or BGR numpy array
+
+        Returns:
+            DocumentImage: Decoded document, or None if it could not be read
+        """
+        if isinstance(image, DocumentImage):
+            return image
+        if isinstance(image, (str, os.PathLike)):
+            return cls.from_path(image)
+        if isinstance(image, (bytes, bytearray, memoryview)):
+            return cls.from_bytes(bytes(image))
+        if isinstance(image, Image.Image):
+            return cls.from_pil(image)
+        if isinstance(image, np.ndarray):
+            return cls(image)
+        raise TypeError(f"Unsupported image input: {type(image).__name__}")
+
+    @classmethod
+    def load_reduced(cls, image, reduction):
+        """
+        Coerce any supported input into a DocumentImage at reduced size
+
+        Files are decoded at reduced size directly; inputs that are already
+        decoded are downscaled with area averaging.
+
+        Args:
+            image: See load()
+            reduction (int): Size divisor (1, 2, 4 or 8)
+
+        Returns:
+            DocumentImage: Reduced document, or None if it could not be read
+        """
+        if reduction == 1:
+            return cls.load(image)
+        if isinstance(image, (str, os.PathLike)):
+            return cls.from_path(image, reduction=reduction)
+        document = cls.load(image)
+        if document is None:
+            return None
+        return document.downscaled(reduction)
+
+    def downscaled(self, reduction):
+        """
+        Smaller copy of this document (area-averaged)
+
+        Args:
+            reduction (int): Size divisor
+
+        Returns:
+            DocumentImage: New document of size ceil(width / reduction) x
+                           ceil(height / reduction), like a reduced decode
+        """
+        width = -(-self.width // reduction)
+        height = -(-self.height // reduction)
+        bgr = cv2.resize(self._bgr, (width, height), interpolation=cv2.INTER_AREA)
+        return DocumentImage(bgr, source=self.source)
+
+    @property
+    def bgr(self):
+        """BGR view (OpenCV native order)"""
+        return self._bgr
+
+    @property
+    def rgb(self):
+        """RGB view (PIL / Tesseract order), computed on first access"""
+        return self._cached(self._views, 'rgb',
+                            lambda: cv2.cvtColor(self._bgr, cv2.COLOR_BGR2RGB))
+
+    @property
+    def gray(self):
+        """Grayscale view, computed on first access"""
+        return self._cached(self._views, 'gray',
+                            lambda: cv2.cvtColor(self._bgr, cv2.COLOR_BGR2GRAY))
+
+    @property
+    def height(self):
+        return self._bgr.shape[0]
+
+    @property
+    def width(self):
+        return self._bgr.shape[1]
+
+    def memo(self, key, factory):
+        """
+        Return a derived artifact (OCR output, masks, ...), computing it
+        only the first time it is requested for this document
+
+        Args:
+            key: Artifact name
+            factory (callable): Builds the artifact when it is missing
+
+        Returns:
+            The cached artifact
+        """
+        return self._cached(self._artifacts, key, factory)
+
+    def has_memo(self, key):
+        """True if the artifact `key` has already been computed for this document"""
+        return key in self._artifacts
+
+    def _cached(self, store, key, factory):
+        """Build store[key] once, even when several threads ask at the same time"""
+        if key in store:
+            return store[key]
+        with self._lock:
+            key_lock = self._key_locks.setdefault((id(store), key), threading.Lock())
+        with key_lock:
+            if key not in store:
+                store[key] = factory()
+        return store[key]
+
+    def __repr__(self):
+        return f"DocumentImage(source={self.source!r}, size={self.width}x{self.height})"
@@ -4,70 +4,88 @@ Identifies text regions in documents to exclude from Copy-Move detection
 """
 
 import cv2
-import pytesseract
-
-# Configure Tesseract path (Windows)
-pytesseract.pytesseract.tesseract_cmd = r'C:\Program Files\Tesseract-OCR\tesseract.exe'
+from src.utils.document_image import DocumentImage
+from src.utils.ocr import get_ocr
+from src.utils.text_mask import TextMask
 
 
 class DocumentSegmenter:
     """Segments documents to identify text regions"""
     
-    def __init__(self):
-        """Initialize the segmenter"""
-        # Verify Tesseract is available
-        try:
-            pytesseract.get_tesseract_version()
-            print("✅ Tesseract found at:", pytesseract.pytesseract.tesseract_cmd)
-        except Exception as e:
-            print(f"❌ Tesseract not found: {e}")
-            raise
+    # Bump when a code change alters the text regions (invalidates cached results)
+    VERSION = 1
     
-    def get_text_regions(self, image_path, min_confidence=30):
+    def __init__(self, margin=5, min_confidence=30):
+        """
+        Initialize the segmenter
+        
+        Args:
+            margin (int): Default margin around text regions in the text mask
+            min_confidence (int): Default minimum OCR confidence for text regions
+        """
+        self.margin = margin
+        self.min_confidence = min_confidence
+        
+        # Tesseract is located on the first OCR call (src.utils.tesseract);
+        # if it is missing, segmentation is skipped for that document
+    
+    def get_config(self):
+        """Parameters that affect the text mask (part of cache keys)"""
+        return {'version': self.VERSION, 'margin': self.margin,
+                'min_confidence': self.min_confidence}
+    
+    def get_text_regions(self, image, min_confidence=30, ocr=None):
         """
         Detect text regions in document using OCR
         
         Args:
-            image_path (str): Path to document image
+            image (str or DocumentImage): Image path or already decoded document
             min_confidence (int): Minimum OCR confidence (0-100)
+            ocr (OCRResult): Precomputed OCR output (shared with font analysis)
             
         Returns:
             list: List of text bounding boxes as (x, y, w, h) tuples
         """
-        # Load image
-        img = cv2.imread(image_path)
-        if img is None:
-            return []
+        # Reuse the document's OCR pass (runs Tesseract only if not done yet)
+        if ocr is None:
+            try:
+                ocr = get_ocr(image)
+            except Exception as e:
+                print(f"⚠️  OCR failed: {e}")
+                return []
+            if ocr is None:
+                return []
         
-        # Convert to RGB for Tesseract
-        rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-        
-        # Get detailed OCR data
-        try:
-            data = pytesseract.image_to_data(rgb, output_type=pytesseract.Output.DICT)
-        except Exception as e:
-            print(f"⚠️  OCR failed: {e}")
-            return []
-        
-        # Extract text regions with sufficient confidence
-        text_regions = []
-        n_boxes = len(data['text'])
+        # Text regions with sufficient confidence and non-empty text
+        return ocr.boxes(min_confidence)
+    
+    def get_text_mask(self, image, margin=None, min_confidence=None, ocr=None):
+        """
+        Rasterized text exclusion mask, built once per document
         
-        for i in range(n_boxes):
-            # Only process entries with text and sufficient confidence
-            if int(data['conf'][i]) > min_confidence:
-                text = data['text'][i].strip()
-                if text:  # Non-empty text
-                    x = data['left'][i]
-                    y = data['top'][i]
-                    w = data['width'][i]
-                    h = data['height'][i]
-                    
-                    # Only add valid boxes
-                    if w > 0 and h > 0:
-                        text_regions.append((x, y, w, h))
+        Args:
+            image (str or DocumentImage): Image path or already decoded document
+            margin (int): Extra margin around every text region
+                          (default: self.margin)
+            min_confidence (int): Minimum OCR confidence (0-100)
+                                  (default: self.min_confidence)
+            ocr (OCRResult): Precomputed OCR output
+            
+        Returns:
+            TextMask: Mask shared by every detector that ignores text
+                      (None if the image could not be loaded)
+        """
+        document = DocumentImage.load(image)
+        if document is None:
+            return None
         
-        return text_regions
+        margin = self.margin if margin is None else margin
+        min_confidence = self.min_confidence if min_confidence is None else min_confidence
+        return document.memo(
+            ('text_mask', margin, min_confidence),
+            lambda: TextMask(document.gray.shape,
+                             self.get_text_regions(document, min_confidence, ocr=ocr),
+                             margin=margin))
     
     def visualize_text_regions(self, image_path, output_path='text_regions_debug.jpg'):
         """
@@ -77,11 +95,12 @@ class DocumentSegmenter:
             image_path (str): Path to document image
             output_path (str): Path to save visualization
         """
-        img = cv2.imread(image_path)
-        if img is None:
+        document = DocumentImage.load(image_path)
+        if document is None:
             return
         
-        text_regions = self.get_text_regions(image_path)
+        img = document.bgr.copy()
+        text_regions = self.get_text_regions(document)
         
         # Draw rectangles around text regions
         for x, y, w, h in text_regions:
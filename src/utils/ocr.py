@@ -0,0 +1,170 @@
+"""
+OCR Module
+Runs Tesseract once per document and shares the word-level result
+between segmentation and font analysis
+"""
+
+from src.utils.document_image import DocumentImage
+from src.utils.tesseract import get_pytesseract
+
+
+# Bump when a change alters OCR output (invalidates cached OCR results)
+OCR_VERSION = 1
+
+
+class OCRResult:
+    """
+    Word-level OCR output for one document
+
+    Keeps the raw columns of ``pytesseract.image_to_data`` (word boxes,
+    confidences and the page/block/paragraph/line hierarchy) so that every
+    stage can derive what it needs without calling Tesseract again.
+    """
+
+    COLUMNS = ('level', 'page_num', 'block_num', 'par_num', 'line_num',
+               'word_num', 'left', 'top', 'width', 'height', 'conf', 'text')
+
+    def __init__(self, data):
+        """
+        Args:
+            data (dict): Output of image_to_data(..., output_type=Output.DICT)
+        """
+        self.data = {column: list(data.get(column, [])) for column in self.COLUMNS}
+
+    @classmethod
+    def from_image(cls, rgb):
+        """
+        Run Tesseract on an RGB image
+
+        Args:
+            rgb (np.ndarray): RGB image
+
+        Returns:
+            OCRResult: Parsed OCR output
+        """
+        pytesseract = get_pytesseract()
+        data = pytesseract.image_to_data(rgb, output_type=pytesseract.Output.DICT)
+        return cls(data)
+
+    def __len__(self):
+        return len(self.data['text'])
+
+    def _is_confident(self, i, min_confidence):
+        """Same comparison the detectors have always used: int(conf) > min"""
+        return int(float(self.data['conf'][i])) > min_confidence
+
+    def boxes(self, min_confidence=30):
+        """
+        Bounding boxes of confidently recognised, non-empty words
+
+        Args:
+            min_confidence (int): Minimum OCR confidence (0-100)
+
+        Returns:
+            list: (x, y, w, h) tuples
+        """
+        boxes = []
+        for i in range(len(self)):
+            if not self._is_confident(i, min_confidence):
+                continue
+            if not str(self.data['text'][i]).strip():
+                continue
+            w, h = self.data['width'][i], self.data['height'][i]
+            if w > 0 and h > 0:
+                boxes.append((self.data['left'][i], self.data['top'][i], w, h))
+        return boxes
+
+    def heights(self, min_confidence=30):
+        """
+        Box heights of confident entries (used as a font-size proxy)
+
+        Args:
+            min_confidence (int): Minimum OCR confidence (0-100)
+
+        Returns:
+            list: Heights in pixels
+        """
+        return [self.data['height'][i] for i in range(len(self))
+                if self._is_confident(i, min_confidence) and self.data['height'][i] > 0]
+
+    def words(self, min_confidence=-1):
+        """
+        Recognised words with their box, confidence and line key
+
+        Args:
+            min_confidence (int): Minimum OCR confidence (0-100)
+
+        Returns:
+            list: dicts with text, box, conf and line
+        """
+        words = []
+        for i in range(len(self)):
+            text = str(self.data['text'][i]).strip()
+            if not text or not self._is_confident(i, min_confidence):
+                continue
+            words.append({
+                'text': text,
+                'box': (self.data['left'][i], self.data['top'][i],
+                        self.data['width'][i], self.data['height'][i]),
+                'conf': float(self.data['conf'][i]),
+                'line': self._line_key(i)
+            })
+        return words
+
+    def lines(self, min_confidence=-1):
+        """
+        Group words into text lines
+
+        Args:
+            min_confidence (int): Minimum OCR confidence (0-100)
+
+        Returns:
+            list: dicts with line key, merged box and words, in reading order
+        """
+        lines = {}
+        for word in self.words(min_confidence):
+            x, y, w, h = word['box']
+            line = lines.get(word['line'])
+            if line is None:
+                lines[word['line']] = {'line': word['line'], 'box': (x, y, w, h), 'words': [word]}
+                continue
+            lx, ly, lw, lh = line['box']
+            left, top = min(lx, x), min(ly, y)
+            right, bottom = max(lx + lw, x + w), max(ly + lh, y + h)
+            line['box'] = (left, top, right - left, bottom - top)
+            line['words'].append(word)
+        return list(lines.values())
+
+    def _line_key(self, i):
+        return (self.data['page_num'][i], self.data['block_num'][i],
+                self.data['par_num'][i], self.data['line_num'][i])
+
+    def to_dict(self):
+        """Plain dict (JSON serialisable) copy of the raw columns"""
+        return {column: list(values) for column, values in self.data.items()}
+
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuild from to_dict() output"""
+        return cls(data)
+
+
+def ocr_config():
+    """OCR settings that affect OCRResult contents (part of cache keys)"""
+    return {'version': OCR_VERSION, 'engine': 'tesseract', 'output': 'image_to_data'}
+
+
+def get_ocr(image):
+    """
+    OCR result for a document, computed at most once per DocumentImage
+
+    Args:
+        image (str or DocumentImage): Image path or already decoded document
+
+    Returns:
+        OCRResult: OCR output (None if the image could not be loaded)
+    """
+    document = DocumentImage.load(image)
+    if document is None:
+        return None
+    return document.memo('ocr', lambda: OCRResult.from_image(document.rgb))
@@ -0,0 +1,272 @@
+"""
+Result Cache Module
+Single-file SQLite cache for analysis results with size cap and LRU/TTL eviction
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key         TEXT PRIMARY KEY,
+    value       TEXT NOT NULL,
+    size        INTEGER NOT NULL,
+    created_at  REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_accessed_at ON entries (accessed_at);
+CREATE INDEX IF NOT EXISTS entries_created_at ON entries (created_at);
+
+-- Single-row counters kept in step with `entries` by the triggers below,
+-- so size / count / hit statistics never need a table scan
+CREATE TABLE IF NOT EXISTS meta (
+    id        INTEGER PRIMARY KEY CHECK (id = 0),
+    entries   INTEGER NOT NULL,
+    bytes     INTEGER NOT NULL,
+    hits      INTEGER NOT NULL,
+    misses    INTEGER NOT NULL,
+    evictions INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO meta VALUES (0, 0, 0, 0, 0, 0);
+
+CREATE TRIGGER IF NOT EXISTS entries_insert AFTER INSERT ON entries BEGIN
+    UPDATE meta SET entries = entries + 1, bytes = bytes + NEW.size WHERE id = 0;
+END;
+CREATE TRIGGER IF NOT EXISTS entries_delete AFTER DELETE ON entries BEGIN
+    UPDATE meta SET entries = entries - 1, bytes = bytes - OLD.size WHERE id = 0;
+END;
+CREATE TRIGGER IF NOT EXISTS entries_resize AFTER UPDATE OF size ON entries BEGIN
+    UPDATE meta SET bytes = bytes - OLD.size + NEW.size WHERE id = 0;
+END;
+"""
+
+
+class ResultCache:
+    """
+    Key -> JSON value store in one SQLite file
+
+    Every write is a transaction, so a crash never leaves a half-written
+    entry. When max_entries or max_bytes is exceeded, the least recently
+    used entries are evicted. Entries older than ttl seconds are treated
+    as missing. Entry count, payload size and lifetime hit / miss /
+    eviction counters are read from a one-row meta table in O(1).
+
+    Safe to share between threads of one process, and between processes
+    (SQLite file locking, WAL journal).
+    """
+
+    # Oldest entries examined per eviction round
+    EVICTION_BATCH = 64
+
+    def __init__(self, path, max_entries=None, max_bytes=None, ttl=None):
+        """
+        Args:
+            path (str): SQLite database file (created if missing)
+            max_entries (int): Maximum number of entries (None = unlimited)
+            max_bytes (int): Maximum total JSON payload size (None = unlimited)
+            ttl (float): Entry lifetime in seconds (None = never expires)
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False,
+                                     isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def get(self, key):
+        """
+        Look up an entry and mark it as recently used
+
+        Args:
+            key (str): Cache key
+
+        Returns:
+            The stored value, or None on a miss (or an expired entry)
+        """
+        now = time.time()
+        with self._transaction():
+            row = self._conn.execute(
+                "SELECT value, created_at FROM entries WHERE key = ?", (key,)).fetchone()
+
+            if row is not None and self.ttl is not None and row[1] < now - self.ttl:
+                self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                row = None
+
+            if row is None:
+                self._conn.execute("UPDATE meta SET misses = misses + 1 WHERE id = 0")
+                return None
+
+            self._conn.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.execute("UPDATE meta SET hits = hits + 1 WHERE id = 0")
+        return json.loads(row[0])
+
+    def put(self, key, value):
+        """
+        Store (or replace) an entry, then evict down to the configured limits
+
+        Args:
+            key (str): Cache key
+            value: JSON-serializable value
+        """
+        payload = json.dumps(value, separators=(',', ':'))
+        now = time.time()
+        with self._transaction():
+            self._conn.execute(
+                "INSERT INTO entries (key, value, size, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET value = excluded.value, "
+                "size = excluded.size, created_at = excluded.created_at, "
+                "accessed_at = excluded.accessed_at",
+                (key, payload, len(payload.encode('utf-8')), now, now))
+            self._evict(now)
+
+    def delete(self, key):
+        """Remove an entry if present"""
+        with self._transaction():
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+
+    def clear(self):
+        """
+        Remove every entry
+
+        Returns:
+            int: Number of entries removed
+        """
+        with self._transaction():
+            removed = self._conn.execute("DELETE FROM entries").rowcount
+        # Give the space back to the filesystem
+        with self._lock:
+            self._conn.execute("VACUUM")
+        return removed
+
+    def stats(self):
+        """
+        Returns:
+            dict: entries, bytes (JSON payload), hits, misses, evictions
+                  and file_bytes (database file on disk)
+        """
+        with self._lock:
+            entries, size, hits, misses, evictions = self._conn.execute(
+                "SELECT entries, bytes, hits, misses, evictions FROM meta WHERE id = 0").fetchone()
+        return {
+            'entries': entries,
+            'bytes': size,
+            'hits': hits,
+            'misses': misses,
+            'evictions': evictions,
+            'file_bytes': os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        }
+
+    def __len__(self):
+        return self.stats()['entries']
+
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
+
+    @contextmanager
+    def _transaction(self):
+        """Serialize access from this process and run the block as one write transaction"""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def _evict(self, now):
+        """Drop expired entries, then least recently used ones over the limits"""
+        evicted = 0
+        if self.ttl is not None:
+            evicted += self._conn.execute(
+                "DELETE FROM entries WHERE created_at < ?", (now - self.ttl,)).rowcount
+
+        while True:
+            entries, size = self._conn.execute(
+                "SELECT entries, bytes FROM meta WHERE id = 0").fetchone()
+            excess_entries = entries - self.max_entries if self.max_entries is not None else 0
+            excess_bytes = size - self.max_bytes if self.max_bytes is not None else 0
+            if excess_entries <= 0 and excess_bytes <= 0:
+                break
+
+            # Oldest entries first, just enough of them to get under both caps
+            oldest = self._conn.execute(
+                "SELECT key, size FROM entries ORDER BY accessed_at LIMIT ?",
+                (max(excess_entries, self.EVICTION_BATCH),)).fetchall()
+            victims = []
+            for key, entry_size in oldest:
+                if len(victims) >= excess_entries and excess_bytes <= 0:
+                    break
+                victims.append((key,))
+                excess_bytes -= entry_size
+            if not victims:
+                break
+            self._conn.executemany("DELETE FROM entries WHERE key = ?", victims)
+            evicted += len(victims)
+
+        if evicted:
+            self._conn.execute(
+                "UPDATE meta SET evictions = evictions + ? WHERE id = 0", (evicted,))
+
+
+def config_digest(config):
+    """
+    Short stable digest of a JSON-serializable configuration
+
+    Args:
+        config: Parameters (dicts are hashed with sorted keys)
+
+    Returns:
+        str: 16 hex characters
+    """
+    canonical = json.dumps(config, sort_keys=True, separators=(',', ':'))
+    return hashlib.blake2b(canonical.encode('utf-8'), digest_size=8).hexdigest()
+
+
+class StageCache:
+    """
+    Per-stage cache entries for one document
+
+    Entries are keyed by document content hash, stage name and a digest of
+    that stage's configuration (which includes code version constants and
+    the configuration of any stage it depends on). Changing one stage's
+    parameters therefore recomputes that stage and its dependents only.
+    """
+
+    def __init__(self, cache, content_hash):
+        """
+        Args:
+            cache (ResultCache): Backing store
+            content_hash (str): Digest of the document file
+        """
+        self.cache = cache
+        self.content_hash = content_hash
+
+    def key(self, stage, config):
+        """Cache key for one stage of this document"""
+        return f"stage:{stage}:{self.content_hash}:{config_digest(config)}"
+
+    def get(self, stage, config):
+        """Cached stage output, or None"""
+        return self.cache.get(self.key(stage, config))
+
+    def put(self, stage, config, value):
+        """Store a stage output"""
+        self.cache.put(self.key(stage, config), value)
@@ -0,0 +1,267 @@
+"""
+Result Sink Module
+Append-only JSONL / CSV output for batch results, written as they finish
+"""
+
+import csv
+import json
+import os
+
+from src.utils.timing import TimingStats
+
+
+# Extensions written as a stream (anything else is saved as one JSON document)
+STREAM_FORMATS = {'.jsonl': 'jsonl', '.ndjson': 'jsonl', '.csv': 'csv'}
+
+
+def stream_format(path):
+    """
+    Streaming format for an output path
+
+    Returns:
+        str: 'jsonl' or 'csv', or None if the path is not a stream format
+    """
+    return STREAM_FORMATS.get(os.path.splitext(str(path))[1].lower())
+
+
+class ResultSink:
+    """
+    Appends one record per result and flushes every flush_every records
+
+    Nothing is rewritten: a crash loses at most the records of the
+    unflushed chunk, and records from earlier runs stay in the file.
+    Subclasses define how a result becomes a line.
+    """
+
+    def __init__(self, path, flush_every=100, fsync=False):
+        """
+        Args:
+            path (str): Output file (appended to; created if missing)
+            flush_every (int): Records buffered before each write
+            fsync (bool): Also force each chunk to disk (slower, survives
+                          power loss, not just process crashes)
+        """
+        self.path = str(path)
+        self.flush_every = max(1, int(flush_every))
+        self.fsync = fsync
+        self.written = 0
+        self._pending = []
+
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        self._is_new = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+        self._file = open(self.path, 'a', encoding='utf-8', newline='')
+
+    def write(self, result):
+        """Queue one result; writes the chunk when it is full"""
+        self._pending.append(self._format(result))
+        if len(self._pending) >= self.flush_every:
+            self.flush()
+
+    def flush(self):
+        """Write queued records and flush them to the operating system"""
+        if self._pending:
+            self._file.write(''.join(self._pending))
+            self.written += len(self._pending)
+            self._pending = []
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+
+    def close(self):
+        """Flush and close the file"""
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _format(self, result):
+        raise NotImplementedError
+
+
+class JSONLSink(ResultSink):
+    """One compact JSON object per line (full results)"""
+
+    def _format(self, result):
+        return json.dumps(result, separators=(',', ':'), default=_to_builtin) + '\n'
+
+
+class CSVSink(ResultSink):
+    """
+    One row per result with the scalar fields in COLUMNS
+
+    Nested sections (timings, cached_stages, ...) are left out; use JSONL
+    to keep everything.
+    """
+
+    COLUMNS = ('file_path', 'file_hash', 'fraud_detected', 'confidence',
+               'ela_score', 'ela_suspicious', 'copymove_duplicates', 'copymove_suspicious',
+               'font_variation', 'font_suspicious', 'suspicious_count', 'tier',
+               'processing_time', 'processed_at', 'error')
+
+    def __init__(self, path, flush_every=100, fsync=False):
+        super().__init__(path, flush_every=flush_every, fsync=fsync)
+        self._row = _LineWriter()
+        if self._is_new:
+            self._file.write(self._row.line(self.COLUMNS))
+
+    def _format(self, result):
+        return self._row.line(['' if result.get(column) is None else result.get(column)
+                               for column in self.COLUMNS])
+
+
+class _LineWriter:
+    """csv.writer that returns each row as a string"""
+
+    def __init__(self):
+        self._buffer = []
+        self._writer = csv.writer(self)
+
+    def write(self, text):
+        self._buffer.append(text)
+
+    def line(self, row):
+        self._writer.writerow(row)
+        text = ''.join(self._buffer)
+        self._buffer = []
+        return text
+
+
+def _to_builtin(value):
+    """JSON fallback for numpy scalars"""
+    if hasattr(value, 'item'):
+        return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def open_sink(path, flush_every=100, fsync=False):
+    """
+    Sink for an output path, chosen by extension (.jsonl / .ndjson / .csv)
+
+    Returns:
+        ResultSink: Open sink
+
+    Raises:
+        ValueError: If the extension is not a streaming format
+    """
+    fmt = stream_format(path)
+    if fmt == 'jsonl':
+        return JSONLSink(path, flush_every=flush_every, fsync=fsync)
+    if fmt == 'csv':
+        return CSVSink(path, flush_every=flush_every, fsync=fsync)
+    raise ValueError(f"Not a streaming output format: {path} "
+                     f"(use one of {', '.join(sorted(STREAM_FORMATS))})")
+
+
+def read_results(path):
+    """
+    Stream results back from a JSONL or CSV sink file
+
+    A truncated last line (from a crash mid-write) is skipped.
+
+    Yields:
+        dict: One result per record
+    """
+    fmt = stream_format(path)
+    with open(path, encoding='utf-8', newline='') as f:
+        if fmt == 'csv':
+            for row in csv.DictReader(f):
+                yield _parse_csv_row(row)
+            return
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue
+
+
+def _parse_csv_row(row):
+    """Restore the types of a CSV row"""
+    result = {}
+    for column, text in row.items():
+        if text == '' or text is None:
+            result[column] = None
+        elif text in ('True', 'False'):
+            result[column] = text == 'True'
+        elif column in ('copymove_duplicates', 'suspicious_count'):
+            result[column] = int(text)
+        elif column in ('confidence', 'ela_score', 'font_variation', 'processing_time'):
+            result[column] = float(text)
+        else:
+            result[column] = text
+    return result
+
+
+class StreamSummary:
+    """
+    Batch statistics accumulated one result at a time
+
+    Memory does not grow with the number of results (stage timings go
+    into a bounded TimingStats histogram), so the summary of any sink
+    file can be rebuilt by reading it back through read_results().
+    """
+
+    def __init__(self):
+        self.total = 0
+        self.fraud_detected = 0
+        self.authentic = 0
+        self.errors = 0
+        self.processing_time = 0.0
+        self.tiers = {}
+        self.timing_stats = TimingStats()
+
+    def add(self, result):
+        """Account for one result"""
+        self.total += 1
+        if result.get('error'):
+            self.errors += 1
+            return
+        if result.get('fraud_detected'):
+            self.fraud_detected += 1
+        else:
+            self.authentic += 1
+        self.processing_time += result.get('processing_time') or 0.0
+        if result.get('tier'):
+            self.tiers[result['tier']] = self.tiers.get(result['tier'], 0) + 1
+        self.timing_stats.add(result.get('timings'))
+
+    def to_dict(self):
+        """
+        Returns:
+            dict: total_documents, total_processed, fraud_detected,
+                  authentic, errors, fraud_rate, processing_time, tiers
+                  and stage_timings
+        """
+        processed = self.fraud_detected + self.authentic
+        return {
+            'total_documents': self.total,
+            'total_processed': processed,
+            'fraud_detected': self.fraud_detected,
+            'authentic': self.authentic,
+            'errors': self.errors,
+            'fraud_rate': self.fraud_detected / processed * 100 if processed else 0.0,
+            'processing_time': self.processing_time,
+            'tiers': dict(self.tiers),
+            'stage_timings': self.timing_stats.summary()
+        }
+
+
+def summarize_file(path):
+    """
+    Summary of a JSONL / CSV results file, read as a stream
+
+    Returns:
+        dict: See StreamSummary.to_dict()
+    """
+    summary = StreamSummary()
+    for result in read_results(path):
+        summary.add(result)
+    return summary.to_dict()
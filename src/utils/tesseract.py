@@ -0,0 +1,82 @@
+"""
+Tesseract Module
+Locates the Tesseract executable on first use instead of at import time
+"""
+
+import os
+import shutil
+import threading
+
+
+# Checked in order when tesseract is not on PATH
+WINDOWS_PATHS = [
+    r'C:\Program Files\Tesseract-OCR\tesseract.exe',
+    r'C:\Program Files (x86)\Tesseract-OCR\tesseract.exe',
+    r'%LOCALAPPDATA%\Programs\Tesseract-OCR\tesseract.exe',
+]
+
+_lock = threading.Lock()
+_configured = False
+_tesseract_cmd = None
+
+
+def find_tesseract():
+    """
+    Locate the Tesseract executable
+
+    TESSERACT_CMD overrides the search; otherwise PATH is searched, then
+    the usual Windows installation directories.
+
+    Returns:
+        str: Path to the executable, or None if it was not found
+    """
+    override = os.environ.get('TESSERACT_CMD')
+    if override:
+        return override
+    found = shutil.which('tesseract')
+    if found:
+        return found
+    for path in WINDOWS_PATHS:
+        path = os.path.expandvars(path)
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def get_pytesseract():
+    """
+    pytesseract, imported and pointed at the Tesseract executable
+
+    Discovery runs once per process (on the first OCR call) and its
+    outcome is cached. When nothing is found, pytesseract keeps its
+    default command and reports the missing binary when OCR runs.
+
+    Returns:
+        module: The pytesseract module
+    """
+    global _configured, _tesseract_cmd
+    import pytesseract
+
+    if not _configured:
+        with _lock:
+            if not _configured:
+                _tesseract_cmd = find_tesseract()
+                if _tesseract_cmd:
+                    pytesseract.pytesseract.tesseract_cmd = _tesseract_cmd
+                _configured = True
+    return pytesseract
+
+
+def tesseract_status():
+    """
+    Describe the Tesseract installation (runs discovery if needed)
+
+    Returns:
+        dict: 'path' (str or None), 'version' (str or None) and 'error'
+    """
+    pytesseract = get_pytesseract()
+    try:
+        version = str(pytesseract.get_tesseract_version())
+        return {'path': pytesseract.pytesseract.tesseract_cmd, 'version': version, 'error': None}
+    except Exception as e:
+        return {'path': _tesseract_cmd, 'version': None, 'error': str(e)}
@@ -0,0 +1,76 @@
+"""
+Text Mask Module
+Rasterizes OCR text regions into a reusable exclusion mask
+"""
+
+import cv2
+import numpy as np
+
+
+class TextMask:
+    """
+    Binary mask of text pixels, dilated by a margin, plus its integral image
+
+    Built once per document from the segmenter output. Any detector can
+    then ask "does this window touch text?" in O(1) per window, or for a
+    whole grid of windows in one vectorized pass.
+    """
+
+    def __init__(self, shape, text_regions, margin=5):
+        """
+        Args:
+            shape (tuple): Image shape (height, width[, channels])
+            text_regions (list): List of (x, y, w, h) text boxes
+            margin (int): Extra margin around every text box
+        """
+        height, width = shape[:2]
+        self.margin = margin
+        self.num_regions = len(text_regions) if text_regions else 0
+        self.mask = np.zeros((height, width), dtype=np.uint8)
+
+        # Same extent as the old per-block test: the closed range
+        # [x - margin, x + w + margin] on both axes
+        for x, y, w, h in text_regions or []:
+            x0, y0 = max(x - margin, 0), max(y - margin, 0)
+            x1, y1 = min(x + w + margin + 1, width), min(y + h + margin + 1, height)
+            if x0 < x1 and y0 < y1:
+                self.mask[y0:y1, x0:x1] = 1
+
+        self.integral = cv2.integral(self.mask)
+
+    def count(self, x, y, w, h):
+        """
+        Number of masked pixels in windows [x, x+w) x [y, y+h)
+
+        Args:
+            x, y: Window top-left corners (scalars or broadcastable arrays)
+            w, h: Window size
+
+        Returns:
+            Masked pixel count per window (clipped to the image)
+        """
+        height, width = self.mask.shape
+        x0, y0 = np.clip(x, 0, width), np.clip(y, 0, height)
+        x1, y1 = np.clip(np.add(x, w), 0, width), np.clip(np.add(y, h), 0, height)
+        return (self.integral[y1, x1] - self.integral[y0, x1] -
+                self.integral[y1, x0] + self.integral[y0, x0])
+
+    def overlaps(self, x, y, w, h):
+        """True where a window touches any (dilated) text pixel"""
+        return self.count(x, y, w, h) > 0
+
+    def overlaps_grid(self, xs, ys, size):
+        """
+        Overlap test for every window on a grid
+
+        Args:
+            xs, ys: 1-D arrays of window left / top coordinates
+            size (int): Window side length
+
+        Returns:
+            np.ndarray: Boolean array of shape (len(ys), len(xs))
+        """
+        return self.overlaps(np.asarray(xs)[None, :], np.asarray(ys)[:, None], size, size)
+
+    def __len__(self):
+        return self.num_regions
@@ -0,0 +1,147 @@
+"""
+Stage Timing Module
+Per-stage wall-clock and CPU timings for the analysis pipeline
+"""
+
+import math
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+
+class StageTimer:
+    """
+    Collects wall and CPU time for the named stages of one analysis
+
+    CPU time is measured with time.thread_time(), i.e. for the thread that
+    ran the stage, so stages running concurrently on different threads
+    do not count each other's work. Work that OpenCV hands to its own
+    internal threads is not included in the CPU figure.
+    """
+
+    def __init__(self):
+        self.stages = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name):
+        """
+        Time the enclosed block as stage `name`
+
+        Repeated stages accumulate.
+        """
+        wall_start = time.perf_counter()
+        cpu_start = time.thread_time()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - wall_start, time.thread_time() - cpu_start)
+
+    def add(self, name, wall, cpu):
+        """Add wall / CPU seconds to a stage"""
+        with self._lock:
+            entry = self.stages.setdefault(name, {'wall': 0.0, 'cpu': 0.0})
+            entry['wall'] += wall
+            entry['cpu'] += cpu
+
+    def to_dict(self):
+        """
+        Returns:
+            dict: {stage: {'wall': seconds, 'cpu': seconds}} in the order
+                  the stages first ran
+        """
+        with self._lock:
+            return {name: dict(entry) for name, entry in self.stages.items()}
+
+
+def timed(timer, name):
+    """timer.stage(name), or a no-op context when timer is None"""
+    return timer.stage(name) if timer is not None else nullcontext()
+
+
+class TimingStats:
+    """
+    Aggregates the 'timings' section of many results in bounded memory
+
+    Count, totals and maximum are exact. Wall times are also counted in
+    log-spaced buckets (each GROWTH times wider than the last), so
+    percentiles are accurate to about half a bucket (0.5%) and memory
+    depends on the spread of the timings, not on how many were added.
+    Safe to share between threads.
+    """
+
+    PERCENTILES = (50, 90, 99)
+
+    # Bucket i holds wall times in (GROWTH^(i-1), GROWTH^i]; times outside
+    # [MIN_SECONDS, MAX_SECONDS] go to the first / last bucket
+    GROWTH = 1.01
+    MIN_SECONDS = 1e-6
+    MAX_SECONDS = 1e5
+
+    def __init__(self):
+        self.stages = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, seconds):
+        """Histogram bucket of a wall time"""
+        seconds = min(max(seconds, self.MIN_SECONDS), self.MAX_SECONDS)
+        return math.ceil(math.log(seconds) / math.log(self.GROWTH))
+
+    def add(self, timings):
+        """
+        Record one result's timings
+
+        Args:
+            timings (dict): {stage: {'wall': s, 'cpu': s}}
+        """
+        with self._lock:
+            for name, entry in (timings or {}).items():
+                self._add_stage(name, entry)
+
+    def _add_stage(self, name, entry):
+        """Fold one stage's timing into its totals and histogram"""
+        stage = self.stages.get(name)
+        if stage is None:
+            stage = self.stages[name] = {'count': 0, 'total_wall': 0.0, 'total_cpu': 0.0,
+                                         'min_wall': entry['wall'],
+                                         'max_wall': entry['wall'], 'buckets': {}}
+        stage['count'] += 1
+        stage['total_wall'] += entry['wall']
+        stage['total_cpu'] += entry['cpu']
+        stage['min_wall'] = min(stage['min_wall'], entry['wall'])
+        stage['max_wall'] = max(stage['max_wall'], entry['wall'])
+        bucket = self._bucket(entry['wall'])
+        stage['buckets'][bucket] = stage['buckets'].get(bucket, 0) + 1
+
+    def _percentile(self, stage, p):
+        """Nearest-rank percentile from the buckets (bucket midpoint, within min / max)"""
+        rank = max(1, math.ceil(p / 100 * stage['count']))
+        seen = 0
+        for bucket in sorted(stage['buckets']):
+            seen += stage['buckets'][bucket]
+            if seen >= rank:
+                break
+        value = self.GROWTH ** (bucket - 0.5)
+        return min(max(value, stage['min_wall']), stage['max_wall'])
+
+    def summary(self):
+        """
+        Returns:
+            dict: {stage: {'count', 'total_wall', 'total_cpu',
+                           'p50_wall', 'p90_wall', 'p99_wall', 'max_wall'}}
+        """
+        summary = {}
+        with self._lock:
+            stages = {name: dict(stage, buckets=dict(stage['buckets']))
+                      for name, stage in self.stages.items()}
+        for name, stage in stages.items():
+            entry = {
+                'count': stage['count'],
+                'total_wall': float(stage['total_wall']),
+                'total_cpu': float(stage['total_cpu']),
+            }
+            for p in self.PERCENTILES:
+                entry[f'p{p}_wall'] = float(self._percentile(stage, p))
+            entry['max_wall'] = float(stage['max_wall'])
+            summary[name] = entry
+        return summary
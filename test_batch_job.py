@@ -0,0 +1,124 @@
+"""
+Batch Job Test
+An interrupted job resumes where it stopped and retries its failures
+"""
+
+import glob
+import json
+import os
+
+import pytesseract
+from test_shared_ocr import FAKE_OCR
+from src.batch_processor import BatchProcessor
+from src.utils.batch_job import BatchJob
+
+
+class Crash(BaseException):
+    """Stands in for the process being killed mid-batch"""
+
+
+def test_job_resumes_without_redoing_work(monkeypatch, tmp_path):
+    """Finished documents are never dispatched again; failures are retried up to max_attempts"""
+    monkeypatch.setattr(pytesseract, 'image_to_data', lambda image, output_type=None: FAKE_OCR)
+    monkeypatch.setattr(pytesseract, 'get_tesseract_version', lambda: '5.0')
+
+    documents = [os.path.abspath(path) for path in sorted(glob.glob('data/sample_documents/*.jpg'))[:4]]
+    documents.append(str(tmp_path / 'missing.jpg'))
+    job = BatchJob.create(documents, jobs_dir=tmp_path, job_id='nightly', max_attempts=2)
+    processor = BatchProcessor(use_cache=False)
+
+    # Interrupt the first run after two documents
+    dispatched = []
+    crash_at = [3]
+    analyze = processor.process_single
+
+    def process_single(file_path, verbose=False):
+        dispatched.append(file_path)
+        if len(dispatched) == crash_at[0]:
+            crash_at[0] = None
+            raise Crash
+        return analyze(file_path, verbose=verbose)
+
+    monkeypatch.setattr(processor, 'process_single', process_single)
+    try:
+        processor.process_job(job, show_progress=False)
+    except Crash:
+        pass
+
+    # A crash mid-write leaves half a line behind; reopening drops it
+    with open(job.journal_path, 'a') as f:
+        f.write('{"index": 2, "sta')
+    job = BatchJob.open('nightly', jobs_dir=tmp_path)
+    assert job.progress() == {'total': 5, 'done': 2, 'failed': 0, 'retrying': 0, 'pending': 3}
+
+    dispatched.clear()
+    progress = processor.process_job(job, show_progress=False)
+    assert dispatched == documents[2:]
+    assert progress == {'total': 5, 'done': 4, 'failed': 0, 'retrying': 1, 'pending': 0}
+
+    # Only the failure is retried, and then it is out of attempts
+    dispatched.clear()
+    progress = BatchProcessor(use_cache=False).process_job(BatchJob.open('nightly', jobs_dir=tmp_path),
+                                                           show_progress=False)
+    assert progress['failed'] == 1 and progress['done'] == 4
+    assert BatchJob.open('nightly', jobs_dir=tmp_path).finished
+
+    # Exports hold the latest result of each document once
+    results = list(job.results())
+    assert sorted(r['file_path'] for r in results) == sorted(documents)
+    assert job.export(str(tmp_path / 'out.jsonl')) == 5
+    assert job.export(str(tmp_path / 'out.json')) == 5
+    assert job.export(str(tmp_path / 'out.json')) == 5  # its own output is rewritten
+
+    # The JSON export keeps save_results()' statistics next to the job's progress
+    with open(tmp_path / 'out.json') as f:
+        exported = json.load(f)
+    assert exported['statistics']['total_processed'] == 4
+    assert exported['statistics']['errors'] == 1
+    assert exported['progress']['done'] == 4 and exported['job_id'] == 'nightly'
+
+    # Files the job did not write are only replaced on request
+    other = tmp_path / 'report.csv'
+    other.write_text('keep me')
+    try:
+        job.export(str(other))
+        assert False, "an unrelated file should not be overwritten"
+    except FileExistsError:
+        pass
+    assert other.read_text() == 'keep me'
+    assert job.export(str(other), overwrite=True) == 5
+
+
+def test_local_fallback_continues_after_daemon(monkeypatch, tmp_path):
+    """If the daemon drops mid-job, the CLI does not redo what it already journaled"""
+    import truthlens_cli
+    monkeypatch.setattr(pytesseract, 'image_to_data', lambda image, output_type=None: FAKE_OCR)
+    monkeypatch.setattr(pytesseract, 'get_tesseract_version', lambda: '5.0')
+
+    documents = [os.path.abspath(path) for path in sorted(glob.glob('data/sample_documents/*.jpg'))[:4]]
+    job = BatchJob.create(documents, jobs_dir=tmp_path, job_id='nightly',
+                          settings={'use_cache': False})
+
+    def daemon_request(command, **params):
+        # The daemon finishes two documents, then the connection drops
+        daemon_job = BatchJob(params['job_dir'])
+        for index in (0, 1):
+            daemon_job.record(index, {'file_path': documents[index], 'fraud_detected': False,
+                                      'confidence': 10.0})
+        daemon_job.close()
+        return None
+
+    dispatched = []
+    analyze = BatchProcessor.process_single
+
+    def process_single(self, file_path, verbose=False):
+        dispatched.append(file_path)
+        return analyze(self, file_path, verbose=verbose)
+
+    monkeypatch.setattr(truthlens_cli, '_daemon_request', daemon_request)
+    monkeypatch.setattr(BatchProcessor, 'process_single', process_single)
+    truthlens_cli._run_job(job, use_daemon=True)
+
+    assert dispatched == documents[2:]
+    entries = [json.loads(line) for line in open(job.journal_path)]
+    assert sorted(entry['index'] for entry in entries) == [0, 1, 2, 3]
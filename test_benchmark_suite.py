@@ -0,0 +1,35 @@
+"""
+Benchmark Suite Test
+Suite results have the expected shape and compare mode flags regressions
+"""
+
+import copy
+
+from benchmarks.benchmark_suite import SCHEMA_VERSION, compare, run_suite
+
+
+def test_suite_and_compare(tmp_path):
+    """A run compares clean against itself; a slowed-down copy is flagged"""
+    report = run_suite(['decode', 'ela'], [72], count=2, warmup=1, repetitions=2,
+                       corpus_dir=str(tmp_path), show_progress=False)
+
+    assert report['schema_version'] == SCHEMA_VERSION
+    assert report['machine']['cpu_count']
+    assert set(report['results']) == {'decode@72dpi', 'ela@72dpi'}
+    stats = report['results']['ela@72dpi']
+    assert stats['samples'] == 4
+    assert stats['min'] <= stats['p50'] <= stats['p95'] <= stats['max']
+    assert stats['peak_mb'] > 0
+
+    assert all(row['status'] == 'ok' for row in compare(report, report))
+
+    slower = copy.deepcopy(report)
+    for stats in slower['results'].values():
+        stats['p50'] = stats['p50'] * 2 + 0.01
+    rows = compare(report, slower, tolerance=0.10)
+    flagged = {row['key'] for row in rows if row['status'] == 'regression'}
+    assert flagged == {'decode@72dpi', 'ela@72dpi'}
+    assert all(row['metric'] == 'p50' for row in rows if row['status'] == 'regression')
+
+    # The other direction reads as an improvement
+    assert any(row['status'] == 'improvement' for row in compare(slower, report))
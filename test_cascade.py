@@ -0,0 +1,118 @@
+"""
+Detector Cascade Test
+Early exit must never change the verdict, and skipped detectors are marked
+"""
+
+import glob
+
+import pytesseract
+from test_shared_ocr import FAKE_OCR
+from src.fraud_detector import FraudDetector
+
+
+# Same words as FAKE_OCR in one font size: font analysis votes clean
+UNIFORM_OCR = dict(FAKE_OCR, height=[200, 20, 20, 20, 20])
+
+
+def test_cascade_matches_full_evidence(monkeypatch):
+    """Same verdicts as the full analysis; skipped detectors have no score"""
+    monkeypatch.setattr(pytesseract, 'image_to_data', lambda image, output_type=None: UNIFORM_OCR)
+    monkeypatch.setattr(pytesseract, 'get_tesseract_version', lambda: '5.0')
+
+    full = FraudDetector()
+    cascade = FraudDetector(cascade=True)
+    documents = sorted(glob.glob('data/sample_documents/*.jpg'))
+
+    skipped_total = 0
+    for path in documents:
+        expected = full.analyze_document(path, verbose=False)
+        result = cascade.analyze_document(path, verbose=False)
+
+        assert result['fraud_detected'] == expected['fraud_detected'], path
+        assert expected['skipped_detectors'] == []
+        for stage, field in (('ela', 'ela_score'), ('copymove', 'copymove_duplicates'),
+                             ('font', 'font_variation')):
+            if stage in result['skipped_detectors']:
+                assert result[field] is None
+            else:
+                assert result[field] == expected[field]
+        skipped_total += len(result['skipped_detectors'])
+
+    # Clean ELA and clean fonts decide the vote without copy-move
+    assert skipped_total > 0
+    print(f"   ✅ {skipped_total} detector runs skipped over {len(documents)} documents")
+
+
+def test_cascade_runs_cheapest_first(monkeypatch):
+    """Measured costs decide the order; OCR cost counts against its consumers"""
+    monkeypatch.setattr(pytesseract, 'image_to_data', lambda image, output_type=None: FAKE_OCR)
+    monkeypatch.setattr(pytesseract, 'get_tesseract_version', lambda: '5.0')
+
+    detector = FraudDetector(use_segmentation=False, cascade=True)
+    monkeypatch.setattr(detector, '_record_cost', lambda step, seconds: None)
+    path = 'data/sample_documents/bank_statement_authentic.jpg'
+
+    # Every detector votes clean, so the order alone decides what is skipped
+    order = []
+
+    def clean(stage, output):
+        def run(*args):
+            order.append(stage)
+            return output
+        return run
+
+    monkeypatch.setattr(detector, '_run_ela', clean('ela', 0.0))
+    monkeypatch.setattr(detector, '_run_copymove', clean(
+        'copymove', {'num_duplicates': 0, 'text_regions_excluded': 0, 'clusters': [], 'regions': []}))
+    monkeypatch.setattr(detector, '_analyze_fonts', clean('font', detector.font_analyzer._empty_result()))
+
+    # Clean ELA first, then clean copy-move decide the vote: font never runs
+    detector.stage_costs = {'ela': 0.01, 'copymove': 0.1, 'ocr': 5.0, 'font': 0.01}
+    result = detector.analyze_document(path, verbose=False)
+    assert order == ['ela', 'copymove']
+    assert result['skipped_detectors'] == ['font']
+    assert 'font_ocr' not in result['timings']
+    assert result['fraud_detected'] is False
+
+    # Expensive ELA goes last and is skipped when the others agree
+    order.clear()
+    detector.stage_costs = {'ela': 9.0, 'copymove': 0.1, 'ocr': 0.0, 'font': 0.01}
+    result = detector.analyze_document(path, verbose=False)
+    assert order == ['font', 'copymove']
+    assert result['skipped_detectors'] == ['ela']
+    assert 'ela' not in result['timings']
+    assert result['fraud_detected'] is False
+
+
+def test_cascade_learns_only_real_ocr_cost(monkeypatch, tmp_path):
+    """OCR served from the document memo or the stage cache is not an OCR cost sample"""
+    from src.utils.document_image import DocumentImage
+    from src.utils.ocr import get_ocr
+    from src.utils.result_cache import ResultCache, StageCache
+
+    monkeypatch.setattr(pytesseract, 'image_to_data', lambda image, output_type=None: UNIFORM_OCR)
+    monkeypatch.setattr(pytesseract, 'get_tesseract_version', lambda: '5.0')
+
+    detector = FraudDetector(cascade=True)
+    samples = []
+    monkeypatch.setattr(detector, '_record_cost', lambda step, seconds: samples.append(step))
+    monkeypatch.setattr(detector, '_run_ela', lambda document, timer: 0.0)  # OCR is always needed
+    path = 'data/sample_documents/advanced_bank_authentic.jpg'
+
+    detector.analyze_document(path, verbose=False)
+    assert samples.count('ocr') == 1
+
+    # OCR already memoised on the decoded document
+    samples.clear()
+    document = DocumentImage.load(path)
+    get_ocr(document)
+    detector.analyze_document(document, verbose=False)
+    assert 'ocr' not in samples and samples
+
+    # OCR from the stage cache
+    samples.clear()
+    stage_cache = StageCache(ResultCache(str(tmp_path / 'cache.sqlite3')), 'document')
+    stage_cache.put('ocr', detector.get_config()['ocr'], get_ocr(path).to_dict())
+    result = detector.analyze_document(path, verbose=False, stage_cache=stage_cache)
+    assert 'ocr' in result['cached_stages']
+    assert 'ocr' not in samples and samples
@@ -0,0 +1,244 @@
+"""
+Copy-Move Engine Test
+The vectorized copy-move engine must reproduce the original per-block results
+"""
+
+import glob
+import numpy as np
+import cv2
+from src.cv_module.copymove_detector import CopyMoveDetector
+
+
+def _test_images():
+    """A few sample documents plus random noise / posterised images"""
+    images = [cv2.imread(p, cv2.IMREAD_GRAYSCALE)
+              for p in sorted(glob.glob('data/sample_documents/*_fake.jpg'))[:3]]
+    rng = np.random.default_rng(7)
+    for shape in [(100, 120), (33, 33), (250, 301)]:
+        images.append(rng.integers(0, 256, shape, dtype=np.uint8))
+        images.append((rng.integers(0, 4, shape) * 60).astype(np.uint8))
+    return images
+
+
+def test_vectorized_block_extraction():
+    """_extract_blocks matches the per-block reference loop"""
+    print("\n" + "="*70)
+    print("🧪 TESTING VECTORIZED BLOCK EXTRACTION")
+    print("="*70)
+
+    text_regions = [(30, 40, 50, 20), (0, 0, 5, 5), (200, 300, 100, 10)]
+
+    for block_size in [8, 16, 24, 32]:
+        detector = CopyMoveDetector(block_size=block_size)
+        detector.STRIPE_PIXELS = 5000  # force several stripes
+        for img in _test_images():
+            for regions in [None, text_regions]:
+                fast = detector._extract_blocks(img, regions)
+                reference = detector._extract_blocks_reference(img, regions)
+
+                assert list(fast) == list(reference)
+                for position, features in fast.items():
+                    assert np.allclose(features, reference[position], rtol=0, atol=1e-9)
+                    if block_size in (8, 16, 32):
+                        # Exact integer sums: bit-identical to np.std
+                        assert features == tuple(reference[position])
+
+        print(f"   ✅ block_size={block_size}: identical block sets")
+
+
+def test_bucketed_matching_matches_brute_force():
+    """Bucketed matching returns exactly the brute-force pairs, in order"""
+    print("\n" + "="*70)
+    print("🧪 TESTING BUCKETED BLOCK MATCHING")
+    print("="*70)
+
+    detector = CopyMoveDetector()
+    detector.MATCH_CHUNK = 997  # force many chunks
+
+    for img in _test_images():
+        positions, features = detector._block_features(img)
+        fast = detector._match_blocks(positions, features)
+        reference = detector._match_blocks_brute(positions, features)
+        assert fast == reference
+        print(f"   ✅ {len(positions)} blocks -> {len(fast)} pairs")
+
+    # Features on a half-step lattice hit the tolerance boundaries exactly
+    rng = np.random.default_rng(3)
+    for _ in range(10):
+        cells = rng.choice(2500, 300, replace=False)
+        positions = np.stack(np.unravel_index(cells, (50, 50)), axis=1) * 8
+        features = np.round(rng.uniform(0, 30, (300, 3)) * 2) / 2
+        assert (detector._match_blocks(positions, features) ==
+                detector._match_blocks_brute(positions, features))
+
+    # Both modes are selectable through the constructor
+    brute = CopyMoveDetector(match_mode='brute')
+    img = _test_images()[-1]
+    assert brute.detect(cv2.cvtColor(img, cv2.COLOR_GRAY2BGR))['num_duplicates'] == \
+        detector.detect(cv2.cvtColor(img, cv2.COLOR_GRAY2BGR))['num_duplicates']
+
+
+
+def test_text_mask_matches_region_scan():
+    """Mask-based exclusion agrees with _is_in_text_region for every block"""
+    from src.utils.text_mask import TextMask
+
+    rng = np.random.default_rng(5)
+    height, width = 240, 320
+    regions = [(int(x), int(y), int(w), int(h)) for x, y, w, h in
+               zip(rng.integers(-10, width, 40), rng.integers(-10, height, 40),
+                   rng.integers(1, 60, 40), rng.integers(1, 25, 40))]
+    mask = TextMask((height, width), regions)
+
+    for block_size in [8, 16]:
+        detector = CopyMoveDetector(block_size=block_size)
+        xs = np.arange(0, width - block_size, block_size // 2)
+        ys = np.arange(0, height - block_size, block_size // 2)
+        grid = mask.overlaps_grid(xs, ys, block_size + 1)
+        for r, y in enumerate(ys):
+            for c, x in enumerate(xs):
+                assert grid[r, c] == detector._is_in_text_region(int(x), int(y), regions)
+
+    assert len(mask) == len(regions)
+    print(f"   ✅ {len(regions)} regions: mask lookup matches region scan")
+
+
+def test_aggregate_output_matches_pairs():
+    """Aggregate output summarises exactly the pairs the pair output lists"""
+    from collections import Counter
+
+    print("\n" + "="*70)
+    print("🧪 TESTING AGGREGATE COPY-MOVE OUTPUT")
+    print("="*70)
+
+    pairs = CopyMoveDetector()
+    aggregate = CopyMoveDetector(output='aggregate', top_k=5)
+    aggregate.MATCH_CHUNK = 997  # accumulate over many chunks
+
+    for img in _test_images():
+        bgr = cv2.cvtColor(img, cv2.COLOR_GRAY2BGR)
+        listed, summary = pairs.detect(bgr), aggregate.detect(bgr)
+        assert 'duplicate_pairs' not in summary
+        assert summary['num_duplicates'] == listed['num_duplicates']
+        assert summary['candidate_pairs'] == listed['candidate_pairs']
+        assert sum(map(sum, summary['shift_histogram']['counts'])) == listed['num_duplicates']
+
+        # Group the listed pairs by shift (pointing down, or right on a row)
+        groups = {}
+        for (x1, y1), (x2, y2) in listed['duplicate_pairs']:
+            if (y2 - y1, x2 - x1) < (0, 0):
+                (x1, y1), (x2, y2) = (x2, y2), (x1, y1)
+            groups.setdefault((x2 - x1, y2 - y1), []).append((x1, y1))
+        counts = Counter({shift: len(sources) for shift, sources in groups.items()})
+        assert summary['num_shifts'] == len(groups)
+
+        expected = sorted(counts.items(), key=lambda item: -item[1])
+        assert [c['count'] for c in summary['clusters']] == [n for _, n in expected[:5]]
+        for cluster in summary['clusters']:
+            sources = np.array(groups[tuple(cluster['shift'])])
+            x, y = sources.min(axis=0)
+            w, h = sources.max(axis=0) - (x, y) + pairs.block_size
+            assert cluster['source_bbox'] == [x, y, w, h]
+            assert cluster['target_bbox'] == [x + cluster['shift'][0], y + cluster['shift'][1], w, h]
+        print(f"   ✅ {listed['num_duplicates']} pairs -> {len(groups)} shifts")
+
+    # Brute-force matching aggregates to the same totals
+    brute = CopyMoveDetector(match_mode='brute', output='aggregate', top_k=5)
+    bgr = cv2.cvtColor(_test_images()[-1], cv2.COLOR_GRAY2BGR)
+    assert brute.detect(bgr)['clusters'] == aggregate.detect(bgr)['clusters']
+
+
+def test_shift_regions_find_pasted_patch(tmp_path):
+    """A pasted patch comes out as one region with its shift, among textured noise"""
+    print("\n" + "="*70)
+    print("🧪 TESTING SHIFT-VECTOR REGIONS")
+    print("="*70)
+
+    rng = np.random.default_rng(11)
+    img = cv2.GaussianBlur(rng.normal(0, 1, (300, 400)), (0, 0), 6)
+    img = (img - img.min()) / (img.max() - img.min()) * 200 + 25 + rng.normal(0, 25, img.shape)
+    img = np.clip(img, 0, 255).astype(np.uint8)
+    img[200:264, 240:336] = img[40:104, 48:144]
+    path = str(tmp_path / 'pasted.jpg')
+    cv2.imwrite(path, cv2.cvtColor(img, cv2.COLOR_GRAY2BGR), [cv2.IMWRITE_JPEG_QUALITY, 100])
+
+    detector = CopyMoveDetector(output='aggregate', top_k=5)
+    result = detector.detect(path, visualize=True)
+    top = result['regions'][0]
+    assert top['shift'] == [192, 160]
+    x, y, w, h = top['source_bbox']
+    assert x <= 48 and y <= 40 and x + w >= 144 and y + h >= 104
+    assert top['target_bbox'] == [x + 192, y + 160, w, h]
+    assert top['support'] > 50
+    assert (tmp_path / 'pasted_copymove.jpg').exists()
+
+    # A shift's regions never claim more pairs than were matched at that shift
+    clusters = {tuple(c['shift']): c['count'] for c in result['clusters']}
+    for region in result['regions']:
+        shift = tuple(region['shift'])
+        if shift in clusters:
+            supports = sum(r['support'] for r in result['regions'] if tuple(r['shift']) == shift)
+            assert supports <= clusters[shift]
+    print(f"   ✅ {result['num_duplicates']} pairs -> pasted region {top['source_bbox']} "
+          f"(support {top['support']})")
+
+
+def test_dct_engine():
+    """DCT descriptors match cv2.dct and sorted-neighbour matching finds a pasted patch"""
+    print("\n" + "="*70)
+    print("🧪 TESTING DCT COPY-MOVE ENGINE")
+    print("="*70)
+
+    detector = CopyMoveDetector(engine='dct')
+    detector.STRIPE_PIXELS = 5000  # several chunks
+    img = _test_images()[0]
+    positions, _ = detector._block_features(img)
+    descriptors = detector._dct_features(img, positions)
+    size, k = detector.block_size, detector.DCT_SIZE
+    for x, y in positions[::97].tolist():
+        row = np.flatnonzero((positions == (x, y)).all(axis=1))[0]
+        reference = cv2.dct(img[y:y + size, x:x + size].astype(np.float32))[:k, :k] / size
+        assert np.abs(descriptors[row] - reference.ravel() / detector.DCT_QUANTIZATION).max() <= 0.5 + 1e-3
+
+    # With a window spanning every block, sorted matching is all-pairs matching
+    small = _test_images()[-1]
+    positions, _ = detector._block_features(small)
+    features = detector._dct_features(small, positions)
+    i, j = np.triu_indices(len(positions), 1)
+    keep = detector._is_match(positions, features, i, j)
+    every = set(zip(map(tuple, positions[i[keep]].tolist()), map(tuple, positions[j[keep]].tolist())))
+    windowed = set(detector._match_blocks(positions, features))
+    detector.SORT_WINDOW = len(positions)
+    assert windowed <= set(detector._match_blocks(positions, features)) == every
+    print(f"   ✅ {len(windowed)} of {len(every)} matching pairs within the default window")
+
+    # A grid-aligned pasted patch on textured background
+    rng = np.random.default_rng(11)
+    img = cv2.GaussianBlur(rng.normal(0, 1, (300, 400)), (0, 0), 6)
+    img = (img - img.min()) / (img.max() - img.min()) * 200 + 25 + rng.normal(0, 25, img.shape)
+    img = np.clip(img, 0, 255).astype(np.uint8)
+    img[200:264, 240:336] = img[40:104, 48:144]
+    bgr = cv2.cvtColor(img, cv2.COLOR_GRAY2BGR)
+    result = CopyMoveDetector(engine='dct', output='aggregate').detect(bgr)
+    stats = CopyMoveDetector(output='aggregate').detect(bgr)
+    assert result['regions'][0]['shift'] == [192, 160]
+    assert result['candidate_pairs'] < stats['candidate_pairs']
+    assert result['num_duplicates'] < stats['num_duplicates']
+    assert CopyMoveDetector(engine='dct').get_config() != CopyMoveDetector().get_config()
+
+    for kwargs in ({'engine': 'sift'}, {'engine': 'dct', 'match_mode': 'brute'}):
+        try:
+            CopyMoveDetector(**kwargs)
+            assert False, kwargs
+        except ValueError:
+            pass
+    print(f"   ✅ pasted patch found; {result['candidate_pairs']:,} vs "
+          f"{stats['candidate_pairs']:,} pairs compared")
+
+
+if __name__ == "__main__":
+    test_vectorized_block_extraction()
+    test_bucketed_matching_matches_brute_force()
+    test_text_mask_matches_region_scan()
+    test_aggregate_output_matches_pairs()
+    test_dct_engine()
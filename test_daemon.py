@@ -0,0 +1,141 @@
+"""
+Analysis Daemon Test
+Requests over the socket return the same results as in-process analysis
+"""
+
+import os
+import threading
+import time
+
+import pytesseract
+from test_shared_ocr import FAKE_OCR
+from src import daemon
+from src.fraud_detector import FraudDetector
+from src.utils.batch_job import BatchJob
+
+
+DOCS = [os.path.abspath('data/sample_documents/advanced_bank_fake.jpg'),
+        os.path.abspath('data/sample_documents/advanced_bank_authentic.jpg')]
+
+
+def test_daemon_round_trip(monkeypatch, tmp_path):
+    """analyze and job requests match direct analysis; shutdown removes the socket"""
+    monkeypatch.setattr(pytesseract, 'image_to_data', lambda image, output_type=None: FAKE_OCR)
+    monkeypatch.setattr(pytesseract, 'get_tesseract_version', lambda: '5.0')
+
+    socket_path = str(tmp_path / 'truthlens.sock')
+    assert daemon.connect(socket_path) is None
+
+    server = daemon.AnalysisDaemon(socket_path, cache_dir=str(tmp_path / 'cache'))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        for _ in range(100):
+            client = daemon.connect(socket_path)
+            if client is not None:
+                break
+            time.sleep(0.1)
+        assert client is not None
+        assert os.stat(socket_path).st_mode & 0o777 == 0o600  # bound under a private umask
+
+        expected = FraudDetector().analyze_document(DOCS[0], verbose=False)
+        result = client.request('analyze', path=DOCS[0])
+        assert result['confidence'] == expected['confidence']
+        assert result['copymove_duplicates'] == expected['copymove_duplicates']
+
+        job = BatchJob.create(DOCS, jobs_dir=tmp_path / 'jobs', job_id='nightly')
+        reply = client.request('job', job_dir=job.job_dir)
+        assert reply['progress']['done'] == 2
+        assert reply['statistics']['total_processed'] == 2
+        assert reply['statistics']['cache_hits'] == 1  # first document was analyzed above
+        assert 'BATCH PROCESSING COMPLETE' in reply['summary']
+        job.reload()
+        assert job.export(str(tmp_path / 'results.json')) == 2
+
+        try:
+            client.request('batch', paths=DOCS)
+            assert False, "batch is not a daemon command"
+        except daemon.DaemonError as e:
+            assert 'Unknown command' in str(e)
+
+        try:
+            client.request('analyze', path=str(tmp_path / 'missing.jpg'))
+            assert False, "missing file should be reported"
+        except daemon.DaemonError as e:
+            assert 'FileNotFoundError' in str(e)
+
+        client.request('shutdown')
+        thread.join(timeout=10)
+        assert not thread.is_alive()
+        assert not os.path.exists(socket_path)
+        assert server._processors == {}  # thread pools and caches released
+        print("   ✅ Daemon served analyze and job requests")
+    finally:
+        if thread.is_alive():
+            server._server.shutdown()
+
+
+def test_analyze_during_job_keeps_job_statistics(monkeypatch, tmp_path):
+    """Single analyses served while a job runs do not count towards its statistics"""
+    monkeypatch.setattr(pytesseract, 'image_to_data', lambda image, output_type=None: FAKE_OCR)
+    monkeypatch.setattr(pytesseract, 'get_tesseract_version', lambda: '5.0')
+
+    server = daemon.AnalysisDaemon(str(tmp_path / 'truthlens.sock'), cache_dir=str(tmp_path / 'cache'))
+    batch_processor = server._processor({}, batch=True)
+    assert batch_processor is not server._processor({})
+
+    # Another connection asks for a single analysis while the job runs
+    analyze = batch_processor.process_single
+
+    def process_single(file_path, verbose=False):
+        server.handle({'command': 'analyze', 'path': DOCS[1]})
+        return analyze(file_path, verbose=verbose)
+
+    monkeypatch.setattr(batch_processor, 'process_single', process_single)
+    job = BatchJob.create(DOCS[:1], jobs_dir=tmp_path / 'jobs', job_id='single')
+    reply = server.handle({'command': 'job', 'job_dir': job.job_dir})
+
+    statistics = reply['statistics']
+    assert statistics['total_processed'] == 1
+    assert statistics['cache_misses'] == 1 and statistics['cache_hits'] == 0
+    assert statistics['stage_timings']['ela']['count'] == 1
+
+
+def test_socket_is_private(monkeypatch, tmp_path):
+    """The default socket lives in a 0700 directory; sockets of other users are ignored"""
+    monkeypatch.delenv('TRUTHLENS_SOCKET', raising=False)
+    monkeypatch.setenv('XDG_RUNTIME_DIR', str(tmp_path))
+
+    socket_path = daemon.default_socket_path()
+    directory = os.path.dirname(socket_path)
+    assert directory == str(tmp_path / 'truthlens')
+    assert os.stat(directory).st_mode & 0o777 == 0o700
+
+    # A directory others can enter is refused, by the server and the clients
+    os.chmod(directory, 0o755)
+    try:
+        daemon.default_socket_path()
+        assert False, "a shared socket directory should be refused"
+    except PermissionError:
+        pass
+    assert daemon.connect() is None
+    os.chmod(directory, 0o700)
+
+    # A socket answering pings is still not trusted if another user owns it
+    server = daemon.AnalysisDaemon(socket_path, cache_dir=str(tmp_path / 'cache'))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        for _ in range(100):
+            if daemon.connect() is not None:
+                break
+            time.sleep(0.1)
+        assert daemon.connect() is not None
+
+        uid = os.getuid()
+        monkeypatch.setattr(os, 'getuid', lambda: uid + 1)
+        assert daemon.connect(socket_path) is None
+        monkeypatch.setattr(os, 'getuid', lambda: uid)
+    finally:
+        server._server.shutdown()
+        thread.join(timeout=10)
@@ -0,0 +1,113 @@
+"""
+Inference Pool Test
+Concurrent in-memory requests get their own, correct results
+"""
+
+import numpy as np
+import pytesseract
+from concurrent.futures import ThreadPoolExecutor
+from PIL import Image
+from test_shared_ocr import FAKE_OCR
+from src.fraud_detector import FraudDetector
+from src.inference_pool import InferencePool, QueueFullError
+
+
+DOCS = ['data/sample_documents/advanced_bank_fake.jpg',
+        'data/sample_documents/advanced_bank_authentic.jpg',
+        'data/sample_documents/bank_statement_fake.jpg']
+
+
+def test_concurrent_uploads(monkeypatch, tmp_path):
+    """Parallel uploads match single-threaded analysis; overflow is rejected"""
+    monkeypatch.setattr(pytesseract, 'image_to_data', lambda image, output_type=None: FAKE_OCR)
+    monkeypatch.setattr(pytesseract, 'get_tesseract_version', lambda: '5.0')
+
+    pool = InferencePool(workers=2, max_queue=1, cache_dir=str(tmp_path))
+    try:
+        uploads = [Image.open(path) for path in DOCS]
+
+        with ThreadPoolExecutor(max_workers=3) as clients:
+            results = list(clients.map(lambda image: pool.analyze(image, block=True), uploads))
+
+        detector = FraudDetector()
+        for image, result in zip(uploads, results):
+            bgr = np.array(image.convert('RGB'))[:, :, ::-1].copy()
+            expected = detector.analyze_document(bgr, verbose=False)
+            assert result['confidence'] == expected['confidence']
+            assert result['copymove_duplicates'] == expected['copymove_duplicates']
+            assert result['queue_wait'] >= 0
+
+        # Repeated upload: served from cache without a worker, under the caller's label
+        repeated = pool.analyze(uploads[0], label='scan.jpg')
+        assert repeated['queue_wait'] == 0.0
+        assert repeated['file_path'] == 'scan.jpg'
+        assert pool.analyze(uploads[0])['file_path'] == 'upload'
+
+        # More requests than workers + queue slots are turned away
+        arrays = [np.tile(np.array(image.convert('RGB')), (2, 2, 1)) + k
+                  for k, image in enumerate(uploads * 2)]
+        futures, rejected = [], 0
+        for array in arrays:
+            try:
+                futures.append(pool.submit(array))
+            except QueueFullError:
+                rejected += 1
+        [future.result() for future in futures]
+        assert rejected > 0 and len(futures) <= 3
+
+        stats = pool.queue_stats()
+        assert stats['rejected'] == rejected and stats['in_flight'] == 0
+        print(f"   ✅ {stats['completed']} requests, p95 wait {stats['p95_wait']:.2f}s")
+    finally:
+        pool.close()
+
+
+def test_web_pool_started_once(monkeypatch):
+    """Simultaneous first requests of the web app share one pool"""
+    import time
+    import truthlens_web
+    from src import inference_pool
+
+    started = []
+
+    class SlowPool:
+        def __init__(self, **settings):
+            time.sleep(0.05)  # wide window for a second thread to slip in
+            started.append(self)
+
+    monkeypatch.setattr(inference_pool, 'InferencePool', SlowPool)
+    monkeypatch.setattr(truthlens_web, 'inference_pool', None)
+
+    with ThreadPoolExecutor(max_workers=4) as clients:
+        pools = list(clients.map(lambda _: truthlens_web.get_inference_pool(), range(4)))
+
+    assert len(started) == 1
+    assert all(pool is started[0] for pool in pools)
+
+
+def test_cache_io_outside_lock_and_queue_wait(monkeypatch, tmp_path):
+    """Cache reads / writes never hold the pool lock; queue wait ends when a worker starts"""
+    monkeypatch.setattr(pytesseract, 'image_to_data', lambda image, output_type=None: FAKE_OCR)
+    monkeypatch.setattr(pytesseract, 'get_tesseract_version', lambda: '5.0')
+
+    pool = InferencePool(workers=1, max_queue=2, cache_dir=str(tmp_path))
+    try:
+        locked_during_io = []
+        for name in ('_load_from_cache', '_save_to_cache'):
+            original = getattr(pool.processor, name)
+
+            def checked(*args, _original=original):
+                locked_during_io.append(pool._lock.locked())
+                return _original(*args)
+
+            monkeypatch.setattr(pool.processor, name, checked)
+
+        # One worker: the second request waits for the whole first analysis
+        first, second = [pool.submit(Image.open(path)) for path in DOCS[:2]]
+        first, second = first.result(), second.result()
+        assert locked_during_io and not any(locked_during_io)
+        assert second['queue_wait'] >= 0.5 * first['processing_time']
+        assert first['queue_wait'] < second['queue_wait']
+        assert pool.queue_stats()['in_flight'] == 0
+    finally:
+        pool.close()
@@ -0,0 +1,53 @@
+"""
+Parallel Batch Test
+A batch on a process pool gives the same results, in the same order, as
+a sequential batch
+"""
+
+import glob
+
+import pytesseract
+from test_shared_ocr import FAKE_OCR
+from src.batch_processor import BatchProcessor
+
+
+VERDICT_FIELDS = ('fraud_detected', 'confidence', 'suspicious_count', 'ela_score',
+                  'copymove_duplicates', 'font_variation', 'ocr_status')
+
+
+def test_parallel_matches_sequential(monkeypatch, tmp_path):
+    """workers=2 matches workers=1, with a cache hit and unreadable inputs in the batch"""
+    # Pool workers are forked, so they inherit the fake OCR
+    monkeypatch.setattr(pytesseract, 'image_to_data', lambda image, output_type=None: FAKE_OCR)
+    monkeypatch.setattr(pytesseract, 'get_tesseract_version', lambda: '5.0')
+
+    documents = sorted(glob.glob('data/sample_documents/*.jpg'))[:4]
+    not_an_image = tmp_path / 'notes.jpg'
+    not_an_image.write_text('not a JPEG')
+    file_paths = (documents[:2] + [str(tmp_path / 'missing.jpg')] +
+                  documents[2:] + [str(not_an_image)])
+
+    sequential = BatchProcessor(cache_dir=str(tmp_path / 'sequential'))
+    parallel = BatchProcessor(cache_dir=str(tmp_path / 'parallel'))
+    cached = {processor: processor.process_single(documents[1])
+              for processor in (sequential, parallel)}
+
+    expected = sequential.process_batch(file_paths, show_progress=False, workers=1)
+    results = parallel.process_batch(file_paths, show_progress=False, workers=2)
+
+    assert len(results) == len(expected) == len(file_paths)
+    for path, result, reference in zip(file_paths, results, expected):
+        assert result['file_path'] == reference['file_path'] == path
+        assert bool(result.get('error')) == bool(reference.get('error'))
+        for field in VERDICT_FIELDS:
+            assert result.get(field) == reference.get(field), (path, field)
+
+    # The cached document was served from the cache, not re-analyzed
+    assert results[1]['processed_at'] == cached[parallel]['processed_at']
+    assert expected[1]['processed_at'] == cached[sequential]['processed_at']
+    assert results[2].get('error') and results[-1].get('error')
+    assert results[0]['ocr_status'] == 'computed'
+
+    for key in ('total_processed', 'fraud_detected', 'authentic', 'errors', 'cache_hits'):
+        assert parallel.stats[key] == sequential.stats[key], key
+    assert parallel.stats['errors'] == 2
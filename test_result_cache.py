@@ -0,0 +1,173 @@
+"""
+Result Cache Test
+SQLite result cache: round trips, O(1) counters, LRU / TTL eviction
+"""
+
+import time
+import pytest
+from src.utils.result_cache import ResultCache
+
+
+def test_round_trip_and_counters(tmp_path):
+    """Values round-trip; counters track entries, bytes, hits and misses"""
+    cache = ResultCache(str(tmp_path / 'cache.sqlite3'))
+
+    assert cache.get('missing') is None
+    cache.put('a', {'result': {'fraud_detected': True, 'confidence': 87.5}})
+    cache.put('b', {'result': {'fraud_detected': False}})
+    cache.put('a', {'result': {'fraud_detected': False, 'confidence': 12.0}})  # replace
+
+    assert cache.get('a') == {'result': {'fraud_detected': False, 'confidence': 12.0}}
+    stats = cache.stats()
+    assert stats['entries'] == 2 == len(cache)
+    assert stats['hits'] == 1 and stats['misses'] == 1
+    assert stats['bytes'] == (len('{"result":{"fraud_detected":false,"confidence":12.0}}') +
+                              len('{"result":{"fraud_detected":false}}'))
+
+    # Counters persist across connections
+    cache.close()
+    reopened = ResultCache(str(tmp_path / 'cache.sqlite3'))
+    assert reopened.stats()['entries'] == 2
+    assert reopened.clear() == 2
+    assert reopened.stats()['entries'] == 0 and reopened.stats()['bytes'] == 0
+
+
+def test_lru_eviction(tmp_path):
+    """Least recently used entries go first when a cap is exceeded"""
+    cache = ResultCache(str(tmp_path / 'cache.sqlite3'), max_entries=3)
+    for key in 'abc':
+        cache.put(key, key)
+        time.sleep(0.01)
+    cache.get('a')  # 'b' is now the least recently used
+    cache.put('d', 'd')
+
+    assert cache.get('b') is None
+    assert [cache.get(key) for key in 'acd'] == ['a', 'c', 'd']
+    assert cache.stats()['evictions'] == 1
+
+    sized = ResultCache(str(tmp_path / 'sized.sqlite3'), max_bytes=1000)
+    for i in range(50):
+        sized.put(str(i), 'x' * 100)
+    assert sized.stats()['bytes'] <= 1000
+    assert sized.get('49') == 'x' * 100
+
+
+def test_ttl_expiry(tmp_path):
+    """Entries older than the TTL are misses"""
+    cache = ResultCache(str(tmp_path / 'cache.sqlite3'), ttl=0.05)
+    cache.put('a', 1)
+    assert cache.get('a') == 1
+    time.sleep(0.1)
+    assert cache.get('a') is None
+    assert cache.stats()['entries'] == 0
+
+
+def test_failed_write_is_rolled_back(tmp_path):
+    """A value that cannot be stored leaves the cache untouched"""
+    cache = ResultCache(str(tmp_path / 'cache.sqlite3'))
+    cache.put('a', 1)
+    with pytest.raises(TypeError):
+        cache.put('b', object())
+    assert cache.stats()['entries'] == 1
+    cache.put('c', 3)
+    assert cache.get('c') == 3
+
+
+def test_stage_cache_recomputes_only_changed_stages(monkeypatch, tmp_path):
+    """Changing one stage's parameters reuses every other cached stage"""
+    import pytesseract
+    from test_shared_ocr import FAKE_OCR
+    from src.batch_processor import BatchProcessor
+
+    ocr_calls = []
+
+    def fake_image_to_data(image, output_type=None):
+        ocr_calls.append(image.shape)
+        return FAKE_OCR
+
+    monkeypatch.setattr(pytesseract, 'image_to_data', fake_image_to_data)
+    monkeypatch.setattr(pytesseract, 'get_tesseract_version', lambda: '5.0')
+
+    path = 'data/sample_documents/advanced_bank_fake.jpg'
+    processor = BatchProcessor(use_cache=True, cache_dir=str(tmp_path))
+    detector = processor.fraud_detector
+
+    first = processor.process_single(path)
+    assert first['cached_stages'] == [] and len(ocr_calls) == 1
+
+    # Same configuration: the final result is served directly
+    assert processor.process_single(path)['processed_at'] == first['processed_at']
+
+    # New copy-move parameters: only copy-move runs again
+    detector.copymove_detector.block_size = 32
+    second = processor.process_single(path)
+    assert sorted(second['cached_stages']) == ['ela', 'font', 'ocr']
+    assert len(ocr_calls) == 1
+    assert 'ela' not in second['timings'] and 'block_extraction' in second['timings']
+    expected = detector.analyze_document(path, verbose=False)
+    assert second['copymove_duplicates'] == expected['copymove_duplicates']
+
+    # New fusion threshold: nothing but the fusion runs, not even the decode
+    detector.ELA_THRESHOLD = 0
+    third = processor.process_single(path)
+    assert sorted(third['cached_stages']) == ['copymove', 'ela', 'font']
+    assert list(third['timings']) == ['fusion']
+    assert third['ela_suspicious'] and not second['ela_suspicious']
+    print("   ✅ Stage cache reused across 3 configurations")
+
+
+def test_verdict_not_cached_when_ocr_fails(monkeypatch, tmp_path):
+    """An OCR failure leaves no result-level entry, only the OCR-free stages"""
+    import pytesseract
+    from src.batch_processor import BatchProcessor
+
+    def broken_image_to_data(image, output_type=None):
+        raise pytesseract.TesseractNotFoundError()
+
+    monkeypatch.setattr(pytesseract, 'image_to_data', broken_image_to_data)
+    monkeypatch.setattr(pytesseract, 'get_tesseract_version', lambda: '5.0')
+
+    path = 'data/sample_documents/advanced_bank_fake.jpg'
+    processor = BatchProcessor(use_cache=True, cache_dir=str(tmp_path))
+    result = processor.process_single(path)
+    assert result['ocr_status'] == 'failed'
+
+    keys = [key for (key,) in processor.cache._conn.execute("SELECT key FROM entries")]
+    assert keys and not any(key.startswith('result:') for key in keys)
+    assert not any(key.startswith(('stage:font', 'stage:ocr', 'stage:copymove')) for key in keys)
+
+    # The next run analyzes again instead of serving the degraded verdict
+    assert processor.process_single(path)['processed_at'] != result['processed_at']
+
+
+def test_file_hasher_index(tmp_path):
+    """Unchanged files are served from the index; edits are rehashed"""
+    import hashlib
+    import os
+    from src.utils.file_hasher import FileHasher
+
+    document = tmp_path / 'scan.jpg'
+    document.write_bytes(os.urandom(3 * 1024 * 1024 + 17))
+    old = time.time() - 60
+    os.utime(document, (old, old))
+
+    hasher = FileHasher(str(tmp_path / 'index.sqlite3'))
+    hasher.CHUNK_SIZE = 1024 * 1024
+    expected = hashlib.blake2b(document.read_bytes(), digest_size=16).hexdigest()
+
+    assert hasher.digest(str(document)) == expected
+    assert hasher.digest(str(document)) == expected
+    assert hasher.stats['hashed'] == 1 and hasher.stats['index_hits'] == 1
+
+    # Any change of size / mtime / inode forces a rehash
+    document.write_bytes(b'edited')
+    os.utime(document, (old + 1, old + 1))
+    assert hasher.digest(str(document)) == hashlib.blake2b(b'edited', digest_size=16).hexdigest()
+    assert hasher.stats['hashed'] == 2
+
+    # Freshly written files are hashed but not indexed yet
+    fresh = tmp_path / 'fresh.jpg'
+    fresh.write_bytes(b'new scan')
+    hasher.digest(str(fresh))
+    hasher.digest(str(fresh))
+    assert hasher.stats['hashed'] == 4
@@ -0,0 +1,108 @@
+"""
+Result Sink Test
+Streamed batch output round-trips and reproduces the batch summary
+"""
+
+import glob
+import json
+import tracemalloc
+
+import pytesseract
+from test_shared_ocr import FAKE_OCR
+from src.batch_processor import BatchProcessor
+from src.utils.result_sink import (CSVSink, JSONLSink, StreamSummary, open_sink, read_results,
+                                   summarize_file)
+
+
+def test_sink_flushes_in_chunks(tmp_path):
+    """Records reach the file every flush_every results, and reopening appends"""
+    path = tmp_path / 'results.jsonl'
+    with JSONLSink(path, flush_every=3) as sink:
+        for i in range(5):
+            sink.write({'file_path': f'doc{i}.jpg', 'fraud_detected': i % 2 == 0})
+            on_disk = path.read_text().count('\n')
+            assert on_disk == (3 if i >= 2 else 0)
+    assert path.read_text().count('\n') == 5
+
+    with open_sink(path) as sink:
+        sink.write({'file_path': 'doc5.jpg', 'fraud_detected': False})
+    assert [r['file_path'] for r in read_results(path)] == [f'doc{i}.jpg' for i in range(6)]
+
+    # A line cut short by a crash is ignored on read-back
+    with open(path, 'a') as f:
+        f.write('{"file_path": "doc6.j')
+    assert len(list(read_results(path))) == 6
+
+
+def test_streamed_batch_matches_in_memory(monkeypatch, tmp_path):
+    """The summary rebuilt from JSONL / CSV equals the live batch statistics"""
+    monkeypatch.setattr(pytesseract, 'image_to_data', lambda image, output_type=None: FAKE_OCR)
+    monkeypatch.setattr(pytesseract, 'get_tesseract_version', lambda: '5.0')
+
+    documents = sorted(glob.glob('data/sample_documents/*.jpg'))[:4] + [str(tmp_path / 'missing.jpg')]
+    processor = BatchProcessor(use_cache=False)
+    jsonl, csv = tmp_path / 'results.jsonl', tmp_path / 'results.csv'
+
+    with JSONLSink(jsonl, flush_every=2) as to_jsonl, CSVSink(csv, flush_every=2) as to_csv:
+        streamed = []
+        for result in processor.iter_batch(documents, show_progress=False, sink=to_jsonl):
+            to_csv.write(result)
+            streamed.append(result['file_path'])
+    assert streamed == documents
+
+    stats = processor.stats
+    for path in (jsonl, csv):
+        summary = summarize_file(path)
+        assert summary['total_documents'] == len(documents)
+        assert summary['total_processed'] == stats['total_processed']
+        assert summary['fraud_detected'] == stats['fraud_detected']
+        assert summary['authentic'] == stats['authentic']
+        assert summary['errors'] == stats['errors'] == 1
+
+    # JSONL keeps the full result, so per-stage timings survive too
+    assert summarize_file(jsonl)['stage_timings'].keys() == stats['stage_timings'].keys()
+    first = json.loads(jsonl.read_text().splitlines()[0])
+    assert first['timings'] and first['file_path'] == documents[0]
+
+    # collect=False streams without keeping results in memory
+    processor.reset_stats()
+    with open_sink(tmp_path / 'again.jsonl') as sink:
+        assert processor.process_batch(documents, show_progress=False,
+                                       sink=sink, collect=False) == []
+    assert sink.written == len(documents)
+
+
+def test_streaming_memory_stays_flat(monkeypatch, tmp_path):
+    """A long streamed batch (with its live summary) does not grow memory per document"""
+    processor = BatchProcessor(use_cache=False)
+    calls = [0]
+
+    def analyze_document(path, verbose=False, stage_cache=None):
+        calls[0] += 1
+        wall = 0.001 * (1 + calls[0] % 997)  # many distinct timings
+        return {'fraud_detected': calls[0] % 3 == 0, 'confidence': 50.0, 'tier': 'full',
+                'timings': {stage: {'wall': wall, 'cpu': wall / 2}
+                            for stage in ('decode', 'ela', 'block_matching', 'fusion')}}
+
+    monkeypatch.setattr(processor.fraud_detector, 'analyze_document', analyze_document)
+    document = tmp_path / 'page.jpg'
+    document.write_bytes(b'page')
+    documents = [str(document)] * 12000
+    summary = StreamSummary()
+
+    tracemalloc.start()
+    try:
+        with JSONLSink(tmp_path / 'results.jsonl', flush_every=100) as sink:
+            for i, result in enumerate(processor.iter_batch(documents, show_progress=False,
+                                                            sink=sink), 1):
+                summary.add(result)
+                if i == 2000:
+                    early = tracemalloc.get_traced_memory()[0]
+        late = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+    # 10,000 more documents: growth would be megabytes if anything was kept per result
+    assert late - early < 100 * 1024, late - early
+    assert summary.total == processor.stats['total_processed'] == len(documents)
+    assert summary.to_dict()['stage_timings']['ela']['count'] == len(documents)
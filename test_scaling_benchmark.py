@@ -0,0 +1,36 @@
+"""
+Scaling Benchmark Test
+Growth exponents are fitted correctly and copy-move work is counted
+"""
+
+import pytest
+
+from benchmarks.scaling_benchmark import fit_exponent, run_scaling, summarize_series
+
+
+def test_fit_recovers_exponent_and_budget():
+    """A cost of exactly c * pixels^k gives back k and the size limit"""
+    pixels = [0.5e6, 1e6, 2e6, 4e6]
+    points = [{'pixels': p, 'seconds': 2e-12 * p ** 2, 'peak_mb': p / 1e5,
+               'candidate_pairs': p / 10} for p in pixels]
+
+    summary = summarize_series(points, budget=2.0)
+    assert summary['time_exponent'] == pytest.approx(2.0)
+    assert summary['tail_exponent'] == pytest.approx(2.0)
+    assert summary['memory_exponent'] == pytest.approx(1.0)
+    assert summary['candidates_exponent'] == pytest.approx(1.0)
+    assert summary['max_megapixels'] == pytest.approx(1.0)
+
+    assert fit_exponent([1e6], [1.0]) == (None, None)
+
+
+def test_copymove_counts_grow_with_resolution(tmp_path):
+    """More pixels retain more blocks and compare more candidate pairs"""
+    report = run_scaling([50, 100], block_sizes=[32], cases=['copymove', 'ela'], count=1,
+                         repetitions=1, corpus_dir=str(tmp_path), show_progress=False)
+
+    low, high = report['series']['copymove/32']['points']
+    assert high['pixels'] > low['pixels']
+    assert high['num_blocks'] > low['num_blocks'] > 0
+    assert high['candidate_pairs'] > low['candidate_pairs']
+    assert report['series']['ela']['summary']['time_exponent'] is not None
@@ -0,0 +1,64 @@
+"""
+Shared Document Test
+Detectors must give the same answer for a path and for a pre-decoded document
+"""
+
+import os
+from src.cv_module.ela_detector import ELADetector
+from src.cv_module.copymove_detector import CopyMoveDetector
+from src.utils.document_image import DocumentImage
+
+
+TEST_DOC = 'data/sample_documents/advanced_bank_fake.jpg'
+
+
+def test_shared_document():
+    """Path input and DocumentImage input produce identical results"""
+    print("\n" + "="*70)
+    print("🧪 TESTING SHARED DOCUMENT DECODE")
+    print("="*70)
+
+    assert os.path.exists(TEST_DOC), f"Missing sample document: {TEST_DOC}"
+
+    document = DocumentImage.load(TEST_DOC)
+    assert document is not None
+    assert document.gray.shape == (document.height, document.width)
+    assert document.rgb.shape == document.bgr.shape
+
+    # Views are computed once and reused
+    assert document.gray is document.gray
+
+    ela = ELADetector()
+    assert ela.detect(TEST_DOC) == ela.detect(document)
+
+    copymove = CopyMoveDetector()
+    from_path = copymove.detect(TEST_DOC)
+    from_document = copymove.detect(document)
+    assert from_path['num_duplicates'] == from_document['num_duplicates']
+
+    print(f"   ✅ {os.path.basename(TEST_DOC)}: identical results")
+
+    # Unreadable input is reported as None, not an exception
+    assert DocumentImage.load('does_not_exist.jpg') is None
+    assert DocumentImage.from_bytes(b'not an image') is None
+
+
+def test_ela_concurrent_in_memory():
+    """ELA recompresses in memory: no temp file, safe across threads"""
+    from concurrent.futures import ThreadPoolExecutor
+
+    document = DocumentImage.load(TEST_DOC)
+    ela = ELADetector()
+    expected = ela.detect(document)
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        scores = list(pool.map(ela.detect, [document] * 8))
+
+    assert scores == [expected] * 8
+    assert not os.path.exists('temp_ela.jpg')
+    print(f"   ✅ ELA score {expected:.2f} stable across 8 concurrent runs")
+
+
+if __name__ == "__main__":
+    test_shared_document()
+    test_ela_concurrent_in_memory()
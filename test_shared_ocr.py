@@ -0,0 +1,86 @@
+"""
+Shared OCR Test
+Segmentation and font analysis must reuse a single Tesseract pass
+"""
+
+import numpy as np
+import pytesseract
+from src.cv_module.font_analyzer import FontAnalyzer
+from src.utils.document_image import DocumentImage
+from src.utils.document_segmenter import DocumentSegmenter
+
+
+FAKE_OCR = {
+    'level':     [1, 5, 5, 5, 5],
+    'page_num':  [1, 1, 1, 1, 1],
+    'block_num': [0, 1, 1, 1, 2],
+    'par_num':   [0, 1, 1, 1, 1],
+    'line_num':  [0, 1, 1, 2, 1],
+    'word_num':  [0, 1, 2, 1, 1],
+    'left':      [0, 10, 60, 10, 200],
+    'top':       [0, 10, 12, 40, 90],
+    'width':     [300, 40, 50, 80, 30],
+    'height':    [200, 20, 18, 22, 40],
+    'conf':      [-1, 96.2, 88.0, 30.9, 75],
+    'text':      ['', 'Account', 'Number', 'low', ' '],
+}
+
+
+def test_single_ocr_pass(monkeypatch):
+    """One image_to_data call serves both consumers"""
+    calls = []
+
+    def fake_image_to_data(image, output_type=None):
+        calls.append(image.shape)
+        return FAKE_OCR
+
+    monkeypatch.setattr(pytesseract, 'image_to_data', fake_image_to_data)
+    monkeypatch.setattr(pytesseract, 'get_tesseract_version', lambda: '5.0')
+
+    document = DocumentImage(np.full((200, 300, 3), 255, dtype=np.uint8), source='blank')
+
+    regions = DocumentSegmenter().get_text_regions(document)
+    font_result = FontAnalyzer().analyze(document)
+
+    assert len(calls) == 1
+    # Confidence is truncated like before: 30.9 -> 30 is not > 30
+    assert regions == [(10, 10, 40, 20), (60, 12, 50, 18)]
+    # Font sizes include confident entries even without text
+    assert sorted(font_result['font_sizes']) == [18, 20, 40]
+
+    ocr = document.memo('ocr', lambda: None)
+    lines = ocr.lines(min_confidence=30)
+    assert [len(line['words']) for line in lines] == [2]
+    assert lines[0]['box'] == (10, 10, 100, 20)
+    print(f"   ✅ OCR calls: {len(calls)}, text regions: {len(regions)}")
+
+
+def test_concurrent_detectors_match_sequential(monkeypatch):
+    """Concurrent analysis gives the same result with a single OCR pass"""
+    from src.fraud_detector import FraudDetector
+
+    calls = []
+
+    def fake_image_to_data(image, output_type=None):
+        calls.append(image.shape)
+        return FAKE_OCR
+
+    monkeypatch.setattr(pytesseract, 'image_to_data', fake_image_to_data)
+    monkeypatch.setattr(pytesseract, 'get_tesseract_version', lambda: '5.0')
+
+    detector = FraudDetector(use_segmentation=True)
+    path = 'data/sample_documents/advanced_bank_fake.jpg'
+
+    sequential = detector.analyze_document(path, verbose=False)
+    document = DocumentImage.load(path)
+    concurrent = detector.analyze_document(document, verbose=False, concurrent=True)
+
+    sequential.pop('timings'), concurrent.pop('timings')
+    assert concurrent == sequential
+    assert len(calls) == 2  # one per document, never per detector
+
+    # close() stops the detector thread pool
+    executor = detector._executor
+    detector.close()
+    assert executor._shutdown and detector._executor is None
+    print(f"   ✅ Concurrent result matches sequential ({len(calls)} OCR calls)")
@@ -0,0 +1,84 @@
+"""
+Stage Timings Test
+Every analysis reports wall / CPU time per stage, and batches aggregate them
+"""
+
+import numpy as np
+import pytesseract
+from test_shared_ocr import FAKE_OCR
+from src.batch_processor import BatchProcessor
+from src.utils.timing import StageTimer, TimingStats
+
+
+STAGES = ['decode', 'segmentation_ocr', 'ela', 'block_extraction',
+          'block_matching', 'font_ocr', 'fusion']
+
+
+def test_stage_timer():
+    """Repeated stages accumulate; CPU time never exceeds what was spent"""
+    timer = StageTimer()
+    for _ in range(3):
+        with timer.stage('work'):
+            sum(range(20000))
+    timings = timer.to_dict()
+    assert list(timings) == ['work']
+    assert timings['work']['wall'] > 0
+    assert 0 <= timings['work']['cpu'] <= timings['work']['wall'] * 1.5
+
+    stats = TimingStats()
+    for wall in np.linspace(0.1, 1.0, 10):
+        stats.add({'work': {'wall': wall, 'cpu': wall / 2}})
+    summary = stats.summary()['work']
+    assert summary['count'] == 10
+    assert np.isclose(summary['total_wall'], 5.5)
+    assert np.isclose(summary['total_cpu'], 2.75)
+    assert np.isclose(summary['p50_wall'], 0.5, rtol=0.01)  # nearest rank, within a bucket
+    assert summary['max_wall'] == 1.0
+
+
+def test_timing_stats_stay_bounded():
+    """Memory is set by the spread of the timings, not their number; percentiles stay close"""
+    rng = np.random.default_rng(0)
+    stats = TimingStats()
+    walls = rng.lognormal(mean=-3, sigma=1, size=50000)
+    for wall in walls:
+        stats.add({'work': {'wall': float(wall), 'cpu': 0.0}})
+
+    # At most one bucket per GROWTH step between the fastest and slowest time
+    span = np.log(walls.max() / walls.min()) / np.log(TimingStats.GROWTH)
+    assert len(stats.stages['work']['buckets']) <= span + 2 < 2000
+    summary = stats.summary()['work']
+    assert summary['count'] == len(walls)
+    assert np.isclose(summary['total_wall'], walls.sum())
+    assert summary['max_wall'] == walls.max()
+    for p in TimingStats.PERCENTILES:
+        assert np.isclose(summary[f'p{p}_wall'], np.percentile(walls, p), rtol=0.01)
+
+
+def test_stage_timings_in_results(monkeypatch, tmp_path):
+    """analyze_document reports every stage; the batch stats aggregate them"""
+    monkeypatch.setattr(pytesseract, 'image_to_data', lambda image, output_type=None: FAKE_OCR)
+    monkeypatch.setattr(pytesseract, 'get_tesseract_version', lambda: '5.0')
+
+    processor = BatchProcessor(use_cache=True, cache_dir=str(tmp_path))
+    paths = ['data/sample_documents/advanced_bank_fake.jpg',
+             'data/sample_documents/advanced_bank_authentic.jpg']
+
+    results = processor.process_batch(paths, show_progress=False)
+    for result in results:
+        assert list(result['timings']) == STAGES
+        for stage in result['timings'].values():
+            assert stage['wall'] >= 0 and stage['cpu'] >= 0
+
+    concurrent = processor.fraud_detector.analyze_document(paths[0], verbose=False,
+                                                           concurrent=True)
+    assert sorted(concurrent['timings']) == sorted(STAGES)
+
+    stage_timings = processor.stats['stage_timings']
+    assert list(stage_timings) == STAGES
+    assert all(stage['count'] == 2 for stage in stage_timings.values())
+
+    # Cache hits are served without work and are not counted again
+    processor.process_batch(paths, show_progress=False)
+    assert all(stage['count'] == 2 for stage in processor.stats['stage_timings'].values())
+    print(f"   ✅ {len(STAGES)} stages timed and aggregated")
@@ -0,0 +1,86 @@
+"""
+Triage Test
+Low-resolution triage decides only clear cases and records the tier
+"""
+
+import glob
+
+import pytesseract
+from test_shared_ocr import FAKE_OCR
+from src.fraud_detector import FraudDetector
+from src.utils.document_image import DocumentImage
+from src.utils.timing import StageTimer
+
+
+DOCUMENT = 'data/sample_documents/advanced_bank_fake.jpg'
+
+
+def test_reduced_decode_matches_downscale():
+    """Reduced JPEG decode and in-memory downscaling give the same size"""
+    full = DocumentImage.load(DOCUMENT)
+    for reduction in (2, 4, 8):
+        reduced = DocumentImage.load_reduced(DOCUMENT, reduction)
+        assert reduced.bgr.shape == full.downscaled(reduction).bgr.shape
+        assert reduced.width == -(-full.width // reduction)
+
+
+
+def test_triage_duplicate_estimate():
+    """The scaled triage duplicate count stays near the full-resolution count"""
+    for scale in (2, 4, 8):
+        detector = FraudDetector(triage_scale=scale)
+        for path in (DOCUMENT, 'data/sample_documents/bank_statement_fake.jpg'):
+            full = detector.copymove_detector.detect(path)['num_duplicates']
+            outputs, _ = detector._run_triage(path, StageTimer())
+            estimate = outputs['copymove']['num_duplicates']
+            assert 0.5 * full <= estimate <= 1.5 * full, (scale, path, estimate, full)
+
+
+def test_triage_tiers(monkeypatch):
+    """Triage verdicts agree with full resolution; a huge band escalates everything"""
+    monkeypatch.setattr(pytesseract, 'image_to_data', lambda image, output_type=None: FAKE_OCR)
+    monkeypatch.setattr(pytesseract, 'get_tesseract_version', lambda: '5.0')
+
+    full = FraudDetector()
+    tiered = FraudDetector(triage_scale=4)
+    always_escalate = FraudDetector(triage_scale=4, triage_band=100)
+
+    triaged = 0
+    for path in sorted(glob.glob('data/sample_documents/*.jpg')):
+        expected = full.analyze_document(path, verbose=False)
+        result = tiered.analyze_document(path, verbose=False)
+
+        assert expected['tier'] == 'full'
+        assert result['fraud_detected'] == expected['fraud_detected'], path
+        if result['tier'] == 'triage':
+            triaged += 1
+            assert result['skipped_detectors'] == ['font']
+            assert 'decode' not in result['timings']
+
+        escalated = always_escalate.analyze_document(path, verbose=False)
+        assert escalated['tier'] == 'full'
+        assert escalated['confidence'] == expected['confidence']
+        assert 'triage_ela' in escalated['timings']
+
+    assert triaged > 0
+    print(f"   ✅ {triaged} documents decided by triage")
+
+
+def test_text_heavy_page_not_fraud_at_triage(monkeypatch):
+    """Repeated text inflates unmasked triage copy-move; it must not settle a FRAUD verdict"""
+    monkeypatch.setattr(pytesseract, 'image_to_data', lambda image, output_type=None: FAKE_OCR)
+    monkeypatch.setattr(pytesseract, 'get_tesseract_version', lambda: '5.0')
+
+    detector = FraudDetector(triage_scale=4)
+    path = 'data/sample_documents/bank_statement_authentic.jpg'
+    # High ELA (e.g. a heavily recompressed scan) next to thousands of text duplicates
+    monkeypatch.setattr(detector.ela_detector, 'detect', lambda image: 90.0)
+
+    outputs, _ = detector._run_triage(path, StageTimer())
+    assert outputs['copymove']['num_duplicates'] > detector.COPYMOVE_THRESHOLD * 10
+    assert not detector._triage_decided(outputs)
+    assert detector.analyze_document(path, verbose=False)['tier'] == 'full'
+
+    # Without segmentation the full analysis counts text the same way, so triage may decide
+    unsegmented = FraudDetector(use_segmentation=False, triage_scale=4)
+    assert unsegmented._triage_decided(outputs)
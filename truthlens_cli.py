@@ -7,8 +7,10 @@ import argparse
 import os
 import sys
 from pathlib import Path
-from src.fraud_detector import FraudDetector
-from src.batch_processor import BatchProcessor
+from src import daemon
+
+# FraudDetector and BatchProcessor are imported where they are used: when a
+# daemon is running, analyze and batch never load OpenCV or Tesseract here
 
 
 def print_banner():
@@ -31,7 +33,25 @@ def print_banner():
     print(banner)
 
 
-def analyze_single_document(file_path, verbose=True, use_cache=True):
+def _daemon_request(command, **params):
+    """
+    Run a request on the analysis daemon if one is running
+    
+    Returns:
+        The daemon's result, or None if no daemon could serve it
+    """
+    client = daemon.connect()
+    if client is None:
+        return None
+    try:
+        return client.request(command, **params)
+    except (OSError, ValueError) as e:
+        print(f"⚠️  Daemon unavailable ({e}), analyzing in this process")
+        return None
+
+
+def analyze_single_document(file_path, verbose=True, use_cache=True, use_daemon=True,
+                            cascade=False, triage_scale=None):
     """
     Analyze a single document
     
@@ -39,6 +59,10 @@ def analyze_single_document(file_path, verbose=True, use_cache=True):
         file_path (str): Path to document
         verbose (bool): Show detailed analysis
         use_cache (bool): Use caching
+        use_daemon (bool): Use a running analysis daemon (verbose
+                           analyses always run in this process)
+        cascade (bool): Stop once the detector vote is decided
+        triage_scale (int): Triage at 1/triage_scale resolution first (None = off)
     """
     print_banner()
     
@@ -50,12 +74,22 @@ def analyze_single_document(file_path, verbose=True, use_cache=True):
     print(f"📄 Analyzing: {os.path.basename(file_path)}")
     print("="*70)
     
+    result = None
+    if use_daemon and not verbose:
+        result = _daemon_request('analyze', path=os.path.abspath(file_path),
+                                 use_cache=use_cache, cascade=cascade,
+                                 triage_scale=triage_scale)
+    
     # Initialize processor
-    if use_cache:
-        processor = BatchProcessor(use_cache=True)
+    if result is None and use_cache:
+        from src.batch_processor import BatchProcessor
+        processor = BatchProcessor(use_cache=True, concurrent_detectors=True, cascade=cascade,
+                                   triage_scale=triage_scale)
         result = processor.process_single(file_path, verbose=verbose)
-    else:
-        detector = FraudDetector(use_segmentation=True)
+    elif result is None:
+        from src.fraud_detector import FraudDetector
+        detector = FraudDetector(use_segmentation=True, concurrent=True, cascade=cascade,
+                                 triage_scale=triage_scale)
         result = detector.analyze_document(file_path, verbose=verbose)
     
     # Print summary
@@ -67,21 +101,37 @@ def analyze_single_document(file_path, verbose=True, use_cache=True):
         print(f"   Status: {'🚨 FRAUD DETECTED' if result['fraud_detected'] else '✅ AUTHENTIC'}")
         print(f"   Confidence: {result['confidence']:.1f}%")
         print(f"\n   Detection Details:")
-        print(f"      • ELA Score: {result['ela_score']:.2f}/100")
-        print(f"      • Copy-Move Duplicates: {result['copymove_duplicates']}")
-        print(f"      • Font Variation: {result['font_variation']:.1f}%")
+        # Detectors skipped by --cascade have no score
+        skipped = "skipped (vote already decided)"
+        ela = skipped if result['ela_score'] is None else f"{result['ela_score']:.2f}/100"
+        copymove = skipped if result['copymove_duplicates'] is None else result['copymove_duplicates']
+        font = skipped if result['font_variation'] is None else f"{result['font_variation']:.1f}%"
+        print(f"      • ELA Score: {ela}")
+        print(f"      • Copy-Move Duplicates: {copymove}")
+        print(f"      • Font Variation: {font}")
         print("="*70 + "\n")
 
 
-def analyze_batch(directory, pattern='*.jpg', use_cache=True, output=None):
+def analyze_batch(directory, pattern='*.jpg', use_cache=True, output=None, workers=1,
+                  use_daemon=True, cascade=False, triage_scale=None, job_id=None,
+                  overwrite=False):
     """
     Analyze multiple documents in a directory
     
+    The batch runs as a resumable job (see src.utils.batch_job): if it is
+    interrupted, resume_batch() continues where it stopped.
+    
     Args:
         directory (str): Directory path
         pattern (str): File pattern (*.jpg, *.png)
         use_cache (bool): Use caching
         output (str): Output file path
+        workers (int): Number of worker processes
+        use_daemon (bool): Use a running analysis daemon
+        cascade (bool): Stop each analysis once the detector vote is decided
+        triage_scale (int): Triage at 1/triage_scale resolution first (None = off)
+        job_id (str): Name for the job (default: generated)
+        overwrite (bool): Replace an existing output file
     """
     print_banner()
     
@@ -90,20 +140,249 @@ def analyze_batch(directory, pattern='*.jpg', use_cache=True, output=None):
         print(f"❌ Error: Directory not found: {directory}")
         sys.exit(1)
     
+    # Refuse before the batch runs, not after
+    if output and os.path.exists(output) and not overwrite:
+        print(f"❌ Error: {output} already exists (use --overwrite to replace it)")
+        sys.exit(1)
+    
     print(f"📁 Analyzing directory: {directory}")
     print(f"   Pattern: {pattern}")
     print("="*70)
     
-    # Initialize processor
-    processor = BatchProcessor(use_cache=use_cache)
+    file_paths = sorted(str(f.resolve()) for f in Path(directory).glob(pattern))
+    if not file_paths:
+        print(f"❌ No files found matching pattern: {pattern}")
+        return
+    
+    from src.utils.batch_job import BatchJob
+    try:
+        job = BatchJob.create(file_paths, job_id=job_id, settings={
+            'directory': os.path.abspath(directory),
+            'pattern': pattern,
+            'use_cache': use_cache,
+            'cascade': cascade,
+            'triage_scale': triage_scale,
+            'workers': workers,
+            'output': os.path.abspath(output) if output else None,
+            'overwrite': overwrite
+        })
+    except FileExistsError:
+        print(f"❌ Error: Job {job_id} already exists (use --resume {job_id})")
+        sys.exit(1)
     
-    # Process directory
-    results = processor.process_directory(directory, pattern=pattern, show_progress=True)
+    print(f"🗂️  Job {job.job_id}: {len(file_paths)} files planned")
+    print(f"   Resume with: python truthlens_cli.py batch --resume {job.job_id}")
+    _run_job(job, use_daemon=use_daemon)
+
+
+def resume_batch(job, use_daemon=True, workers=None):
+    """
+    Continue an interrupted batch job
+    
+    Finished documents are skipped without being hashed again; failed ones
+    are retried until they run out of attempts.
+    
+    Args:
+        job (str): Job id or job directory
+        use_daemon (bool): Use a running analysis daemon
+        workers (int): Worker processes (default: the job's setting)
+    """
+    print_banner()
     
-    # Save results if output specified
+    from src.utils.batch_job import BatchJob
+    try:
+        job = BatchJob.open(job)
+    except FileNotFoundError as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+    
+    progress = job.progress()
+    print(f"🗂️  Resuming job {job.job_id} (created {job.created_at})")
+    print(f"   Done: {progress['done']}/{progress['total']}, "
+          f"to retry: {progress['retrying']}, not started: {progress['pending']}")
+    print("="*70)
+    _run_job(job, use_daemon=use_daemon, workers=workers)
+
+
+def _run_job(job, use_daemon=True, workers=None):
+    """Run the pending part of a job, then report and write its output"""
+    settings = job.settings
+    workers = workers or settings.get('workers', 1)
+    
+    try:
+        progress = _run_job_on_daemon(job, workers) if use_daemon else None
+        if progress is None:
+            # A daemon that dropped the connection may have finished part
+            # of the job; pick that up from the journal before going on
+            job.reload()
+            from src.batch_processor import BatchProcessor
+            processor = BatchProcessor(use_cache=settings.get('use_cache', True), workers=workers,
+                                       cascade=settings.get('cascade', False),
+                                       triage_scale=settings.get('triage_scale'))
+            progress = processor.process_job(job, show_progress=True)
+    except KeyboardInterrupt:
+        print(f"\n⏸️  Interrupted. Resume with: python truthlens_cli.py batch --resume {job.job_id}")
+        sys.exit(130)
+    
+    print(f"🗂️  Job {job.job_id}: {progress['done']}/{progress['total']} done")
+    if progress['failed']:
+        print(f"   ❌ {progress['failed']} documents failed {job.max_attempts} times and were given up on")
+    if progress['retrying']:
+        print(f"   ⚠️  {progress['retrying']} failed documents will be retried by --resume {job.job_id}")
+    
+    output = settings.get('output')
     if output:
-        processor.save_results(results, output_file=output)
-        print(f"\n💾 Results saved to: {output}")
+        try:
+            written = job.export(output, overwrite=settings.get('overwrite', False))
+        except FileExistsError as e:
+            print(f"❌ Error: {e}")
+            print(f"   Results are kept in the job; export them with --resume {job.job_id} "
+                  f"after moving the file away")
+            sys.exit(1)
+        print(f"\n💾 {written} results saved to: {output}")
+
+
+def _run_job_on_daemon(job, workers):
+    """
+    Run the pending part of a job on the analysis daemon
+    
+    Returns:
+        dict: Job progress, or None if no daemon could run it
+    """
+    reply = _daemon_request('job', job_dir=os.path.abspath(job.job_dir), workers=workers)
+    if reply is None:
+        return None
+    
+    print(f"🛰️  Ran job {job.job_id} on the running daemon")
+    if reply['summary']:
+        print(reply['summary'])
+    # The daemon wrote the journal; pick up its progress
+    job.reload()
+    return reply['progress']
+
+
+def summarize_output(path):
+    """
+    Print the summary of a streamed (.jsonl / .csv) results file or batch job
+    
+    Args:
+        path (str): Results file written by batch --output, or a job id
+    """
+    from src.utils.batch_job import BatchJob
+    from src.utils.result_sink import StreamSummary, stream_format, summarize_file
+    
+    if not os.path.isfile(path):
+        try:
+            job = BatchJob.open(path)
+        except FileNotFoundError:
+            print(f"❌ Error: File or job not found: {path}")
+            sys.exit(1)
+        stream = StreamSummary()
+        for result in job.results():
+            stream.add(result)
+        summary = stream.to_dict()
+    elif stream_format(path):
+        summary = summarize_file(path)
+    else:
+        print(f"❌ Error: Not a streamed results file (.jsonl or .csv): {path}")
+        sys.exit(1)
+    
+    print("\n" + "="*70)
+    print("📊 BATCH RESULTS SUMMARY")
+    print("="*70)
+    print(f"   Source: {path}")
+    print(f"   Total documents: {summary['total_documents']}")
+    print(f"   Fraud detected: {summary['fraud_detected']}")
+    print(f"   Authentic: {summary['authentic']}")
+    print(f"   Errors: {summary['errors']}")
+    if summary['total_processed'] > 0:
+        print(f"   Fraud rate: {summary['fraud_rate']:.1f}%")
+        print(f"   Analysis time: {summary['processing_time']:.2f} seconds")
+    for tier, count in summary['tiers'].items():
+        print(f"   Decided at {tier} resolution: {count}")
+    if summary['stage_timings']:
+        print(f"\n🔬 Stage Breakdown (wall time):")
+        print(f"   {'Stage':<18}{'Total':>9}{'p50':>9}{'p90':>9}{'p99':>9}")
+        for name, stage in summary['stage_timings'].items():
+            print(f"   {name:<18}{stage['total_wall']:>8.2f}s{stage['p50_wall']:>8.3f}s"
+                  f"{stage['p90_wall']:>8.3f}s{stage['p99_wall']:>8.3f}s")
+    print("="*70 + "\n")
+
+
+def list_jobs(jobs_dir=None):
+    """
+    List batch jobs with their progress
+    
+    Args:
+        jobs_dir (str): Jobs directory (default: BatchJob.DEFAULT_JOBS_DIR)
+    """
+    from src.utils.batch_job import BatchJob
+    jobs_dir = jobs_dir or BatchJob.DEFAULT_JOBS_DIR
+    
+    names = sorted(os.listdir(jobs_dir)) if os.path.isdir(jobs_dir) else []
+    jobs = []
+    for name in names:
+        try:
+            jobs.append(BatchJob.open(os.path.join(jobs_dir, name)))
+        except (FileNotFoundError, ValueError, KeyError):
+            continue
+    
+    print("\n" + "="*70)
+    print("🗂️  BATCH JOBS")
+    print("="*70)
+    if not jobs:
+        print(f"   No jobs in {jobs_dir}")
+    for job in jobs:
+        progress = job.progress()
+        status = '✅ finished' if job.finished else '⏸️  resumable'
+        print(f"   {job.job_id:<26} {progress['done']:>6}/{progress['total']:<6} done  "
+              f"{progress['failed']:>4} failed  {status}")
+        print(f"      {job.settings.get('directory', '')}/{job.settings.get('pattern', '')}")
+    print("="*70 + "\n")
+
+
+def serve(socket_path=None, workers=1, stop=False, status=False):
+    """
+    Run (or stop / query) the analysis daemon
+    
+    Args:
+        socket_path (str): Socket path (default: $TRUTHLENS_SOCKET or a socket in a
+                           private per-user directory)
+        workers (int): Default worker processes for batch requests
+        stop (bool): Stop the running daemon
+        status (bool): Report whether a daemon is running
+    """
+    if not daemon.SUPPORTED:
+        print("❌ Error: the daemon needs UNIX domain sockets, which this platform lacks")
+        sys.exit(1)
+    
+    client = daemon.connect(socket_path)
+    
+    if stop or status:
+        if client is None:
+            print("💤 No daemon running")
+            return
+        if stop:
+            client.request('shutdown')
+            print(f"🛑 Daemon on {client.socket_path} stopping")
+        else:
+            info = client.request('ping')
+            print(f"🛰️  Daemon running on {client.socket_path}")
+            print(f"   PID: {info['pid']}")
+            print(f"   Uptime: {info['uptime']:.0f} seconds")
+            print(f"   Requests served: {info['requests']}")
+        return
+    
+    if client is not None:
+        print(f"❌ Error: a daemon is already running on {client.socket_path}")
+        sys.exit(1)
+    
+    print_banner()
+    try:
+        daemon.AnalysisDaemon(socket_path, workers=workers).serve_forever()
+    except PermissionError as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
 
 
 def clear_cache():
@@ -111,6 +390,7 @@ def clear_cache():
     print_banner()
     print("🗑️  Clearing cache...")
     
+    from src.batch_processor import BatchProcessor
     processor = BatchProcessor(use_cache=True)
     processor.clear_cache()
     
@@ -123,8 +403,18 @@ def show_cache_info():
     print("📦 Cache Information")
     print("="*70)
     
+    from src.batch_processor import BatchProcessor
     processor = BatchProcessor(use_cache=True)
     size_mb = processor.get_cache_size()
+    cache_stats = processor.get_cache_stats()
+    
+    lookups = cache_stats['hits'] + cache_stats['misses']
+    print(f"   Database: {processor.cache.path} ({cache_stats['file_bytes'] / (1024 * 1024):.2f} MB on disk)")
+    print(f"   Lifetime hits: {cache_stats['hits']}")
+    print(f"   Lifetime misses: {cache_stats['misses']}")
+    if lookups:
+        print(f"   Hit rate: {cache_stats['hits'] / lookups * 100:.1f}%")
+    print(f"   Evictions: {cache_stats['evictions']}")
     
     print(f"\n💡 Cache is saving time on repeated analyses!")
     print("   Run with --no-cache to bypass cache")
@@ -149,9 +439,31 @@ Examples:
   # Analyze with custom pattern
   python truthlens_cli.py batch data/documents/ --pattern "*.png"
   
+  # Stop each analysis once two detectors agree (or can no longer agree)
+  python truthlens_cli.py batch data/documents/ --cascade
+  
+  # Triage at 1/4 resolution; escalate only unclear documents
+  python truthlens_cli.py batch data/documents/ --triage 4
+  
   # Save batch results
   python truthlens_cli.py batch data/documents/ --output results.json
   
+  # Stream results to disk (.jsonl or .csv) and summarize them
+  python truthlens_cli.py batch data/documents/ --output results.jsonl
+  python truthlens_cli.py summary results.jsonl
+  
+  # Continue an interrupted batch where it stopped
+  python truthlens_cli.py jobs
+  python truthlens_cli.py batch --resume 20250101-020000-a1b2c3
+  
+  # Analyze directory on 8 worker processes
+  python truthlens_cli.py batch data/documents/ --workers 8
+  
+  # Keep warm detectors running; analyze and batch then use them
+  python truthlens_cli.py serve
+  python truthlens_cli.py serve --status
+  python truthlens_cli.py serve --stop
+  
   # Clear cache
   python truthlens_cli.py clear-cache
   
@@ -169,15 +481,59 @@ Examples:
                                help='Show detailed analysis')
     analyze_parser.add_argument('--no-cache', action='store_true',
                                help='Disable caching')
+    analyze_parser.add_argument('--no-daemon', action='store_true',
+                               help='Analyze in this process even if a daemon is running')
+    analyze_parser.add_argument('--cascade', action='store_true',
+                               help='Run detectors cheapest first and skip the rest once '
+                                    'the verdict is decided (default: full evidence)')
+    analyze_parser.add_argument('--triage', type=int, choices=[2, 4, 8], metavar='SCALE',
+                               help='Triage at 1/SCALE resolution (2, 4 or 8) and analyze only '
+                                    'unclear documents at full resolution')
     
     # Batch command
     batch_parser = subparsers.add_parser('batch', help='Analyze multiple documents')
-    batch_parser.add_argument('directory', help='Directory containing documents')
+    batch_parser.add_argument('directory', nargs='?', help='Directory containing documents')
+    batch_parser.add_argument('--resume', metavar='JOB',
+                             help='Continue an interrupted batch job (id or directory)')
+    batch_parser.add_argument('--job', metavar='NAME',
+                             help='Name for the batch job (default: generated)')
     batch_parser.add_argument('--pattern', '-p', default='*.jpg',
                              help='File pattern (default: *.jpg)')
-    batch_parser.add_argument('--output', '-o', help='Output file for results')
+    batch_parser.add_argument('--output', '-o',
+                             help='Output file, written when the job finishes (.jsonl / .csv: '
+                                  'one result per line; otherwise one JSON document). '
+                                  'An existing file is not replaced without --overwrite')
+    batch_parser.add_argument('--overwrite', action='store_true',
+                             help='Replace an existing output file')
     batch_parser.add_argument('--no-cache', action='store_true',
                              help='Disable caching')
+    batch_parser.add_argument('--workers', '-w', type=int,
+                             help='Number of worker processes (default: 1, or the '
+                                  'resumed job\'s setting)')
+    batch_parser.add_argument('--no-daemon', action='store_true',
+                             help='Analyze in this process even if a daemon is running')
+    batch_parser.add_argument('--cascade', action='store_true',
+                             help='Run detectors cheapest first and skip the rest once '
+                                  'the verdict is decided (default: full evidence)')
+    batch_parser.add_argument('--triage', type=int, choices=[2, 4, 8], metavar='SCALE',
+                             help='Triage at 1/SCALE resolution (2, 4 or 8) and analyze only '
+                                  'unclear documents at full resolution')
+    
+    # Serve command
+    serve_parser = subparsers.add_parser('serve', help='Run the analysis daemon')
+    serve_parser.add_argument('--socket', help='Socket path (default: $TRUTHLENS_SOCKET '
+                                               'or a per-user file in the temp directory)')
+    serve_parser.add_argument('--workers', '-w', type=int, default=1,
+                             help='Default worker processes for batch requests (default: 1)')
+    serve_parser.add_argument('--stop', action='store_true', help='Stop the running daemon')
+    serve_parser.add_argument('--status', action='store_true', help='Show daemon status')
+    
+    # Summary command
+    summary_parser = subparsers.add_parser('summary', help='Summarize a streamed results file or job')
+    summary_parser.add_argument('file', help='Results file (.jsonl or .csv) or batch job id')
+    
+    # Jobs command
+    subparsers.add_parser('jobs', help='List batch jobs and their progress')
     
     # Clear cache command
     subparsers.add_parser('clear-cache', help='Clear cached results')
@@ -193,17 +549,40 @@ Examples:
         analyze_single_document(
             args.file,
             verbose=args.verbose,
-            use_cache=not args.no_cache
+            use_cache=not args.no_cache,
+            use_daemon=not args.no_daemon,
+            cascade=args.cascade,
+            triage_scale=args.triage
         )
     
+    elif args.command == 'batch' and args.resume:
+        resume_batch(args.resume, use_daemon=not args.no_daemon, workers=args.workers)
+    
     elif args.command == 'batch':
+        if not args.directory:
+            batch_parser.error('a directory is required (or --resume JOB)')
         analyze_batch(
             args.directory,
             pattern=args.pattern,
             use_cache=not args.no_cache,
-            output=args.output
+            output=args.output,
+            workers=args.workers or 1,
+            use_daemon=not args.no_daemon,
+            cascade=args.cascade,
+            triage_scale=args.triage,
+            job_id=args.job,
+            overwrite=args.overwrite
         )
     
+    elif args.command == 'serve':
+        serve(args.socket, workers=args.workers, stop=args.stop, status=args.status)
+    
+    elif args.command == 'jobs':
+        list_jobs()
+    
+    elif args.command == 'summary':
+        summarize_output(args.file)
+    
     elif args.command == 'clear-cache':
         clear_cache()
     
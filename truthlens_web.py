@@ -3,20 +3,43 @@ TruthLens Web Interface - Enhanced Version
 With example documents, batch processing, and result export
 """
 
-import gradio as gr
 import os
 import json
+import threading
 from datetime import datetime
-from src.fraud_detector import FraudDetector
-from src.batch_processor import BatchProcessor
-from pathlib import Path
 
+# Gradio and the detector stack are imported where they are first needed,
+# so importing this module (e.g. from tests or tooling) stays cheap
 
-# Initialize detector (only once, for speed)
-print("🚀 Initializing TruthLens...")
-fraud_detector = FraudDetector(use_segmentation=True)
-batch_processor = BatchProcessor(use_cache=True)
-print("✅ TruthLens ready!")
+
+# Worker processes analyzing uploads in parallel, and how many more
+# requests may wait for one before new uploads are turned away
+WEB_WORKERS = int(os.environ.get('TRUTHLENS_WEB_WORKERS', max(1, (os.cpu_count() or 2) // 2)))
+WEB_MAX_QUEUE = int(os.environ.get('TRUTHLENS_WEB_MAX_QUEUE', 16))
+
+# Warm detector workers, started once by get_inference_pool()
+inference_pool = None
+_inference_pool_lock = threading.Lock()
+
+
+def get_inference_pool():
+    """
+    Shared inference pool, started on first use
+    
+    Gradio handles requests on several threads, so the first requests
+    may arrive together; only one of them starts the pool.
+    
+    Returns:
+        InferencePool: Pool of warm detector workers
+    """
+    global inference_pool
+    with _inference_pool_lock:
+        if inference_pool is None:
+            from src.inference_pool import InferencePool
+            print("🚀 Initializing TruthLens...")
+            inference_pool = InferencePool(workers=WEB_WORKERS, max_queue=WEB_MAX_QUEUE, use_cache=True)
+            print("✅ TruthLens ready!")
+    return inference_pool
 
 
 def analyze_document(image):
@@ -32,17 +55,17 @@ def analyze_document(image):
     if image is None:
         return "⚠️ Please upload a document image", "", "", ""
     
+    from src.inference_pool import QueueFullError
+    
     try:
-        # Save temporary file
-        temp_path = "temp_upload.jpg"
-        image.save(temp_path)
+        # Analyze in memory on the worker pool (uses cache)
+        try:
+            result = get_inference_pool().analyze(image)
+        except QueueFullError:
+            return "⏳ Server busy: too many documents in the queue. Please try again shortly.", "", "", ""
         
-        # Analyze using batch processor (uses cache)
-        result = batch_processor.process_single(temp_path, verbose=False)
-        
-        # Clean up
-        if os.path.exists(temp_path):
-            os.remove(temp_path)
+        if 'error' in result:
+            return f"❌ Error analyzing document: {result['error']}", "", "", ""
         
         # Format results
         verdict = "🚨 FRAUD DETECTED" if result['fraud_detected'] else "✅ AUTHENTIC"
@@ -57,6 +80,8 @@ def analyze_document(image):
 **Analysis completed at:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 
 **Processing time:** {result.get('processing_time', 0):.2f} seconds
+
+**Queue wait:** {result.get('queue_wait', 0):.2f} seconds
         """
         
         # Confidence gauge (HTML)
@@ -140,8 +165,15 @@ def analyze_batch_documents(files):
         # Files are already paths in batch mode
         file_paths = [f.name if hasattr(f, 'name') else f for f in files]
         
-        # Process batch
-        results = batch_processor.process_batch(file_paths, show_progress=False)
+        # Process batch on the shared worker pool, waiting for queue space
+        pool = get_inference_pool()
+        futures = [pool.submit(path, block=True) for path in file_paths]
+        results = []
+        for path, future in zip(file_paths, futures):
+            try:
+                results.append(future.result())
+            except Exception as e:
+                results.append({'file_path': path, 'error': str(e), 'fraud_detected': False})
         
         # Clean up
         for path in file_paths:
@@ -200,11 +232,11 @@ def load_example_document(example_name):
 def get_cache_stats():
     """Get cache statistics"""
     try:
+        batch_processor = get_inference_pool().processor
         cache_size = batch_processor.get_cache_size()
-        cache_dir = batch_processor.cache_dir
         
-        # Count cache files
-        cache_files = len(list(Path(cache_dir).glob('*.json'))) if os.path.exists(cache_dir) else 0
+        # Entry count comes from the cache database's counters (no directory scan)
+        cache_files = batch_processor.get_cache_stats().get('entries', 0)
         
         stats_html = f"""
         <div style="padding: 20px; background: #f0f9ff; border-radius: 10px; border-left: 5px solid #3b82f6;">
@@ -221,224 +253,259 @@ def get_cache_stats():
         return "<div>Cache statistics unavailable</div>"
 
 
+def get_queue_stats():
+    """Get inference queue statistics"""
+    stats = get_inference_pool().queue_stats()
+    return f"""
+    <div style="padding: 20px; background: #f0fdf4; border-radius: 10px; border-left: 5px solid #16a34a;">
+        <h3 style="margin-top: 0; color: #166534; font-size: 22px;">👷 Analysis Queue</h3>
+        <div style="margin: 15px 0; font-size: 18px;">
+            <p><strong>Workers:</strong> {stats['workers']} ({min(stats['in_flight'], stats['workers'])} busy)</p>
+            <p><strong>Queue depth:</strong> {stats['queued']} / {stats['max_queue']}</p>
+            <p><strong>Wait time:</strong> avg {stats['avg_wait']:.2f}s, p95 {stats['p95_wait']:.2f}s, max {stats['max_wait']:.2f}s</p>
+            <p><strong>Requests:</strong> {stats['completed']} completed, {stats['cache_hits']} from cache, {stats['rejected']} rejected (queue full)</p>
+        </div>
+    </div>
+    """
+
+
 def clear_cache_action():
     """Clear cache and return confirmation"""
     try:
-        batch_processor.clear_cache()
+        get_inference_pool().processor.clear_cache()
         return "✅ Cache cleared successfully! Next analysis will build new cache."
     except Exception as e:
         return f"❌ Error clearing cache: {str(e)}"
 
 
-# Create Gradio interface
-with gr.Blocks(title="TruthLens - AI Document Fraud Detection", theme=gr.themes.Soft()) as demo:
+def build_interface():
+    """
+    Create the Gradio interface
+    
+    Returns:
+        gr.Blocks: The TruthLens web app (not yet launched)
+    """
+    import gradio as gr
     
-    # Header
-    gr.Markdown("""
-    # 🔍 TruthLens
-    ## AI-Powered Document Fraud Detection
+    with gr.Blocks(title="TruthLens - AI Document Fraud Detection", theme=gr.themes.Soft()) as demo:
     
-    Upload documents to detect potential fraud using multimodal AI analysis.
+        # Header
+        gr.Markdown("""
+        # 🔍 TruthLens
+        ## AI-Powered Document Fraud Detection
     
-    **Detects:** Image manipulation, copy-paste forgery, font inconsistencies
-    """)
+        Upload documents to detect potential fraud using multimodal AI analysis.
     
-    # Tabs for different modes
-    with gr.Tabs():
+        **Detects:** Image manipulation, copy-paste forgery, font inconsistencies
+        """)
+    
+        # Tabs for different modes
+        with gr.Tabs():
         
-        # TAB 1: Single Document Analysis
-        with gr.Tab("📄 Single Document"):
-            with gr.Row():
-                with gr.Column(scale=1):
-                    gr.Markdown("### 📤 Upload Document")
-                    image_input = gr.Image(
-                        type="pil",
-                        label="Document Image",
-                        height=400
-                    )
+            # TAB 1: Single Document Analysis
+            with gr.Tab("📄 Single Document"):
+                with gr.Row():
+                    with gr.Column(scale=1):
+                        gr.Markdown("### 📤 Upload Document")
+                        image_input = gr.Image(
+                            type="pil",
+                            label="Document Image",
+                            height=400
+                        )
                     
-                    analyze_btn = gr.Button(
-                        "🔍 Analyze Document",
-                        variant="primary",
-                        size="lg"
-                    )
+                        analyze_btn = gr.Button(
+                            "🔍 Analyze Document",
+                            variant="primary",
+                            size="lg"
+                        )
                     
-                    gr.Markdown("### 📂 Or Try Examples")
-                    example_dropdown = gr.Dropdown(
-                        choices=[
-                            "Bank Statement (Authentic)",
-                            "Bank Statement (Fake)",
-                            "Contract (Authentic)",
-                            "Invoice (Mixed Fonts)"
-                        ],
-                        label="Select Example",
-                        value=None
-                    )
-                    load_example_btn = gr.Button("📥 Load Example")
+                        gr.Markdown("### 📂 Or Try Examples")
+                        example_dropdown = gr.Dropdown(
+                            choices=[
+                                "Bank Statement (Authentic)",
+                                "Bank Statement (Fake)",
+                                "Contract (Authentic)",
+                                "Invoice (Mixed Fonts)"
+                            ],
+                            label="Select Example",
+                            value=None
+                        )
+                        load_example_btn = gr.Button("📥 Load Example")
                     
-                    gr.Markdown("""
-                    **Supported:** JPG, PNG  
-                    **Examples:** Bank statements, invoices, contracts
-                    """)
+                        gr.Markdown("""
+                        **Supported:** JPG, PNG  
+                        **Examples:** Bank statements, invoices, contracts
+                        """)
                 
-                with gr.Column(scale=1):
-                    gr.Markdown("### 📊 Analysis Results")
-                    result_output = gr.Markdown(label="Verdict")
-                    confidence_output = gr.HTML(label="Confidence")
-                    details_output = gr.HTML(label="Details")
+                    with gr.Column(scale=1):
+                        gr.Markdown("### 📊 Analysis Results")
+                        result_output = gr.Markdown(label="Verdict")
+                        confidence_output = gr.HTML(label="Confidence")
+                        details_output = gr.HTML(label="Details")
                     
-                    with gr.Accordion("💾 Download Results (JSON)", open=False):
-                        json_output = gr.Textbox(
-                            label="JSON Output",
-                            lines=10,
-                            max_lines=20
-                        )
-                        download_btn = gr.Button("📥 Copy JSON")
+                        with gr.Accordion("💾 Download Results (JSON)", open=False):
+                            json_output = gr.Textbox(
+                                label="JSON Output",
+                                lines=10,
+                                max_lines=20
+                            )
+                            download_btn = gr.Button("📥 Copy JSON")
         
-        # TAB 2: Batch Processing
-        with gr.Tab("📦 Batch Processing"):
-            gr.Markdown("""
-            ### Upload Multiple Documents
-            Analyze multiple documents at once for efficient processing.
-            """)
+            # TAB 2: Batch Processing
+            with gr.Tab("📦 Batch Processing"):
+                gr.Markdown("""
+                ### Upload Multiple Documents
+                Analyze multiple documents at once for efficient processing.
+                """)
             
-            batch_input = gr.File(
-                label="Upload Documents (Multiple)",
-                file_count="multiple",
-                type="filepath"
-            )
+                batch_input = gr.File(
+                    label="Upload Documents (Multiple)",
+                    file_count="multiple",
+                    type="filepath"
+                )
             
-            analyze_batch_btn = gr.Button(
-                "🔍 Analyze All Documents",
-                variant="primary",
-                size="lg"
-            )
+                analyze_batch_btn = gr.Button(
+                    "🔍 Analyze All Documents",
+                    variant="primary",
+                    size="lg"
+                )
             
-            batch_results = gr.Markdown(label="Batch Results")
+                batch_results = gr.Markdown(label="Batch Results")
             
-            with gr.Accordion("💾 Download Batch Results (JSON)", open=False):
-                batch_json_output = gr.Textbox(
-                    label="JSON Output",
-                    lines=15,
-                    max_lines=30
-                )
+                with gr.Accordion("💾 Download Batch Results (JSON)", open=False):
+                    batch_json_output = gr.Textbox(
+                        label="JSON Output",
+                        lines=15,
+                        max_lines=30
+                    )
         
-        # TAB 3: Information
-        with gr.Tab("ℹ️ How It Works"):
-            gr.Markdown("""
-            ## 🔬 Detection Techniques
+            # TAB 3: Information
+            with gr.Tab("ℹ️ How It Works"):
+                gr.Markdown("""
+                ## 🔬 Detection Techniques
             
-            TruthLens uses three advanced detection methods:
+                TruthLens uses three advanced detection methods:
             
-            ### 1️⃣ Error Level Analysis (ELA)
-            - **What it detects:** Image compression artifacts
-            - **How it works:** Recompresses the image and analyzes differences
-            - **Indicates:** Potential Photoshop edits, digital manipulation
-            - **Score:** 0-100 (higher = more suspicious)
+                ### 1️⃣ Error Level Analysis (ELA)
+                - **What it detects:** Image compression artifacts
+                - **How it works:** Recompresses the image and analyzes differences
+                - **Indicates:** Potential Photoshop edits, digital manipulation
+                - **Score:** 0-100 (higher = more suspicious)
             
-            ### 2️⃣ Copy-Move Forgery Detection
-            - **What it detects:** Duplicated regions in the document
-            - **How it works:** Divides image into blocks, finds matching patterns
-            - **Indicates:** Copy-pasted signatures, logos, or text
-            - **Features:** Uses semantic segmentation to exclude legitimate text
+                ### 2️⃣ Copy-Move Forgery Detection
+                - **What it detects:** Duplicated regions in the document
+                - **How it works:** Divides image into blocks, finds matching patterns
+                - **Indicates:** Copy-pasted signatures, logos, or text
+                - **Features:** Uses semantic segmentation to exclude legitimate text
             
-            ### 3️⃣ Font Consistency Analysis
-            - **What it detects:** Font variations across document
-            - **How it works:** OCR analysis to identify font characteristics
-            - **Indicates:** Mixed fonts (sign of tampering)
-            - **Threshold:** >30% variation = suspicious
+                ### 3️⃣ Font Consistency Analysis
+                - **What it detects:** Font variations across document
+                - **How it works:** OCR analysis to identify font characteristics
+                - **Indicates:** Mixed fonts (sign of tampering)
+                - **Threshold:** >30% variation = suspicious
             
-            ---
+                ---
             
-            ## ⚙️ System Specifications
+                ## ⚙️ System Specifications
             
-            **Processing Speed:** ~2 seconds per document  
-            **Throughput:** 0.46 documents/second  
-            **Daily Capacity:** 39,927 documents  
-            **Caching:** Enabled (repeat analysis is instant)
+                **Processing Speed:** ~2 seconds per document  
+                **Throughput:** 0.46 documents/second  
+                **Daily Capacity:** 39,927 documents  
+                **Caching:** Enabled (repeat analysis is instant)
             
-            **Optimal Parameters:**
-            - Block size: 16×16 pixels
-            - ELA quality: 95
-            - Detection threshold: 5 duplicates
-            - Segmentation: Enabled
+                **Optimal Parameters:**
+                - Block size: 16×16 pixels
+                - ELA quality: 95
+                - Detection threshold: 5 duplicates
+                - Segmentation: Enabled
             
-            ---
+                ---
             
-            ## 🎯 Best Practices
+                ## 🎯 Best Practices
             
-            1. **Upload Quality:** Use high-resolution scans (300+ DPI)
-            2. **File Format:** JPG or PNG (JPG preferred for ELA)
-            3. **Verification:** Use AI as one tool, not sole decision maker
-            4. **False Positives:** Some authentic documents may flag (especially synthetic)
-            5. **Real Documents:** System performs best on scanned physical documents
+                1. **Upload Quality:** Use high-resolution scans (300+ DPI)
+                2. **File Format:** JPG or PNG (JPG preferred for ELA)
+                3. **Verification:** Use AI as one tool, not sole decision maker
+                4. **False Positives:** Some authentic documents may flag (especially synthetic)
+                5. **Real Documents:** System performs best on scanned physical documents
             
-            ---
+                ---
             
-            ## 📚 Research Foundation
+                ## 📚 Research Foundation
             
-            **Based on published research:**
-            - Error Level Analysis (Krawetz, 2007)
-            - Copy-Move Detection (Fridrich et al., 2003)
-            - Font Analysis (OCR-based consistency checking)
+                **Based on published research:**
+                - Error Level Analysis (Krawetz, 2007)
+                - Copy-Move Detection (Fridrich et al., 2003)
+                - Font Analysis (OCR-based consistency checking)
             
-            **M.Tech Project | IIIT Dharwad**
-            """)
+                **M.Tech Project | IIIT Dharwad**
+                """)
     
-    # Settings accordion (below tabs)
-    with gr.Accordion("⚙️ System Settings", open=False):
-        cache_stats = gr.HTML(label="Cache Statistics")
+        # Settings accordion (below tabs)
+        with gr.Accordion("⚙️ System Settings", open=False):
+            cache_stats = gr.HTML(label="Cache Statistics")
+            queue_stats = gr.HTML(label="Queue Statistics")
         
-        with gr.Row():
-            refresh_cache_btn = gr.Button("🔄 Refresh Stats")
-            clear_cache_btn = gr.Button("🗑️ Clear Cache")
+            with gr.Row():
+                refresh_cache_btn = gr.Button("🔄 Refresh Stats")
+                clear_cache_btn = gr.Button("🗑️ Clear Cache")
         
-        cache_message = gr.Textbox(label="Status", interactive=False)
+            cache_message = gr.Textbox(label="Status", interactive=False)
         
-        # Cache actions
-        refresh_cache_btn.click(
-            fn=get_cache_stats,
-            outputs=cache_stats
-        )
+            # Cache actions
+            refresh_cache_btn.click(
+                fn=get_cache_stats,
+                outputs=cache_stats
+            )
+            refresh_cache_btn.click(
+                fn=get_queue_stats,
+                outputs=queue_stats
+            )
         
-        clear_cache_btn.click(
-            fn=clear_cache_action,
-            outputs=cache_message
-        )
+            clear_cache_btn.click(
+                fn=clear_cache_action,
+                outputs=cache_message
+            )
     
-    # Footer
-    gr.Markdown("""
-    ---
-    **TruthLens v1.0.0** | M.Tech Project | IIIT Dharwad  
-    ⚡ Powered by Computer Vision + Generative AI + Semantic Segmentation
-    """)
+        # Footer
+        gr.Markdown("""
+        ---
+        **TruthLens v1.0.0** | M.Tech Project | IIIT Dharwad  
+        ⚡ Powered by Computer Vision + Generative AI + Semantic Segmentation
+        """)
     
-    # Connect analyze button (single document)
-    analyze_btn.click(
-        fn=analyze_document,
-        inputs=image_input,
-        outputs=[result_output, confidence_output, details_output, json_output]
-    )
+        # Connect analyze button (single document)
+        analyze_btn.click(
+            fn=analyze_document,
+            inputs=image_input,
+            outputs=[result_output, confidence_output, details_output, json_output]
+        )
     
-    # Connect example loader
-    load_example_btn.click(
-        fn=load_example_document,
-        inputs=example_dropdown,
-        outputs=image_input
-    )
+        # Connect example loader
+        load_example_btn.click(
+            fn=load_example_document,
+            inputs=example_dropdown,
+            outputs=image_input
+        )
     
-    # Connect batch analysis
-    analyze_batch_btn.click(
-        fn=analyze_batch_documents,
-        inputs=batch_input,
-        outputs=[batch_results, batch_json_output]
-    )
+        # Connect batch analysis
+        analyze_batch_btn.click(
+            fn=analyze_batch_documents,
+            inputs=batch_input,
+            outputs=[batch_results, batch_json_output]
+        )
     
-    # Load cache stats on startup
-    demo.load(
-        fn=get_cache_stats,
-        outputs=cache_stats
-    )
+        # Load cache stats on startup
+        demo.load(
+            fn=get_cache_stats,
+            outputs=cache_stats
+        )
+        demo.load(
+            fn=get_queue_stats,
+            outputs=queue_stats
+        )
+    
+    return demo
 
 
 # Launch configuration
@@ -457,6 +524,18 @@ if __name__ == "__main__":
     print("   • Bigger fonts (better readability)")
     print("="*70 + "\n")
     
+    # Start the workers before the first request arrives
+    get_inference_pool()
+    demo = build_interface()
+    
+    # Let Gradio hand concurrent requests to the pool instead of running
+    # them one at a time; the pool itself bounds the work in progress
+    concurrency = WEB_WORKERS + WEB_MAX_QUEUE
+    try:
+        demo.queue(default_concurrency_limit=concurrency)
+    except TypeError:  # Gradio 3.x
+        demo.queue(concurrency_count=concurrency)
+    
     demo.launch(
         server_name="127.0.0.1",
         server_port=7860,
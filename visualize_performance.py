@@ -179,6 +179,80 @@ def visualize_segmentation_impact(data):
     plt.close()
 
 
+def load_scaling_results():
+    """Load results of benchmarks/scaling_benchmark.py, if it has been run"""
+    results_file = 'data/scaling_results.json'
+    
+    if not os.path.exists(results_file):
+        return None
+    
+    with open(results_file, 'r') as f:
+        return json.load(f)
+
+
+def visualize_resolution_scaling(data):
+    """Create log-log charts of cost against image size"""
+    if not data or not data.get('series'):
+        return
+    
+    series = data['series']
+    budget = data['settings']['budget_seconds']
+    
+    fig, (ax1, ax2, ax3) = plt.subplots(1, 3, figsize=(20, 5.5))
+    fig.suptitle('Resolution Scaling (log-log)', fontsize=16, fontweight='bold')
+    
+    # Chart 1: Time per document, with the fitted exponent in the legend
+    for label, s in series.items():
+        megapixels = [p['pixels'] / 1e6 for p in s['points']]
+        k = s['summary']['time_exponent']
+        ax1.plot(megapixels, [p['seconds'] for p in s['points']], marker='o', linewidth=2,
+                 label=f"{label} (k={k:.2f})" if k is not None else label)
+    ax1.axhline(budget, color='red', linestyle='--', alpha=0.6, label=f'{budget:g}s budget')
+    ax1.set_xscale('log')
+    ax1.set_yscale('log')
+    ax1.set_xlabel('Image Size (megapixels)', fontsize=12)
+    ax1.set_ylabel('Time per Document (seconds)', fontsize=12)
+    ax1.set_title('Processing Time vs Image Size')
+    ax1.grid(True, which='both', alpha=0.3)
+    ax1.legend(fontsize=9)
+    
+    # Chart 2: Copy-move work (blocks retained, pairs compared) per block size
+    for label, s in series.items():
+        if s['case'] != 'copymove':
+            continue
+        megapixels = [p['pixels'] / 1e6 for p in s['points']]
+        line, = ax2.plot(megapixels, [p['candidate_pairs'] for p in s['points']],
+                         marker='s', linewidth=2, label=f'{label} pairs')
+        ax2.plot(megapixels, [p['num_blocks'] for p in s['points']], marker='o',
+                 linestyle='--', color=line.get_color(), label=f'{label} blocks')
+    ax2.set_xscale('log')
+    ax2.set_yscale('log')
+    ax2.set_xlabel('Image Size (megapixels)', fontsize=12)
+    ax2.set_ylabel('Count', fontsize=12)
+    ax2.set_title('Copy-Move Blocks and Candidate Pairs')
+    ax2.grid(True, which='both', alpha=0.3)
+    ax2.legend(fontsize=9)
+    
+    # Chart 3: Peak memory of one call
+    for label, s in series.items():
+        megapixels = [p['pixels'] / 1e6 for p in s['points']]
+        ax3.plot(megapixels, [p['peak_mb'] for p in s['points']], marker='^', linewidth=2,
+                 label=label)
+    ax3.set_xscale('log')
+    ax3.set_yscale('log')
+    ax3.set_xlabel('Image Size (megapixels)', fontsize=12)
+    ax3.set_ylabel('Peak Memory (MB)', fontsize=12)
+    ax3.set_title('Peak Memory vs Image Size')
+    ax3.grid(True, which='both', alpha=0.3)
+    ax3.legend(fontsize=9)
+    
+    plt.tight_layout()
+    output_file = 'data/resolution_scaling.png'
+    plt.savefig(output_file, dpi=300, bbox_inches='tight')
+    print(f"✅ Saved: {output_file}")
+    plt.close()
+
+
 def create_optimization_report():
     """Create comprehensive optimization report"""
     results = load_optimization_results()
@@ -289,6 +363,11 @@ def main():
     print("📊 GENERATING PERFORMANCE VISUALIZATIONS")
     print("="*70)
     
+    scaling = load_scaling_results()
+    if scaling:
+        print("\n📈 Creating resolution scaling chart...")
+        visualize_resolution_scaling(scaling)
+    
     # Load results
     results = load_optimization_results()
     
@@ -316,6 +395,8 @@ def main():
     print("   • data/performance_breakdown.png")
     print("   • data/segmentation_impact.png")
     print("   • docs/daily_logs/Day_005_Optimization_Report.txt")
+    if scaling:
+        print("   • data/resolution_scaling.png")
     print("\n💡 Open these files to view detailed analysis!")
     print("="*70 + "\n")
 